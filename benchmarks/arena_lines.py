@@ -0,0 +1,79 @@
+"""
+
+    benchmarks.arena_lines.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+    Micro-benchmark of Arena line classification over sample video descriptions.
+
+    Run from the project's root with: python -m benchmarks.arena_lines
+
+    @author: z33k
+
+"""
+import json
+import re
+import timeit
+from pathlib import Path
+
+from mtg.deck.arena import PlaysetLine, classify_line, get_arena_lines, is_arena_line
+
+SAMPLE_DIR = Path(__file__).parent.parent / "sample"
+_SECTIONS = (
+    ("About",),
+    ("Main", "Maindeck", "Mainboard", "Deck", "Decklist", "Main Deck", "Main Board", "Deck List"),
+    ("Commander", "Comandante"),
+    ("Companion", "Companheiro"),
+    ("Side", "Sideboard", "Sidedeck", "Sidelist", "Reserva", "Side Board", "Side Deck",
+     "Side List"),
+)
+
+
+# the chain of predicates the single-pass classifier has replaced (each section check compiles
+# its pattern anew)
+def _is_section_line(line: str, *sections: str) -> bool:
+    sections = {*sections}
+    sections.update({section.upper() for section in sections})
+    sections.update({f"{section}:" for section in sections})
+    pattern = re.compile(
+        r"^\s*(" + "|".join(re.escape(section) for section in sections) + r")"
+        r"(\s*[\[\(:]?\s*\d{1,3}[\]\)]?)?\s*:?$", re.IGNORECASE
+    )
+    return bool(pattern.match(line))
+
+
+def _legacy_is_arena_line(line: str) -> bool:
+    if any(_is_section_line(line, *sections) for sections in _SECTIONS):
+        return True
+    elif line.startswith("Name "):
+        return True
+    return bool(PlaysetLine.PATTERN.match(line)) or bool(PlaysetLine.INVERTED_PATTERN.match(line))
+
+
+def load_descriptions() -> list[list[str]]:
+    """Load lines of all video descriptions in the sample channel files.
+    """
+    texts = []
+    for file in sorted(SAMPLE_DIR.glob("*/*.json")):
+        for video in json.loads(file.read_text(encoding="utf-8"))["videos"]:
+            if description := video.get("description"):
+                texts.append([line.strip() for line in description.splitlines()])
+    return texts
+
+
+def run(repeat=5) -> None:
+    texts = load_descriptions()
+    lines = [line for text in texts for line in text]
+    mismatches = [line for line in lines if _legacy_is_arena_line(line) != is_arena_line(line)]
+    print(f"{len(texts):,} description(s), {len(lines):,} line(s), "
+          f"{len(mismatches):,} classification mismatch(es) against the legacy predicates")
+    cases = [
+        ("legacy predicates (per line)", lambda: [_legacy_is_arena_line(l) for l in lines]),
+        ("classify_line() (per line)", lambda: [classify_line(l) for l in lines]),
+        ("get_arena_lines() (per description)", lambda: [get_arena_lines(*t) for t in texts]),
+    ]
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print(f"{name:<40} {best * 1000:>9.1f} ms")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,79 @@
+"""
+
+    benchmarks.card_names.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+    Micro-benchmark of card name normalization per decklist line.
+
+    Run from the project's root with: python -m benchmarks.card_names
+
+    @author: z33k
+
+"""
+import itertools
+import re
+import timeit
+
+from unidecode import unidecode
+
+from mtg.deck import ARENA_MULTIFACE_SEPARATOR
+from mtg.deck.arena import PlaysetLine
+from mtg.scryfall import MULTIFACE_SEPARATOR, card_name_key
+
+NAMES = [
+    "Lightning Bolt", "Urza’s Saga", "Jace, the Mind Sculptor", "Lim-Dûl's Vault", "Æther Vial",
+    "Commit /// Memory", "Wear/Tear", "Fire // Ice", "Who/What/When/Where/Why", "Séance",
+    "Ratonhnhaké꞉ton", "Borrowing 100,000 Arrows", "Thalia, Guardian of Thraben", "Ragavan",
+    "Expressive Iteration", "Ledger Shredder", "Dress Down", "Orcish Bowmasters",
+]
+TEMPLATES = ["4 {}", "4x {}", "{} x4", "1 {} (MH2) 259"]
+
+
+# the replaced path: a line sanitized by PlaysetLine, its name sanitized again by
+# DeckParser.find_card() and then transliterated and casefolded by find_by_name()
+def _old_sanitize_card_name(text: str) -> str:
+    text = text.replace("’", "'").replace("‑", "-").replace("꞉", ":")
+    if "/" in text:
+        text = text.replace(" / ", f" {MULTIFACE_SEPARATOR} ").replace(
+            f" {ARENA_MULTIFACE_SEPARATOR} ", f" {MULTIFACE_SEPARATOR} ")
+        text = re.sub(r'(?<=[a-zA-Z])/{1,3}(?=[a-zA-Z])', f' {MULTIFACE_SEPARATOR} ', text)
+    return text
+
+
+def _old_line_key(line: str) -> str:
+    return unidecode(_old_sanitize_card_name(
+        PlaysetLine(_old_sanitize_card_name(line)).name)).casefold()
+
+
+def _new_line_key(line: str) -> str:
+    return card_name_key(PlaysetLine(line).name)
+
+
+def run(repeat=5, copies=250) -> None:
+    lines = [t.format(n) for t, n in itertools.product(TEMPLATES, NAMES)] * copies
+    mismatches = [line for line in set(lines) if _old_line_key(line) != _new_line_key(line)]
+    print(f"{len(lines):,} line(s) ({len(set(lines)):,} distinct), {len(mismatches):,} key "
+          f"mismatch(es) against the replaced path")
+
+    # names as PlaysetLine extracts them from sanitized (formerly) and raw (now) lines
+    old_names = [PlaysetLine(_old_sanitize_card_name(l)).name for l in lines]
+    new_names = [PlaysetLine(l).name for l in lines]
+
+    def cold() -> None:
+        card_name_key.cache_clear()
+        [card_name_key(n) for n in new_names]
+
+    cases = [
+        ("whole lines, replaced path", lambda: [_old_line_key(l) for l in lines]),
+        ("whole lines, card_name_key()", lambda: [_new_line_key(l) for l in lines]),
+        ("names, replaced path", lambda: [
+            unidecode(_old_sanitize_card_name(n)).casefold() for n in old_names]),
+        ("names, card_name_key() (cold cache)", cold),
+        ("names, card_name_key() (warm cache)", lambda: [card_name_key(n) for n in new_names]),
+    ]
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print(f"{name:<40} {best * 1000:>9.1f} ms")
+
+
+if __name__ == '__main__':
+    run()
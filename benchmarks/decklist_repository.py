@@ -0,0 +1,80 @@
+"""
+
+    benchmarks.decklist_repository.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    Benchmark of loading and dumping a decklist repository against the legacy plain JSON.
+
+    Run from the project's root with: python -m benchmarks.decklist_repository
+
+    @author: z33k
+
+"""
+import json
+import logging
+import random
+import tempfile
+import timeit
+from pathlib import Path
+
+from mtg.repository import DecklistRepository
+
+
+def synthesize_decklists(
+        count=20_000, pool_size=3_000, seed=42, prefix="Card Name") -> dict[str, str]:
+    """Return ``count`` Arena decklists drawn from a pool of ``pool_size`` card lines.
+    """
+    rnd = random.Random(seed)
+    pool = [f"{prefix} {i} ({rnd.choice(['MH2', 'LCI', 'WOE', 'ONE'])}) {i % 400 + 1}"
+            for i in range(pool_size)]
+    decklists = {}
+    for i in range(count):
+        maindeck = [f"{rnd.randint(1, 4)} {line}" for line in rnd.sample(pool, 22)]
+        sideboard = [f"{rnd.randint(1, 3)} {line}" for line in rnd.sample(pool, 5)]
+        decklists[f"{i:016x}"] = "\n".join(["Deck", *maindeck, "", "Sideboard", *sideboard])
+    return decklists
+
+
+def _best(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def run(repeat=3) -> None:
+    logging.disable(logging.INFO)
+    decklists = synthesize_decklists()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        legacy = Path(tmpdir) / "decklists.json"
+        print(f"{len(decklists):,} decklist(s)")
+        dump = _best(lambda: legacy.write_text(
+            json.dumps(decklists, indent=4, ensure_ascii=False), encoding="utf-8"), repeat)
+        load = _best(lambda: json.loads(legacy.read_text(encoding="utf-8")), repeat)
+        print(f"{'legacy JSON':<24} dump {dump:>8.1f} ms  load {load:>8.1f} ms  "
+              f"{legacy.stat().st_size / 1024 ** 2:>6.1f} MB")
+
+        for name in "decklists.repo.json", "decklists.repo.json.gz":
+            path = Path(tmpdir) / name
+            repo = DecklistRepository(path)
+            for id_, decklist in decklists.items():
+                repo[id_] = decklist
+            dump = _best(repo.dump, repeat)
+            load = _best(lambda: DecklistRepository(path).load(), repeat)
+            print(f"{name:<24} dump {dump:>8.1f} ms  load {load:>8.1f} ms  "
+                  f"{path.stat().st_size / 1024 ** 2:>6.1f} MB")
+
+        # all decklists replaced by ones drawn from a different pool of lines
+        repo = DecklistRepository(Path(tmpdir) / "compacted.repo.json")
+        for id_, decklist in decklists.items():
+            repo[id_] = decklist
+        replacements = synthesize_decklists(prefix="Other Card")
+        for id_, decklist in zip(decklists, replacements.values()):
+            repo[id_] = decklist
+        lines_before = len(repo._lines)
+        dump = _best(repo.dump, 1)
+        print(f"{'after replacing all':<24} dump {dump:>8.1f} ms (compacting the dictionary from "
+              f"{lines_before:,} to {len(repo._lines):,} line(s))")
+        repo = DecklistRepository(repo.path)
+        repo.load()
+        assert [*repo.items()] == [*zip(decklists, replacements.values())]
+
+
+if __name__ == '__main__':
+    run()
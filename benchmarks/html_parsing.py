@@ -0,0 +1,48 @@
+"""
+
+    benchmarks.html_parsing.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+    Benchmark of parsing saved deck pages into full soups against strained ones.
+
+    Run from the project's root with: python -m benchmarks.html_parsing
+
+    @author: z33k
+
+"""
+from pathlib import Path
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from mtg.deck.scrapers.goldfish import GoldfishScraper
+from mtg.deck.scrapers.hareruya import InternationalHareruyaScraper
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+CASES = [(GoldfishScraper, "goldfish.html"), (InternationalHareruyaScraper, "hareruya.html")]
+
+
+def _strained_parts(soup: BeautifulSoup, strainer: SoupStrainer) -> list[str]:
+    # outermost tags of the full soup the strainer matches (it matches by a function)
+    return [str(tag) for tag in soup.find_all(True)
+            if strainer.name(tag.name, tag.attrs)
+            and not any(strainer.name(p.name, p.attrs) for p in tag.parents if p.name)]
+
+
+def run(repeat=20) -> None:
+    for scraper_type, fixture in CASES:
+        page = FIXTURES_DIR / fixture
+        text = page.read_text(encoding="utf-8")
+        # strained parsing must keep the matched parts of the page intact
+        strainer = scraper_type.SOUP_STRAINER
+        full = _strained_parts(BeautifulSoup(text, "lxml"), strainer)
+        strained = [str(tag) for tag in BeautifulSoup(
+            text, "lxml", parse_only=strainer).find_all(True, recursive=False)]
+        results = scraper_type.benchmark_parsing(page, repeat=repeat)
+        print(f"{scraper_type.__name__} ({fixture}, {len(text) / 1024:.0f} KB), {len(full)} "
+              f"part(s) matched, {'identical' if full == strained else 'DIFFERENT'} when strained")
+        for label in "full", "strained":
+            print(f"  {label:<9} {results[f'{label}_time'] * 1000:>7.2f} ms "
+                  f"{results[f'{label}_tags']:>7,.0f} tag(s)")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,522 @@
+"""
+
+    mtg.corpus.py
+    ~~~~~~~~~~~~~~~~
+    Columnar store of scraped decks for fast aggregate analytics.
+
+    @author: z33k
+
+"""
+import json
+import logging
+import uuid
+from array import array
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from types import TracebackType
+from typing import Iterable, Iterator, Type
+
+from mtg import Json, OUTPUT_DIR, PathLike
+from mtg.deck.scrapers.melee import ALT_DOMAIN as MELEE_ALT_DOMAIN
+from mtg.utils import Counter, timed
+from mtg.utils.files import getdir
+
+_log = logging.getLogger(__name__)
+
+
+CORPUS_FILE = OUTPUT_DIR / "channels" / "deck_corpus.json"
+CARD_INDEX_FILE = OUTPUT_DIR / "channels" / "card_index.json"
+_SECTIONS = {"About", "Commander", "Companion", "Deck", "Sideboard"}
+
+
+def normalize_source(src: str) -> str:
+    """Normalize deck source domain for aggregation purposes.
+    """
+    src = src.removeprefix("www.") if src.startswith("www.") else src
+    if "tcgplayer" in src:
+        _, *parts = src.split(".")
+        src = ".".join(parts)
+    elif MELEE_ALT_DOMAIN in src:
+        src = "melee.gg"
+    return src
+
+
+def count_cards(decklist: str) -> dict[str, int]:
+    """Count cards in an Arena ``decklist`` (as exported by ``Exporter.build_decklist()``).
+    """
+    counts = defaultdict(int)
+    for line in decklist.splitlines():
+        if not line or line in _SECTIONS or line.startswith("Name "):
+            continue
+        quantity, name = line.split(maxsplit=1)
+        counts[name] += int(quantity)
+    return dict(counts)
+
+
+class _Dictionary:
+    """Dictionary encoding of a string column.
+    """
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.values = [*values]
+        self._codes = {v: i for i, v in enumerate(self.values)}
+
+    def encode(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code(self, value: str) -> int | None:
+        return self._codes.get(value)
+
+
+class DeckCorpus:
+    """Columnar store of scraped decks with their metadata and card counts.
+
+    Each deck is a row spread across parallel columns. String columns are dictionary-encoded
+    and kept in `array` objects together with numeric ones. Card counts are kept in a compressed
+    sparse row layout (offsets into flat card/quantity columns), so that aggregations run as
+    tight loops over integer arrays instead of loading and re-parsing channel files.
+
+    Can be used as a context manager, in which case it's loaded on entering and dumped on exit.
+
+    Each corpus carries a generation token that changes whenever its existing rows are rewritten
+    (appending rows keeps it), so that anything keyed to its rows and card codes (e.g. a card
+    index) can tell it's gone stale.
+    """
+    # dictionary-encoded string columns (an empty string stands for a missing value)
+    STR_COLUMNS = (
+        "channel", "video", "name", "format", "irregular_format", "source", "decklist_id")
+    UNDEFINED_FMT, IRREGULAR_FMT = "undefined", "irregular"
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def generation(self) -> str:
+        return self._generation
+
+    def __init__(self, path: PathLike = CORPUS_FILE) -> None:
+        self._path = Path(path)
+        self._generation = uuid.uuid4().hex
+        self._dicts = {col: _Dictionary() for col in self.STR_COLUMNS}
+        self._columns = {col: array("I") for col in self.STR_COLUMNS}
+        self._dates = array("I")  # proleptic Gregorian ordinals (0 for missing)
+        self._cards = _Dictionary()
+        self._card_offsets, self._card_ids, self._card_quantities = array(
+            "I", [0]), array("I"), array("H")
+        self._keys: set[tuple[str, str]] = set()
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def __enter__(self) -> "DeckCorpus":
+        self.load()
+        return self
+
+    def __exit__(
+            self, exc_type: Type[BaseException] | None, exc_val: BaseException | None,
+            exc_tb: TracebackType | None) -> None:
+        self.dump()
+
+    def add(
+            self, channel: str, video: str, metadata: Json, decklist: str | None,
+            decklist_id: str) -> bool:
+        """Add a deck to this corpus.
+
+        Args:
+            channel: handle of the channel the deck was scraped from
+            video: ID of the video the deck was scraped from
+            metadata: deck's metadata
+            decklist: deck's decklist in Arena format (if None, e.g. when missing from the
+                global repository, the deck is counted in aggregations, but has no card counts)
+            decklist_id: deck's decklist ID (used for de-duplication within a video)
+
+        Returns:
+            True if the deck was added, False if it had been already present
+        """
+        key = video, decklist_id
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        values = {
+            "channel": channel,
+            "video": video,
+            "name": metadata.get("name", ""),
+            "format": metadata.get("format", ""),
+            "irregular_format": metadata.get("irregular_format", ""),
+            "source": metadata.get("source", ""),
+            "decklist_id": decklist_id,
+        }
+        for col, value in values.items():
+            self._columns[col].append(self._dicts[col].encode(value))
+        dt = metadata.get("date")
+        if isinstance(dt, str):
+            dt = date.fromisoformat(dt)
+        self._dates.append(dt.toordinal() if dt else 0)
+        for name, quantity in count_cards(decklist or "").items():
+            self._card_ids.append(self._cards.encode(name))
+            self._card_quantities.append(quantity)
+        self._card_offsets.append(len(self._card_ids))
+        return True
+
+    def replace_decklists(self, replacements: dict[str, tuple[str, str]]) -> int:
+        """Replace decklists (and their IDs) of decks in this corpus in place.
+
+        Args:
+            replacements: a mapping of old decklist IDs to pairs of new decklist IDs and decklists
+
+        Returns:
+            number of replaced rows
+        """
+        old_codes = {self._dicts["decklist_id"].code(id_): id_ for id_ in replacements}
+        old_codes.pop(None, None)
+        if not old_codes:
+            return 0
+        ids_col, videos = self._columns["decklist_id"], self._dicts["video"].values
+        offsets, card_ids, quantities = array("I", [0]), array("I"), array("H")
+        replaced = 0
+        for row in range(len(self)):
+            old_id = old_codes.get(ids_col[row])
+            if old_id is None:
+                card_ids.extend(self._card_ids[self._card_offsets[row]:self._card_offsets[row + 1]])
+                quantities.extend(
+                    self._card_quantities[self._card_offsets[row]:self._card_offsets[row + 1]])
+            else:
+                new_id, decklist = replacements[old_id]
+                ids_col[row] = self._dicts["decklist_id"].encode(new_id)
+                video = videos[self._columns["video"][row]]
+                self._keys.discard((video, old_id))
+                self._keys.add((video, new_id))
+                for name, quantity in count_cards(decklist).items():
+                    card_ids.append(self._cards.encode(name))
+                    quantities.append(quantity)
+                replaced += 1
+            offsets.append(len(card_ids))
+        self._card_offsets, self._card_ids, self._card_quantities = offsets, card_ids, quantities
+        if replaced:
+            self._generation = uuid.uuid4().hex
+        return replaced
+
+    def _decoded(self, col: str) -> list[str]:
+        values = self._dicts[col].values
+        return [values[code] for code in self._columns[col]]
+
+    def _format_codes(self) -> list[str]:
+        irregular = self._columns["irregular_format"]
+        irregular_values = self._dicts["irregular_format"].values
+        fmts = self._decoded("format")
+        for i, fmt in enumerate(fmts):
+            if not fmt:
+                fmts[i] = self.IRREGULAR_FMT if irregular_values[
+                    irregular[i]] else self.UNDEFINED_FMT
+        return fmts
+
+    def format_counter(self) -> Counter:
+        """Return counts of decks per format.
+        """
+        return Counter(self._format_codes())
+
+    def source_counter(self) -> Counter:
+        """Return counts of decks per (normalized) source.
+        """
+        # group by dictionary codes first, then normalize only the distinct values
+        codes = defaultdict(int)
+        for code in self._columns["source"]:
+            codes[code] += 1
+        values, counts = self._dicts["source"].values, defaultdict(int)
+        for code, count in codes.items():
+            counts[normalize_source(values[code])] += count
+        return Counter(counts)
+
+    def card_popularity(self, fmt="", copies=False) -> Counter:
+        """Return counts of decks that play each card (optionally, in format designated by
+        ``fmt``).
+
+        Args:
+            fmt: optionally, the format to narrow down the aggregation to
+            copies: if True, count all copies of each card instead of decks playing it
+        """
+        fmts = self._format_codes() if fmt else None
+        totals = defaultdict(int)
+        offsets, ids, quantities = self._card_offsets, self._card_ids, self._card_quantities
+        for row in range(len(self)):
+            if fmts and fmts[row] != fmt:
+                continue
+            for i in range(offsets[row], offsets[row + 1]):
+                totals[ids[i]] += quantities[i] if copies else 1
+        names = self._cards.values
+        return Counter({names[code]: count for code, count in totals.items()})
+
+    def meta_shares(self, fmt="", period="month") -> dict[str, dict[str, float]]:
+        """Return time series of meta shares.
+
+        If ``fmt`` is specified, shares of deck names (archetypes) within that format are
+        returned (unnamed decks are skipped). Otherwise, shares of formats among all decks are.
+
+        Args:
+            fmt: optionally, the format to compute archetype shares for
+            period: either 'month' or 'year'
+        """
+        if period not in ("month", "year"):
+            raise ValueError(f"Invalid period: {period!r}. Can be only 'month' or 'year'")
+        fmts, names = self._format_codes(), self._decoded("name")
+        series = defaultdict(lambda: defaultdict(int))
+        for row, ordinal in enumerate(self._dates):
+            if not ordinal or (fmt and (fmts[row] != fmt or not names[row])):
+                continue
+            dt = date.fromordinal(ordinal)
+            key = f"{dt.year}-{dt.month:02}" if period == "month" else str(dt.year)
+            series[key][names[row] if fmt else fmts[row]] += 1
+        result = {}
+        for key in sorted(series):
+            total = sum(series[key].values())
+            result[key] = {k: v / total for k, v in sorted(
+                series[key].items(), key=lambda p: p[1], reverse=True)}
+        return result
+
+    def card_name(self, code: int) -> str:
+        return self._cards.values[code]
+
+    def card_code(self, name: str) -> int | None:
+        return self._cards.code(name)
+
+    def rows(self, start=0) -> Iterator[tuple[str, int, array]]:
+        """Yield (format, date ordinal, card codes) triples for decks starting from row
+        designated by ``start``.
+        """
+        fmts = self._format_codes()
+        offsets = self._card_offsets
+        for row in range(start, len(self)):
+            yield fmts[row], self._dates[row], self._card_ids[offsets[row]:offsets[row + 1]]
+
+    @timed("loading deck corpus")
+    def load(self) -> None:
+        """Load this corpus from its file (if it exists).
+        """
+        if not self.path.is_file():
+            _log.info(f"No deck corpus found at: '{self.path}'. Starting a new one")
+            return
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        # corpora dumped without a generation get a new one (forcing a re-index once)
+        self._generation = data.get("generation") or uuid.uuid4().hex
+        for col in self.STR_COLUMNS:
+            self._dicts[col] = _Dictionary(data["dictionaries"][col])
+            self._columns[col] = array("I", data["columns"][col])
+        self._dates = array("I", data["columns"]["date"])
+        self._cards = _Dictionary(data["dictionaries"]["card"])
+        self._card_offsets = array("I", data["cards"]["offsets"])
+        self._card_ids = array("I", data["cards"]["ids"])
+        self._card_quantities = array("H", data["cards"]["quantities"])
+        self._keys = set(zip(self._decoded("video"), self._decoded("decklist_id")))
+        _log.info(f"Loaded {len(self):,} deck(s) from the deck corpus")
+
+    def dump(self) -> None:
+        """Dump this corpus to its file.
+        """
+        data = {
+            "generation": self._generation,
+            "dictionaries": {
+                **{col: self._dicts[col].values for col in self.STR_COLUMNS},
+                "card": self._cards.values,
+            },
+            "columns": {
+                **{col: self._columns[col].tolist() for col in self.STR_COLUMNS},
+                "date": self._dates.tolist(),
+            },
+            "cards": {
+                "offsets": self._card_offsets.tolist(),
+                "ids": self._card_ids.tolist(),
+                "quantities": self._card_quantities.tolist(),
+            },
+        }
+        getdir(self.path.parent)
+        _log.info(f"Dumping deck corpus ({len(self):,} deck(s)) to: '{self.path}'...")
+        self.path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+
+
+def _week(ordinal: int) -> int:
+    """Return ordinal of the Monday starting the week of a date designated by ``ordinal``.
+    """
+    return ordinal - date.fromordinal(ordinal).weekday()
+
+
+class CardIndex:
+    """Card co-occurrence and inclusion index per format built from a deck corpus.
+
+    Co-occurrence is a sparse symmetric matrix of card codes per format. In memory, its rows are
+    kept as dicts (so they can be cheaply updated with each new deck). On disk, they're stored in
+    CSR layout (index pointers, column indices and data). Inclusion counts are kept per format
+    and week (together with number of decks for computing inclusion rates).
+
+    The index remembers how many corpus rows it has already consumed, so ``update()`` only
+    processes decks added since. It also remembers the corpus generation it was built against
+    and re-indexes from scratch when that changes (i.e. when the corpus has been rebuilt or had
+    its rows rewritten).
+    """
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def corpus(self) -> DeckCorpus:
+        return self._corpus
+
+    def __init__(self, corpus: DeckCorpus, path: PathLike = CARD_INDEX_FILE) -> None:
+        self._corpus, self._path = corpus, Path(path)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._indexed, self._generation = 0, self.corpus.generation
+        # format ==> card code ==> co-occurring card code ==> count
+        self._cooccurrences: defaultdict[str, defaultdict[int, defaultdict[int, int]]] = \
+            defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+        # (format, week ordinal) ==> card code ==> count of decks including that card
+        self._inclusions: defaultdict[tuple[str, int], defaultdict[int, int]] = defaultdict(
+            lambda: defaultdict(int))
+        self._deck_counts: defaultdict[tuple[str, int], int] = defaultdict(int)
+
+    def __len__(self) -> int:
+        return self._indexed
+
+    @timed("updating card index")
+    def update(self) -> int:
+        """Index decks added to the corpus since the last update.
+
+        Returns:
+            number of newly indexed decks
+        """
+        if self._generation != self.corpus.generation or self._indexed > len(self.corpus):
+            _log.warning("Card index is stale. Re-indexing from scratch...")
+            self._reset()
+        count = 0
+        for fmt, ordinal, codes in self.corpus.rows(self._indexed):
+            cooccurrences = self._cooccurrences[fmt]
+            for code in codes:
+                row = cooccurrences[code]
+                for other in codes:
+                    if other != code:
+                        row[other] += 1
+            if ordinal:
+                key = fmt, _week(ordinal)
+                self._deck_counts[key] += 1
+                inclusions = self._inclusions[key]
+                for code in codes:
+                    inclusions[code] += 1
+            count += 1
+        self._indexed += count
+        _log.info(f"Indexed {count:,} new deck(s) (total: {self._indexed:,})")
+        return count
+
+    def top_cooccurring(self, card_name: str, fmt="", k=10) -> list[tuple[str, int]]:
+        """Return top ``k`` cards appearing most often with the named card (optionally, only in
+        format designated by ``fmt``).
+        """
+        code = self.corpus.card_code(card_name)
+        if code is None:
+            return []
+        fmts = [fmt] if fmt else [*self._cooccurrences]
+        totals = defaultdict(int)
+        for f in fmts:
+            row = self._cooccurrences[f].get(code) if f in self._cooccurrences else None
+            for other, count in (row or {}).items():
+                totals[other] += count
+        top = sorted(totals.items(), key=lambda p: p[1], reverse=True)[:k]
+        return [(self.corpus.card_name(c), count) for c, count in top]
+
+    def _inclusion_rates(self, fmt: str, start: int, end: int) -> dict[int, float]:
+        totals, decks = defaultdict(int), 0
+        for (f, week), inclusions in self._inclusions.items():
+            if (fmt and f != fmt) or not start <= week < end:
+                continue
+            decks += self._deck_counts[(f, week)]
+            for code, count in inclusions.items():
+                totals[code] += count
+        return {code: count / decks for code, count in totals.items()} if decks else {}
+
+    def top_included(
+            self, fmt="", days=30, k=50, until: date | None = None) -> list[tuple[str, float]]:
+        """Return top ``k`` cards by inclusion rate in decks of the last ``days`` (optionally, only
+        in format designated by ``fmt``).
+
+        Inclusion is indexed per week, so the period is rounded to full weeks.
+        """
+        end = _week((until or date.today()).toordinal()) + 7
+        rates = self._inclusion_rates(fmt, end - days, end)
+        top = sorted(rates.items(), key=lambda p: p[1], reverse=True)[:k]
+        return [(self.corpus.card_name(c), rate) for c, rate in top]
+
+    def trending(
+            self, fmt="", days=30, k=20, until: date | None = None) -> list[tuple[str, float]]:
+        """Return top ``k`` cards with the biggest gain in inclusion rate in decks of the last
+        ``days`` compared to the same period before (optionally, only in format designated by
+        ``fmt``).
+        """
+        end = _week((until or date.today()).toordinal()) + 7
+        current = self._inclusion_rates(fmt, end - days, end)
+        previous = self._inclusion_rates(fmt, end - 2 * days, end - days)
+        deltas = {code: rate - previous.get(code, 0.0) for code, rate in current.items()}
+        top = sorted(deltas.items(), key=lambda p: p[1], reverse=True)[:k]
+        return [(self.corpus.card_name(c), delta) for c, delta in top if delta > 0]
+
+    @timed("loading card index")
+    def load(self) -> None:
+        """Load this index from its file (if it exists).
+        """
+        if not self.path.is_file():
+            _log.info(f"No card index found at: '{self.path}'. Starting a new one")
+            return
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        self._indexed, self._generation = data["indexed"], data.get("generation")
+        for fmt, csr in data["cooccurrences"].items():
+            indptr, indices, values = csr["indptr"], csr["indices"], csr["data"]
+            for code in range(len(indptr) - 1):
+                if indptr[code] == indptr[code + 1]:
+                    continue
+                row = self._cooccurrences[fmt][code]
+                for i in range(indptr[code], indptr[code + 1]):
+                    row[indices[i]] = values[i]
+        for fmt, week, inclusions, decks in data["inclusions"]:
+            self._inclusions[(fmt, week)].update({int(c): n for c, n in inclusions.items()})
+            self._deck_counts[(fmt, week)] = decks
+        _log.info(f"Loaded card index of {self._indexed:,} deck(s)")
+
+    def _to_csr(self, fmt: str) -> Json:
+        rows = self._cooccurrences[fmt]
+        indptr, indices, values = array("I", [0]), array("I"), array("I")
+        for code in range((max(rows) + 1) if rows else 0):
+            for other, count in sorted(rows.get(code, {}).items()):
+                indices.append(other)
+                values.append(count)
+            indptr.append(len(indices))
+        return {"indptr": indptr.tolist(), "indices": indices.tolist(), "data": values.tolist()}
+
+    def dump(self) -> None:
+        """Dump this index to its file.
+        """
+        data = {
+            "indexed": self._indexed,
+            "generation": self._generation,
+            "cooccurrences": {fmt: self._to_csr(fmt) for fmt in self._cooccurrences},
+            "inclusions": [
+                [fmt, week, inclusions, self._deck_counts[(fmt, week)]]
+                for (fmt, week), inclusions in self._inclusions.items()],
+        }
+        getdir(self.path.parent)
+        _log.info(f"Dumping card index ({self._indexed:,} deck(s)) to: '{self.path}'...")
+        self.path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+
+
+def load_card_index() -> CardIndex:
+    """Load the card index and bring it up to date with the deck corpus.
+    """
+    corpus = DeckCorpus()
+    corpus.load()
+    index = CardIndex(corpus)
+    index.load()
+    if index.update():
+        index.dump()
+    return index
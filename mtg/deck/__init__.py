@@ -11,21 +11,28 @@ import itertools
 import json
 import logging
 import re
+import zipfile
 from abc import ABC, abstractmethod
-from collections import Counter, OrderedDict
+from collections import Counter, OrderedDict, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
 from enum import Enum, auto
-from functools import cached_property
-from operator import attrgetter
+from functools import cached_property, lru_cache
+from pathlib import Path
 from typing import Any, Iterable, Iterator
 
+from contexttimer import Timer
+
 from mtg import Json, OUTPUT_DIR, PathLike
 from mtg.scryfall import (COMMANDER_FORMATS, Card, Color,
                           MULTIFACE_SEPARATOR as SCRYFALL_MULTIFACE_SEPARATOR, aggregate,
-                          find_by_cardmarket_id, find_by_collector_number,
-                          find_by_mtgo_id, find_by_name, find_by_oracle_id,
-                          find_by_scryfall_id, find_by_tcgplayer_id, find_sets,
-                          query_api_for_card)
-from mtg.utils import ParsingError, extract_int, from_iterable, getid, getrepr, serialize_dates
+                          bulk_data, card_name_key, find_by_cardmarket_id,
+                          find_by_collector_number, find_by_mtgo_id, find_by_name,
+                          find_by_oracle_id, find_by_scryfall_id, find_by_tcgplayer_id,
+                          find_latest_expansion, normalize_card_name, query_api_for_card)
+from mtg.utils import ParsingError, deserialize_dates, digest, extract_int, from_iterable, getid, \
+    getrepr, serialize_dates, timestamp
 from mtg.utils.files import getdir, getfile
 
 _log = logging.getLogger(__name__)
@@ -352,6 +359,172 @@ class InvalidDeck(ValueError):
     """
 
 
+COLOR_BITS = {"W": 1, "U": 2, "B": 4, "R": 8, "G": 16}
+# deck sizes are inclusive of commanders, 'max_sideboard' of 0 means no sideboard at all (a
+# companion then is kept outside the deck)
+FormatSpec = namedtuple(
+    "FormatSpec", "min_maindeck max_maindeck max_sideboard singleton", defaults=(None, 15, False))
+FORMAT_SPECS = {
+    "brawl": FormatSpec(100, 100, 0, True),
+    "commander": FormatSpec(100, 100, 0, True),
+    "duel": FormatSpec(100, 100, 0, True),
+    "gladiator": FormatSpec(100, 100, 0, True),
+    "oathbreaker": FormatSpec(60, 60, 0, True),
+    "paupercommander": FormatSpec(100, 100, 0, True),
+    "predh": FormatSpec(100, 100, 0, True),
+    "standardbrawl": FormatSpec(60, 60, 0, True),
+}
+
+
+@lru_cache(maxsize=None)
+def color_mask(card: Card) -> int:
+    """Return color identity of ``card`` as a bitmask.
+    """
+    mask = 0
+    for letter in card.json["color_identity"]:
+        mask |= COLOR_BITS[letter]
+    return mask
+
+
+@dataclass(frozen=True)
+class FormatRules:
+    """Deck construction rules for a MtG format.
+
+    Rules are meant to be compiled once per format with ``compile_rules()`` and then used to
+    validate any number of decks in one pass over their unique cards.
+    """
+    fmt: str = ""
+    min_maindeck_size: int = 60
+    max_maindeck_size: int | None = None
+    max_sideboard_size: int = 15
+    max_playset_count: int = 4
+    banned: frozenset[str] = frozenset()
+    restricted: frozenset[str] = frozenset()
+
+    @property
+    def is_singleton(self) -> bool:
+        return self.max_playset_count == 1
+
+    @property
+    def has_sideboard(self) -> bool:
+        return self.max_sideboard_size > 0
+
+    def _max_playset(self, card: Card) -> int | None:
+        if card.is_basic_land or card.allowed_multiples is Ellipsis:
+            return None
+        return self.max_playset_count if card.allowed_multiples is None \
+            else card.allowed_multiples
+
+    def _check_legality(self, card: Card, quantity: int) -> str | None:
+        if card.name in self.banned:
+            return f"{card.name!r} is banned in {self.fmt!r}"
+        elif card.name in self.restricted:
+            if quantity > 1:
+                return f"{card.name!r} is restricted in {self.fmt!r}: {quantity} > 1"
+        elif card.legalities.get(self.fmt) == "not_legal":
+            return f"{card.name!r} is not legal in {self.fmt!r}"
+        return None
+
+    def validate(
+            self, maindeck: dict[Card, list[Card]], sideboard: dict[Card, list[Card]],
+            commanders: list[Card], companion: Card | None = None,
+            check_legality=False) -> list[str]:
+        """Validate deck parts against these rules.
+
+        Args:
+            maindeck: maindeck playsets (as returned by ``aggregate()``)
+            sideboard: sideboard playsets (as returned by ``aggregate()``, including companion)
+            commanders: commander (and partner commander) cards
+            companion: a companion card (if present)
+            check_legality: if True, check cards' legality in this rules' format
+
+        Raises:
+            InvalidDeck: on violations that rule out a valid deck
+
+        Returns:
+            list of messages on non-critical violations (color identity, legality and sizes
+            that scraped decks commonly exceed, i.e. maindecks above the maximum and sideboards
+            in formats that don't have one)
+        """
+        if companion and not companion.is_companion:
+            raise InvalidDeck(f"Not a companion card: '{companion}'")
+        violations = []
+        maindeck_size = sum(len(playset) for playset in maindeck.values()) + len(commanders)
+        if maindeck_size < self.min_maindeck_size:
+            raise InvalidDeck(
+                f"Invalid deck size: {maindeck_size} < {self.min_maindeck_size}")
+        if self.max_maindeck_size is not None and maindeck_size > self.max_maindeck_size:
+            violations.append(f"Invalid deck size: {maindeck_size} > {self.max_maindeck_size}")
+        sideboard_size = sum(len(playset) for playset in sideboard.values())
+        if companion and companion in sideboard and not self.has_sideboard:
+            sideboard_size -= 1  # companion is kept outside the deck
+        if sideboard_size > self.max_sideboard_size:
+            msg = f"Invalid sideboard size: {sideboard_size} > {self.max_sideboard_size}"
+            if self.has_sideboard:
+                raise InvalidDeck(msg)
+            violations.append(msg)
+
+        identity = 0
+        for cmd in commanders:
+            identity |= color_mask(cmd)
+
+        for card in {*maindeck, *sideboard, *commanders}:
+            quantity = len(maindeck.get(card, ())) + len(sideboard.get(card, ()))
+            quantity += commanders.count(card)
+            max_playset = self._max_playset(card)
+            if max_playset is not None and quantity > max_playset:
+                raise InvalidDeck(
+                    f"Too many occurrences of {card.name!r}: {quantity} > {max_playset}")
+            if commanders and color_mask(card) & ~identity:
+                violations.append(
+                    f"Color identity of '{card}' ({card.color_identity}) doesn't match "
+                    f"commander's color identity "
+                    f"({Color.from_letters(*[l for l, b in COLOR_BITS.items() if identity & b])})")
+            if check_legality and self.fmt:
+                if violation := self._check_legality(card, quantity):
+                    violations.append(violation)
+        return violations
+
+
+@lru_cache
+def _legality_sets(fmt: str) -> tuple[frozenset[str], frozenset[str]]:
+    banned, restricted = set(), set()
+    for card in bulk_data():
+        legality = card.legalities.get(fmt)
+        if legality == "banned":
+            banned.add(card.name)
+        elif legality == "restricted":
+            restricted.add(card.name)
+    return frozenset(banned), frozenset(restricted)
+
+
+@lru_cache
+def compile_rules(fmt: str = "", commander=False, legality=False) -> FormatRules:
+    """Compile deck construction rules for format designated by ``fmt``.
+
+    Sizes and singleton status are taken from ``FORMAT_SPECS`` (generic Constructed rules apply
+    to formats not listed there). Banned and restricted cards are gathered from Scryfall
+    legality data.
+
+    Args:
+        fmt: Scryfall format designation (generic Constructed rules are compiled if not provided)
+        commander: True, if the validated deck has a commander (this enforces singleton rules)
+        legality: if True, gather banned and restricted cards (needed for legality checks)
+    """
+    fmt = fmt.lower()
+    spec = FORMAT_SPECS.get(fmt, FormatSpec(Deck.MIN_MAINDECK_SIZE, None, Deck.MAX_SIDEBOARD_SIZE))
+    banned, restricted = _legality_sets(fmt) if legality and fmt else (frozenset(), frozenset())
+    return FormatRules(
+        fmt=fmt,
+        min_maindeck_size=spec.min_maindeck,
+        max_maindeck_size=spec.max_maindeck,
+        max_sideboard_size=spec.max_sideboard,
+        max_playset_count=1 if commander or spec.singleton else 4,
+        banned=banned,
+        restricted=restricted,
+    )
+
+
 # this class tries to be as generic as possible and still support multiple Constructed formats
 # this means some more complicated formats like Oathbreaker are not fully supported (e.g a Deck
 # knows nothing about signature spells) to not over-complicate things (by either going into an
@@ -395,11 +568,11 @@ class Deck:
             commanders.append(self.partner_commander)
         return [*commanders, *self.maindeck, *self.sideboard]
 
-    @property
+    @cached_property
     def color(self) -> Color:
         return Color.from_cards(*self.cards)
 
-    @property
+    @cached_property
     def color_identity(self) -> Color:
         return Color.from_cards(*self.cards, identity=True)
 
@@ -569,12 +742,7 @@ class Deck:
 
     @cached_property
     def latest_set(self) -> str | None:
-        set_codes = {c.set for c in self.cards if not c.is_basic_land}
-        sets = find_sets(lambda s: s.code in set_codes and s.is_expansion)
-        if not sets:
-            return None
-        sets = sorted(sets, key=attrgetter("released_at"))
-        return [s.code for s in sets][-1]
+        return find_latest_expansion(*{c.set for c in self.cards if not c.is_basic_land})
 
     def __init__(
             self, maindeck: Iterable[Card], sideboard: Iterable[Card] | None = None,
@@ -594,63 +762,39 @@ class Deck:
             cards = {*maindeck, *sideboard}
             if any(cmd in cards for cmd in commanders):
                 raise InvalidDeck(f"Redundant commander maindeck/sideboard inclusion")
-            identity = {clr for c in commanders for clr in c.color_identity.value}
-            for card in [*maindeck, *sideboard]:
-                if any(letter not in identity for letter in card.color_identity.value):
-                    _log.warning(
-                        f"Color identity of '{card}' ({card.color_identity}) doesn't match "
-                        f"commander's color identity ({Color.from_letters(*identity)})")
         self._commander, self._partner_commander = commander, partner_commander
-
-        if companion:
-            if not companion.is_companion:
-                raise InvalidDeck(f"Not a companion card: '{companion}'")
         self._companion = companion
 
-        sideboard = [*sideboard] if sideboard else []
         sideboard = [
             companion, *sideboard] if companion and companion not in sideboard else sideboard
         self._metadata = metadata or {}
+        if not self.companion and sideboard:
+            self._companion = from_iterable(sideboard, lambda c: c.is_companion)
+
+        playsets, sideboard_playsets = aggregate(*maindeck), aggregate(*sideboard)
+        rules = compile_rules(self.format or "", commander=commander is not None)
+        for violation in rules.validate(
+                playsets, sideboard_playsets, commanders, self.companion):
+            _log.warning(violation)
 
-        self._max_playset_count = 1 if commander is not None else 4
-        playsets = aggregate(*maindeck)
-        for playset in playsets.values():
-            self._validate_playset(playset)
         self._maindeck = [*itertools.chain(
             *sorted(playsets.values(), key=lambda l: l[0].name))]
+        self._sideboard = [*itertools.chain(
+            *sorted(sideboard_playsets.values(), key=lambda l: l[0].name))]
 
-        if (len(self.maindeck) + len(commanders)) < self.MIN_MAINDECK_SIZE:
-            raise InvalidDeck(
-                f"Invalid deck size: {len(self.maindeck) + len(commanders)} "
-                f"< {self.MIN_MAINDECK_SIZE}")
-
-        self._sideboard = []
-        if sideboard:
-            if not self.companion:
-                comp = from_iterable(sideboard, lambda c: c.is_companion)
-                if comp:
-                    self._companion = comp
-            self._sideboard_playsets = aggregate(*sideboard)
-            self._sideboard = [*itertools.chain(
-                *sorted(self._sideboard_playsets.values(), key=lambda l: l[0].name))]
-            temp_playsets = aggregate(*self.cards)
-            for playset in temp_playsets.values():
-                self._validate_playset(playset)
-            if len(self.sideboard) > self.MAX_SIDEBOARD_SIZE:
-                raise InvalidDeck(
-                    f"Invalid sideboard size: {len(self.sideboard)} > {self.MAX_SIDEBOARD_SIZE}")
-
-    def _validate_playset(self, playset: list[Card]) -> None:
-        card = playset[0]
-        if card.is_basic_land or card.allowed_multiples is Ellipsis:
-            pass
-        else:
-            max_playset = self._max_playset_count if card.allowed_multiples is None \
-                else card.allowed_multiples
-            if len(playset) > max_playset:
-                raise InvalidDeck(
-                    f"Too many occurrences of {card.name!r}: "
-                    f"{len(playset)} > {max_playset}")
+    def audit(self, fmt="") -> list[str]:
+        """Return list of all violations of construction rules for format designated by ``fmt``
+        (or this deck's format, if not provided).
+        """
+        fmt = fmt or self.format or ""
+        commanders = [c for c in [self.commander, self.partner_commander] if c]
+        rules = compile_rules(fmt, commander=self.commander is not None, legality=True)
+        try:
+            return rules.validate(
+                aggregate(*self.maindeck), aggregate(*self.sideboard), commanders,
+                self.companion, check_legality=True)
+        except InvalidDeck as err:
+            return [str(err)]
 
     def __repr__(self) -> str:
         reprs = [("name", self.name)] if self.name else []
@@ -771,6 +915,72 @@ class Deck:
         Exporter(self, filename).to_json(dstdir)
 
 
+def audit_decks(*decks: Deck, fmt="") -> Iterator[tuple[Deck, list[str]]]:
+    """Audit ``decks`` against construction rules of their formats (or format designated by
+    ``fmt``, if provided) and yield each one with its list of violations.
+
+    Rules are compiled only once per format, so this is suitable for batch auditing of stored
+    decks.
+    """
+    for deck in decks:
+        yield deck, deck.audit(fmt)
+
+
+# a compact form of a deck: cards go as their Scryfall IDs (or whole, if they aren't in the local
+# card data), so it's cheap to pass between processes and (if it holds no whole cards) to store
+# as JSON
+PackedDeck = tuple[
+    list[tuple[str | Card, int]], list[tuple[str | Card, int]], str | Card | None,
+    str | Card | None, str | Card | None, Json]
+
+
+def _pack_card(card: Card | None) -> str | Card | None:
+    if card is None:
+        return None
+    return card.id if find_by_scryfall_id(card.id) is card else card
+
+
+def _unpack_card(packed: str | Card | None) -> Card | None:
+    return find_by_scryfall_id(packed) if isinstance(packed, str) else packed
+
+
+def pack_deck(deck: Deck | None) -> PackedDeck | None:
+    """Pack ``deck`` into its compact form (see ``unpack_deck()``).
+    """
+    if deck is None:
+        return None
+    maindeck = [(_pack_card(card), len(playset)) for card, playset in aggregate(
+        *deck.maindeck).items()]
+    sideboard = [(_pack_card(card), len(playset)) for card, playset in aggregate(
+        *deck.sideboard).items()]
+    return (
+        maindeck, sideboard, _pack_card(deck.commander), _pack_card(deck.partner_commander),
+        _pack_card(deck.companion), dict(deck.metadata))
+
+
+def unpack_deck(packed: PackedDeck | None) -> Deck | None:
+    """Rebuild a deck from its compact form (as returned by ``pack_deck()``).
+
+    Cards are looked up by their Scryfall IDs, so no card name resolution is involved.
+    """
+    if packed is None:
+        return None
+    maindeck, sideboard, commander, partner_commander, companion, metadata = packed
+    return Deck(
+        [card for c, qty in maindeck for card in [_unpack_card(c)] * qty],
+        [card for c, qty in sideboard for card in [_unpack_card(c)] * qty],
+        _unpack_card(commander), _unpack_card(partner_commander), _unpack_card(companion),
+        metadata)
+
+
+def is_storable(packed: PackedDeck) -> bool:
+    """Return True if ``packed`` deck holds only card IDs (and so can be stored as JSON).
+    """
+    maindeck, sideboard, *cards, _ = packed
+    return not any(isinstance(c, Card) for c, _ in [*maindeck, *sideboard]) and not any(
+        isinstance(c, Card) for c in cards)
+
+
 class Exporter:
     """Export a deck to Forge MTG .dck file or Arena deck file. Also, import a deck from those
     formats.
@@ -785,6 +995,7 @@ Name={}
 {}
 """
     NAME_SEP = "_"
+    SIDECAR_SUFFIX = ".meta.json"
 
     SOURCE_NICKNAMES = {
         "aetherhub.com": "Aetherhub",
@@ -844,9 +1055,26 @@ Name={}
         'vintage': "Vnt",
     }
 
+    @cached_property
+    def _filename(self) -> str:
+        return self._custom_filename or self._build_filename()
+
+    @cached_property
+    def _commander_playsets(self) -> list[list[Card]]:
+        commanders = [c for c in (self._deck.commander, self._deck.partner_commander) if c]
+        return [*aggregate(*commanders).values()]
+
+    @cached_property
+    def _maindeck_playsets(self) -> list[list[Card]]:
+        return sorted(aggregate(*self._deck.maindeck).values(), key=lambda l: l[0].name)
+
+    @cached_property
+    def _sideboard_playsets(self) -> list[list[Card]]:
+        return sorted(aggregate(*self._deck.sideboard).values(), key=lambda l: l[0].name)
+
     def __init__(self, deck: Deck, filename="") -> None:
         self._deck = deck
-        self._filename = filename or self._build_filename()
+        self._custom_filename = filename
 
     @classmethod
     def _normalize(cls, name: str) -> str:
@@ -861,14 +1089,15 @@ Name={}
     def _build_filename_core(self) -> str:
         core = ""
         # color
-        if len(self._deck.color.value) == 1:
-            core += f"Mono{self.NAME_SEP}{self._deck.color.name.title()}{self.NAME_SEP}"
-        elif len(self._deck.color.value) == 4:
+        color = self._deck.color
+        if len(color.value) == 1:
+            core += f"Mono{self.NAME_SEP}{color.name.title()}{self.NAME_SEP}"
+        elif len(color.value) == 4:
             core += f"4C{self.NAME_SEP}"
-        elif len(self._deck.color.value) == 5:
+        elif len(color.value) == 5:
             core += f"5C{self.NAME_SEP}"
         else:
-            core += f"{self._deck.color.name.title()}{self.NAME_SEP}"
+            core += f"{color.name.title()}{self.NAME_SEP}"
         # theme
         if self._deck.theme:
             core += f"{self._deck.theme}{self.NAME_SEP}"
@@ -877,22 +1106,22 @@ Name={}
         return core
 
     def _build_filename(self) -> str:
+        metadata = self._deck.metadata
         # prefix (source/author)
         source = self.SOURCE_NICKNAMES.get(self._deck.source) or ""
-        prefix = source if self._deck.is_meta_deck and source else self._deck.metadata.get(
-            "author", "")
+        prefix = source if self._deck.is_meta_deck and source else metadata.get("author", "")
         name = f"{prefix}{self.NAME_SEP}" if prefix else ""
         # format
         if self._deck.format:
             name += f"{self.FMT_NICKNAMES[self._deck.format.lower()]}{self.NAME_SEP}"
         # mode
-        if mode := self._deck.metadata.get("mode"):
+        if mode := metadata.get("mode"):
             if mode in {m.value for m in Mode}:
                 name += f"{mode}{self.NAME_SEP}"
         # meta
         if self._deck.is_meta_deck:
             name += f"Meta{self.NAME_SEP}"
-            meta = self._deck.metadata["meta"]
+            meta = metadata["meta"]
             if meta_place := meta.get("place"):
                 name += f"#{str(meta_place).zfill(2)}{self.NAME_SEP}"
         if self._deck.name:
@@ -909,19 +1138,11 @@ Name={}
         card = playset[0]
         return f"{len(playset)} {card.first_face_name}|{card.set.upper()}|1"
 
-    # TODO: stop using filename to encode deck metadata (see use of self._parse_filename())
+    # filename-encoded metadata is kept for files without a sidecar (see read_metadata())
     def _build_forge(self) -> str:
-        commander = [
-            self._to_forge_line(playset) for playset in
-            aggregate(self._deck.commander).values()] if self._deck.commander else []
-        if self._deck.partner_commander:
-            commander += [self._to_forge_line(playset) for playset in aggregate(
-                self._deck.partner_commander).values()]
-        maindeck = [
-            self._to_forge_line(playset) for playset in aggregate(*self._deck.maindeck).values()]
-        sideboard = [
-            self._to_forge_line(playset) for playset in
-            aggregate(*self._deck.sideboard).values()] if self._deck.sideboard else []
+        commander = [self._to_forge_line(playset) for playset in self._commander_playsets]
+        maindeck = [self._to_forge_line(playset) for playset in self._maindeck_playsets]
+        sideboard = [self._to_forge_line(playset) for playset in self._sideboard_playsets]
         return self.DCK_TEMPLATE.format(
             self._filename, "\n".join(commander), "\n".join(maindeck), "\n".join(sideboard))
 
@@ -931,6 +1152,56 @@ Name={}
         dst = dstdir / f"{self._filename}.dck"
         _log.info(f"Exporting deck to: '{dst}'...")
         dst.write_text(self._build_forge(), encoding="utf-8")
+        self.sidecar_path(dst).write_text(self.build_sidecar(), encoding="utf-8")
+
+    def build_sidecar(self) -> str:
+        """Build a compact metadata sidecar file's content for an exported deck file.
+        """
+        return json.dumps(
+            self._deck.metadata, ensure_ascii=False, separators=(",", ":"),
+            default=serialize_dates)
+
+    @classmethod
+    def sidecar_path(cls, path: PathLike) -> Path:
+        """Return path to a metadata sidecar file of a deck file at ``path``.
+        """
+        path = Path(path)
+        return path.with_name(f"{path.stem}{cls.SIDECAR_SUFFIX}")
+
+    @classmethod
+    def read_metadata(cls, path: PathLike) -> Json:
+        """Read metadata of a deck file at ``path`` from its sidecar file or, if there's none,
+        recover it from the deck's name (taken from the 'Name=' line of a Forge file or from the
+        filename).
+        """
+        path = Path(path)
+        sidecar = cls.sidecar_path(path)
+        if sidecar.is_file():
+            return json.loads(sidecar.read_text(encoding="utf-8"), object_hook=deserialize_dates)
+        name = path.stem
+        if path.suffix.lower() == ".dck":
+            with path.open(encoding="utf-8") as f:
+                if line := next((l for l in f if l.startswith("Name=")), None):
+                    name = line.removeprefix("Name=").rstrip("\n")
+        return cls._parse_filename(name)
+
+    def build(self, target: str) -> tuple[str, str]:
+        """Build a file for ``target`` export format.
+
+        Args:
+            target: one of 'forge', 'arena' or 'json'
+
+        Returns:
+            tuple of: a filename (with extension), the file's content
+        """
+        if target == "forge":
+            return f"{self._filename}.dck", self._build_forge()
+        elif target == "arena":
+            return f"{self._filename}.txt", self.build_decklist()
+        elif target == "json":
+            return f"{self._filename}.json", self._build_json()
+        raise ValueError(
+            f"Invalid export target: {target!r}. Can be only one of: {EXPORT_TARGETS}")
 
     @classmethod
     def _parse_filename(cls, name: str) -> Json:
@@ -972,12 +1243,12 @@ Name={}
     @classmethod
     def from_forge(cls, path: PathLike) -> Deck:
         file = getfile(path, ext=".dck")
-        commander, maindeck, sideboard, metadata = None, [], [], {}
+        commander, maindeck, sideboard = None, [], []
         commander_on, maindeck_on, sideboard_on = False, False, False
+        metadata = cls.read_metadata(file)
         for line in file.read_text(encoding="utf-8").splitlines():
             if line.startswith("Name="):
-                # TODO: stop using filename to encode deck metadata
-                metadata = cls._parse_filename(line.removeprefix("Name="))
+                continue
             elif line == "[Commander]":
                 commander_on = True
                 continue
@@ -1017,33 +1288,27 @@ Name={}
         lines = []
         if about and self._deck.metadata.get("name"):
             lines += ["About", f'Name {self._deck.metadata["name"]}', ""]
-        if self._deck.commander:
-            playset = aggregate(self._deck.commander)[self._deck.commander]
-            lines += ["Commander", self._to_playset_line(playset, extended=extended)]
-            if self._deck.partner_commander:
-                playset = aggregate(self._deck.partner_commander)[self._deck.partner_commander]
-                lines += [self._to_playset_line(playset, extended=extended)]
-            lines += [""]
+        if self._commander_playsets:
+            lines += [
+                "Commander",
+                *[self._to_playset_line(playset, extended=extended) for playset
+                  in self._commander_playsets],
+                ""
+            ]
         if self._deck.companion:
-            playset = aggregate(self._deck.companion)[self._deck.companion]
-            lines += ["Companion", self._to_playset_line(playset, extended=extended), ""]
-        deck_playsets = sorted(
-            (playset for playset in aggregate(*self._deck.maindeck).values()),
-            key=lambda l: l[0].name)
+            lines += ["Companion", self._to_playset_line(
+                [self._deck.companion], extended=extended), ""]
         lines += [
             "Deck",
             *[self._to_playset_line(playset, extended=extended) for playset
-              in deck_playsets]
+              in self._maindeck_playsets]
         ]
-        if self._deck.sideboard:
-            side_playsets = sorted(
-                (playset for playset in aggregate(*self._deck.sideboard).values()),
-                key=lambda l: l[0].name)
+        if self._sideboard_playsets:
             lines += [
                 "",
                 "Sideboard",
                 *[self._to_playset_line(playset, extended=extended) for playset
-                  in side_playsets]
+                  in self._sideboard_playsets]
             ]
         return "\n".join(lines)
 
@@ -1053,6 +1318,7 @@ Name={}
         dst = dstdir / f"{self._filename}.txt"
         _log.info(f"Exporting deck to: '{dst}'...")
         dst.write_text(self.build_decklist(), encoding="utf-8")
+        self.sidecar_path(dst).write_text(self.build_sidecar(), encoding="utf-8")
 
     @classmethod
     def from_arena(cls, path: PathLike) -> Deck:
@@ -1062,24 +1328,97 @@ Name={}
         lines = file.read_text(encoding="utf-8").splitlines()
         if not all(is_arena_line(l) or is_empty(l) for l in lines):
             raise ValueError(f"Not an MTG Arena deck file: '{file}'")
-        metadata = cls._parse_filename(file.name)
+        metadata = cls.read_metadata(file)
         deck = ArenaParser(lines, metadata).parse(
             suppress_parsing_errors=False, suppress_invalid_deck=False)
         if not deck:
             raise ParsingError(f"Unable to parse '{path}' into a deck")
         return deck
 
-    def to_json(self, dstdir: PathLike = "") -> None:
+    def _build_json(self) -> str:
         data = {
             "metadata": self._deck.metadata,
             "decklist": self.build_decklist(),
         }
-        data = json.dumps(data, indent=4, ensure_ascii=False, default=serialize_dates)
+        return json.dumps(data, indent=4, ensure_ascii=False, default=serialize_dates)
+
+    def to_json(self, dstdir: PathLike = "") -> None:
         dstdir = dstdir or OUTPUT_DIR / "json"
         dstdir = getdir(dstdir)
         dst = dstdir / f"{self._filename}.json"
         _log.info(f"Exporting deck to: '{dst}'...")
-        dst.write_text(data, encoding="utf-8")
+        dst.write_text(self._build_json(), encoding="utf-8")
+
+
+EXPORT_TARGETS = ("forge", "arena", "json")
+_EXPORT_DIRS = {"forge": "dck", "arena": "arena", "json": "json"}
+
+
+def export_decks(
+        decks: Iterable[Deck], target="forge", dstdir: PathLike = "", archive=False,
+        workers=8) -> int:
+    """Export ``decks`` in bulk to files in ``target`` format.
+
+    Decks are consumed lazily, so any iterator can be passed. Their names and bodies are built
+    with per-deck stats computed only once and duplicates (decks with the same extended
+    decklist and metadata) are skipped. Files are written through a thread pool with a bounded
+    number of writes in flight (so memory use doesn't grow with the number of decks) or, if
+    ``archive`` is True, into a single .zip archive.
+
+    Args:
+        decks: decks to export
+        target: one of 'forge', 'arena' or 'json'
+        dstdir: optionally, the destination directory (if not provided a default one for the
+            target in the output directory is used)
+        archive: if True, write all files into a single timestamped .zip archive in the
+            destination directory
+        workers: number of threads writing files
+
+    Returns:
+        number of exported decks
+    """
+    if target not in EXPORT_TARGETS:
+        raise ValueError(
+            f"Invalid export target: {target!r}. Can be only one of: {EXPORT_TARGETS}")
+    dstdir = getdir(dstdir or OUTPUT_DIR / _EXPORT_DIRS[target])
+    archive_path = dstdir / f"{target}_{timestamp()}.zip" if archive else None
+    seen_fingerprints, seen_filenames, count = set(), set(), 0
+    _log.info(f"Exporting decks in bulk to: '{archive_path or dstdir}'...")
+    archiver = zipfile.ZipFile(
+        archive_path, "w", compression=zipfile.ZIP_DEFLATED) if archive_path else nullcontext()
+    with Timer() as t, ThreadPoolExecutor(max_workers=workers) as executor, archiver as zip_file:
+        pending = set()
+        for deck in decks:
+            fingerprint = digest(deck.decklist_extended + json.dumps(
+                deck.metadata, ensure_ascii=False, default=serialize_dates))
+            if fingerprint in seen_fingerprints:
+                continue
+            seen_fingerprints.add(fingerprint)
+            filename, content = Exporter(deck).build(target)
+            if filename in seen_filenames:  # different decks may end up with the same name
+                stem, ext = filename.rsplit(".", maxsplit=1)
+                filename = f"{stem}{Exporter.NAME_SEP}{fingerprint[:8]}.{ext}"
+            seen_filenames.add(filename)
+            files = [(filename, content)]
+            if target != "json":  # JSON files hold metadata on their own
+                files.append(
+                    (Exporter.sidecar_path(filename).name, Exporter(deck).build_sidecar()))
+            for name, data in files:
+                if zip_file:
+                    zip_file.writestr(name, data)
+                    continue
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(executor.submit((dstdir / name).write_text, data, encoding="utf-8"))
+            count += 1
+        for future in pending:
+            future.result()
+    rate = count / t.elapsed if t.elapsed else 0.0
+    _log.info(
+        f"Exported {count:,} deck(s) in {t.elapsed:.2f} second(s) ({rate:.1f} deck(s)/s)")
+    return count
 
 
 class ParsingState(Enum):
@@ -1164,11 +1503,10 @@ class DeckParser(ABC):
             cardmarket_id: int | None = None,
             mtgo_id: int | None = None,
             foreign=False) -> Card:
-        name = cls.sanitize_card_name(name)
         if set_and_collector_number:
             if card := find_by_collector_number(*set_and_collector_number):
                 # don't assume set/collector number data is always correct in the input data
-                if card.name == name:
+                if card_name_key(card.name) == card_name_key(name):
                     return card
         if scryfall_id:
             if card := find_by_scryfall_id(scryfall_id):
@@ -1185,10 +1523,11 @@ class DeckParser(ABC):
         if mtgo_id is not None:
             if card := find_by_mtgo_id(mtgo_id):
                 return card
+        # a local miss reaches Scryfall API that doesn't know e.g. 'Wear/Tear' spelling
         if foreign:
-            card = query_api_for_card(name, foreign=True)
+            card = query_api_for_card(normalize_card_name(name), foreign=True)
         else:
-            card = find_by_name(name)
+            card = find_by_name(normalize_card_name(name))
         if not card:
             raise CardNotFound(f"Unable to find card {name!r}")
         return card
@@ -1197,19 +1536,6 @@ class DeckParser(ABC):
     def get_playset(card: Card, quantity: int) -> list[Card]:
         return [card] * quantity
 
-    @staticmethod
-    def sanitize_card_name(text: str) -> str:
-        text = text.replace("’", "'").replace("‑", "-").replace("꞉", ":")
-        if "/" in text:
-            text = text.replace(" / ", f" {SCRYFALL_MULTIFACE_SEPARATOR} ").replace(
-                f" {ARENA_MULTIFACE_SEPARATOR} ", f" {SCRYFALL_MULTIFACE_SEPARATOR} ")
-            # "Wear/Tear" ==> "Wear // Tear"
-            # "Wear//Tear" ==> "Wear // Tear"
-            # "Wear///Tear" ==> "Wear // Tear"
-            text = re.sub(
-                r'(?<=[a-zA-Z])/{1,3}(?=[a-zA-Z])', f' {SCRYFALL_MULTIFACE_SEPARATOR} ', text)
-        return text
-
     @abstractmethod
     def _pre_parse(self) -> None:
         raise NotImplementedError
@@ -7,15 +7,24 @@
     @author: z33k
 
 """
+import itertools
 import logging
+import multiprocessing
 import re
-from typing import Generator
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from enum import Enum, auto
+from functools import lru_cache
+from types import TracebackType
+from typing import Callable, Generator, Iterable, Optional, Sequence, Type
 
 from mtg import Json
-from mtg.deck import ARENA_MULTIFACE_SEPARATOR, CardNotFound, DeckParser, ParsingState
+from mtg.deck import ARENA_MULTIFACE_SEPARATOR, CardNotFound, Deck, DeckParser, PackedDeck, \
+    ParsingState, pack_deck, unpack_deck
 from mtg.scryfall import Card, MULTIFACE_SEPARATOR as SCRYFALL_MULTIFACE_SEPARATOR, \
-    query_api_for_card
-from mtg.utils import ParsingError, extract_int, getrepr
+    bulk_data_version, preload_card_data, query_api_for_card
+from mtg.utils import extract_int, getrepr, timed
 from mtg.utils import is_foreign
 
 _log = logging.getLogger(__name__)
@@ -76,6 +85,10 @@ _ALL_UPPERCASE = (
     "\U0001D734\U0001D756-\U0001D76E\U0001D790-\U0001D7A8\U0001D7CA\U0001E900-\U0001E921"
     "\U0001F130-\U0001F149\U0001F150-\U0001F169\U0001F170-\U0001F189]")
 
+# characters of a card name (after its first letter), including typographic variants of
+# punctuation that card_name_key() normalizes
+_NAME_CHARS = "[\\w\\s'’\"&/,.!:꞉_‑-]"
+
 
 class PlaysetLine:
     """A line of text in MtG Arena decklist format that denotes a card playset.
@@ -84,13 +97,13 @@ class PlaysetLine:
         '4 Commit /// Memory (AKR) 54'
     """
     # matches '4 Commit /// Memory'
-    PATTERN = re.compile("^\\d{1,3}x?\\s" + _ALL_UPPERCASE + "[\\w\\s'\"&/,.!:_-]+")
+    PATTERN = re.compile("^\\d{1,3}x?\\s" + _ALL_UPPERCASE + _NAME_CHARS + "+")
     # matches '4 Commit /// Memory'
-    INVERTED_PATTERN = re.compile("^" + _ALL_UPPERCASE + "[\\w\\s'\"&/,.!:_-]+\\sx?\\d{1,3}$")
+    INVERTED_PATTERN = re.compile("^" + _ALL_UPPERCASE + _NAME_CHARS + "+\\sx?\\d{1,3}$")
     # matches '4 Commit /// Memory (AKR) 54'
     EXTENDED_PATTERN = re.compile(
-        "^\\d{1,3}x?\\s" + _ALL_UPPERCASE +
-        "[\\w\\s'\"&/,.!:_-]+\\s\\([A-Za-z\\d]{3,6}\\)\\s[A-Za-z\\d]{1,6}")
+        "^\\d{1,3}x?\\s" + _ALL_UPPERCASE + _NAME_CHARS +
+        "+\\s\\([A-Za-z\\d]{3,6}\\)\\s[A-Za-z\\d]{1,6}")
 
     @property
     def is_extended(self) -> bool:
@@ -117,7 +130,6 @@ class PlaysetLine:
         return self._collector_number
 
     def __init__(self, line: str) -> None:
-        line = ArenaParser.sanitize_card_name(line)
         self._is_extended = self.EXTENDED_PATTERN.match(line) is not None
         self._is_inverted = self.INVERTED_PATTERN.match(line) is not None
         if self._is_inverted:
@@ -144,122 +156,147 @@ class PlaysetLine:
             pairs += [("setcode", self.set_code), ("collector_number", self.collector_number)]
         return getrepr(self.__class__, *pairs)
 
-    def _handle_foreign(self) -> list[Card] | None:
-        if is_foreign(self._name):
-            if card := query_api_for_card(self._name, foreign=True):
-                return ArenaParser.get_playset(card, self.quantity)
+    @property
+    def card_key(self) -> tuple[str, str, str]:
+        """Return a key identifying the card (regardless of quantity) designated by this line.
+        """
+        return self.name, self.set_code, self.collector_number
+
+    @property
+    def is_queried_online(self) -> bool:
+        """Return True if this line's card is looked up online among printings in all languages
+        when it can't be found in local card data.
+
+        English names are not, as find_card() already queries Scryfall for them on a local miss.
+        """
+        return is_foreign(self._name)
+
+    def _query_online(self) -> Card | None:
+        if self.is_queried_online:
+            return query_api_for_card(self._name, foreign=True)
         return None
 
-    def to_playset(self) -> list[Card]:
+    def to_card(self) -> Card:
         set_and_collector_number = (
             self.set_code, self.collector_number) if self.is_extended else None
         try:
-            return ArenaParser.get_playset(ArenaParser.find_card(
-                self._name, set_and_collector_number), self.quantity)
+            return ArenaParser.find_card(self._name, set_and_collector_number)
         except CardNotFound as cnf:
-            if cards := self._handle_foreign():
-                return cards
+            if card := self._query_online():
+                return card
             raise cnf
 
+    def to_playset(self) -> list[Card]:
+        return ArenaParser.get_playset(self.to_card(), self.quantity)
 
-def _is_playset_line(line: str) -> bool:
-    return bool(PlaysetLine.PATTERN.match(line)) or bool(PlaysetLine.INVERTED_PATTERN.match(line))
-
-
-def is_empty(line: str) -> bool:
-    return not line or line.isspace()
-
-
-def _is_section_line(line: str, *sections: str) -> bool:
-    sections = {*sections}
-    sections.update({section.upper() for section in sections})
-    sections.update({f"{section}:" for section in sections})
-    pattern = re.compile(
-        r"^\s*(" + "|".join(re.escape(section) for section in sections) + r")"
-        r"(\s*[\[\(:]?\s*\d{1,3}[\]\)]?)?\s*:?$", re.IGNORECASE
-    )
-    return bool(pattern.match(line))
-
-
-def _is_about_line(line: str) -> bool:
-    return _is_section_line(line, "About")
-
-
-def _is_name_line(line: str) -> bool:
-    return line.startswith("Name ")
-
-
-def _is_maindeck_line(line: str) -> bool:
-    return _is_section_line(
-        line, "Main", "Maindeck", "Mainboard", "Deck", "Decklist", "Main Deck", "Main Board",
-        "Deck List")
-
-
-def _is_commander_line(line: str) -> bool:
-    return _is_section_line(line, "Commander", "Comandante")
 
+class LineType(Enum):
+    """Type of line in a text that may contain an Arena decklist.
+    """
+    EMPTY = auto()
+    ABOUT = auto()
+    NAME = auto()
+    MAINDECK = auto()
+    COMMANDER = auto()
+    COMPANION = auto()
+    SIDEBOARD = auto()
+    PLAYSET = auto()
+    INVERTED_PLAYSET = auto()
+    OTHER = auto()
 
-def _is_companion_line(line: str) -> bool:
-    return _is_section_line(line, "Companion", "Companheiro")
+    @property
+    def is_playset(self) -> bool:
+        return self is LineType.PLAYSET or self is LineType.INVERTED_PLAYSET
+
+
+_SECTIONS = {
+    LineType.ABOUT: ("About",),
+    LineType.MAINDECK: (
+        "Main", "Maindeck", "Mainboard", "Deck", "Decklist", "Main Deck", "Main Board",
+        "Deck List"),
+    LineType.COMMANDER: ("Commander", "Comandante"),
+    LineType.COMPANION: ("Companion", "Companheiro"),
+    LineType.SIDEBOARD: (
+        "Side", "Sideboard", "Sidedeck", "Sidelist", "Reserva", "Side Board", "Side Deck",
+        "Side List"),
+}
+# matches all section lines at once (the matched section is told by the named group)
+_SECTION_PATTERN = re.compile(
+    r"^\s*(?:" + "|".join(
+        f"(?P<{line_type.name}>" + "|".join(
+            re.escape(section) for section in sorted(sections, key=len, reverse=True)) + ")"
+        for line_type, sections in _SECTIONS.items()) + r"):?"
+    r"(?:\s*[\[\(:]?\s*\d{1,3}[\]\)]?)?\s*:?$", re.IGNORECASE
+)
+
+
+def classify_line(line: str) -> LineType:
+    """Classify ``line`` in one pass over precompiled patterns.
+
+    Section lines take precedence over playset lines (e.g. 'Sideboard 15' is a section line,
+    not an inverted playset line).
+    """
+    if not line or line.isspace():
+        return LineType.EMPTY
+    if line.startswith("Name "):
+        return LineType.NAME
+    if match := _SECTION_PATTERN.match(line):
+        return LineType[match.lastgroup]
+    if PlaysetLine.PATTERN.match(line):
+        return LineType.PLAYSET
+    if PlaysetLine.INVERTED_PATTERN.match(line):
+        return LineType.INVERTED_PLAYSET
+    return LineType.OTHER
 
 
-def _is_sideboard_line(line: str) -> bool:
-    return _is_section_line(
-        line, "Side", "Sideboard", "Sidedeck", "Sidelist", "Reserva", "Side Board", "Side Deck",
-        "Side List")
+def is_empty(line: str) -> bool:
+    return not line or line.isspace()
 
 
 def is_arena_line(line: str) -> bool:
-    if _is_maindeck_line(line) or _is_sideboard_line(line):
-        return True
-    elif _is_commander_line(line) or _is_companion_line(line):
-        return True
-    elif _is_about_line(line) or _is_name_line(line):
-        return True
-    elif _is_playset_line(line):
-        return True
-    return False
+    return classify_line(line) not in (LineType.EMPTY, LineType.OTHER)
 
 
 def get_arena_lines(*lines: str) -> list[str]:
+    types = [classify_line(line) for line in lines]
     arena_lines, regular_lines, inverted_lines = [], set(), set()
-    for i, line in enumerate(lines):
+    for i, (line, type_) in enumerate(zip(lines, types)):
         end_line = arena_lines[-1] if arena_lines else None
-        if _is_about_line(line) and i < len(lines) - 1:
-            if _is_name_line(lines[i + 1]):
+        if type_ is LineType.ABOUT:
+            if i < len(lines) - 1 and types[i + 1] is LineType.NAME:
                 arena_lines.append("About")
-        elif _is_name_line(line) and i > 0:
-            if _is_about_line(lines[i - 1]):
+        elif type_ is LineType.NAME:
+            if i > 0 and types[i - 1] is LineType.ABOUT:
                 arena_lines.append(line)
-        elif _is_maindeck_line(line):
+        elif type_ is LineType.MAINDECK:
             if end_line != "Deck":
                 arena_lines.append("Deck")
-        elif _is_commander_line(line):
+        elif type_ is LineType.COMMANDER:
             if end_line != "Commander":
                 arena_lines.append("Commander")
-        elif _is_companion_line(line):
+        elif type_ is LineType.COMPANION:
             if end_line != "Companion":
                 arena_lines.append("Companion")
-        elif _is_playset_line(line):
+        elif type_.is_playset:
             if not arena_lines:
-                if i < len(lines) - 3 and any(_is_maindeck_line(l) for l in lines[i + 1:i + 4]):
+                if i < len(lines) - 3 and LineType.MAINDECK in types[i + 1:i + 4]:
                     arena_lines.append("Commander")
                 else:
                     arena_lines.append("Deck")
-            if bool(PlaysetLine.INVERTED_PATTERN.match(line)):
+            if type_ is LineType.INVERTED_PLAYSET:
                 inverted_lines.add(line)
             else:
                 regular_lines.add(line)
             arena_lines.append(line)
-        elif _is_sideboard_line(line):
+        elif type_ is LineType.SIDEBOARD:
             if end_line != "Sideboard":
                 arena_lines.append("Sideboard")
-        elif (is_empty(line)
+        elif (type_ is LineType.EMPTY
               and 1 < i < len(lines) - 1
-              and _is_playset_line(lines[i - 2])  # previous previous line
-              and _is_playset_line(lines[i - 1])  # previous line
-              and (_is_playset_line(lines[i + 1]) or _is_sideboard_line(lines[i + 1]))):  # next line
-            if not _is_sideboard_line(lines[i + 1]) and arena_lines[-1] != "Sideboard":
+              and types[i - 2].is_playset  # previous previous line
+              and types[i - 1].is_playset  # previous line
+              and (types[i + 1].is_playset or types[i + 1] is LineType.SIDEBOARD)):  # next line
+            if types[i + 1] is not LineType.SIDEBOARD and arena_lines[-1] != "Sideboard":
                 arena_lines.append("Sideboard")
 
     # return either inverted or regular playset lines, but not both
@@ -274,51 +311,201 @@ def get_arena_lines(*lines: str) -> list[str]:
     return arena_lines
 
 
-def group_arena_lines(*arena_lines: str) -> Generator[list[str], None, None]:
+def _group_typed_lines(
+        typed_lines: Iterable[tuple[str, LineType]]
+) -> Generator[list[tuple[str, LineType]], None, None]:
     current_group, about_on, commander_on, companion_on = [], False, False, False
-    for line in arena_lines:
-        if _is_about_line(line):
+    for line, type_ in typed_lines:
+        if type_ is LineType.ABOUT:
             about_on = True
             if current_group and not (commander_on or companion_on):
                 yield current_group
                 current_group = []  # reset
-        elif _is_commander_line(line):
+        elif type_ is LineType.COMMANDER:
             commander_on = True
             if current_group and not (companion_on or about_on):
                 yield current_group
                 current_group = []  # reset
-        elif _is_companion_line(line):
+        elif type_ is LineType.COMPANION:
             companion_on = True
             if current_group and not (commander_on or about_on):
                 yield current_group
                 current_group = []  # reset
-        elif _is_maindeck_line(line):
+        elif type_ is LineType.MAINDECK:
             if current_group and not (commander_on or companion_on or about_on):
                 about_on, commander_on, companion_on = False, False, False
                 yield current_group
                 current_group = []  # reset
-        current_group.append(line)
+        current_group.append((line, type_))
     if current_group:
         yield current_group
 
 
+def group_arena_lines(*arena_lines: str) -> Generator[list[str], None, None]:
+    for group in _group_typed_lines((line, classify_line(line)) for line in arena_lines):
+        yield [line for line, _ in group]
+
+
+_LOOKAHEAD = 3  # the farthest get_arena_lines() ever looks ahead
+
+
+def _stream_arena_lines(lines: Iterable[str]) -> Generator[tuple[str, LineType], None, None]:
+    # mirrors get_arena_lines() (except for the final filtering), but over a sliding window
+    typed = ((line, classify_line(line)) for line in (l.strip() for l in lines))
+    ahead = deque(itertools.islice(typed, _LOOKAHEAD + 1))
+    behind: deque[LineType] = deque(maxlen=2)
+    end_line, started = None, False
+    while ahead:
+        line, type_ = ahead.popleft()
+        if (next_ := next(typed, None)) is not None:
+            ahead.append(next_)
+        next_types = [t for _, t in ahead]
+        emitted = []
+        if type_ is LineType.ABOUT:
+            if next_types and next_types[0] is LineType.NAME:
+                emitted.append(("About", type_))
+        elif type_ is LineType.NAME:
+            if behind and behind[-1] is LineType.ABOUT:
+                emitted.append((line, type_))
+        elif type_ is LineType.MAINDECK:
+            if end_line != "Deck":
+                emitted.append(("Deck", type_))
+        elif type_ is LineType.COMMANDER:
+            if end_line != "Commander":
+                emitted.append(("Commander", type_))
+        elif type_ is LineType.COMPANION:
+            if end_line != "Companion":
+                emitted.append(("Companion", type_))
+        elif type_.is_playset:
+            if not started:
+                if len(next_types) >= _LOOKAHEAD and LineType.MAINDECK in next_types[:_LOOKAHEAD]:
+                    emitted.append(("Commander", LineType.COMMANDER))
+                else:
+                    emitted.append(("Deck", LineType.MAINDECK))
+            emitted.append((line, type_))
+        elif type_ is LineType.SIDEBOARD:
+            if end_line != "Sideboard":
+                emitted.append(("Sideboard", type_))
+        elif (type_ is LineType.EMPTY
+              and len(behind) == 2
+              and next_types
+              and behind[0].is_playset  # previous previous line
+              and behind[1].is_playset  # previous line
+              and (next_types[0].is_playset or next_types[0] is LineType.SIDEBOARD)):
+            if next_types[0] is not LineType.SIDEBOARD and end_line != "Sideboard":
+                emitted.append(("Sideboard", LineType.SIDEBOARD))
+        for item in emitted:
+            started, end_line = True, item[0]
+            yield item
+        behind.append(type_)
+
+
+def stream_arena_groups(lines: Iterable[str]) -> Generator[list[str], None, None]:
+    """Yield groups of Arena lines (one group per decklist) found in ``lines`` as soon as they
+    complete.
+
+    This is a streaming counterpart of get_arena_lines() followed by group_arena_lines() meant
+    for huge inputs (e.g. forum exports or comment dumps). It works over any iterable (e.g. an
+    open file) with a small fixed window around the current line, so memory use doesn't depend on
+    the input's size. Unlike get_arena_lines() that decides between regular and inverted playset
+    lines for the whole input, here it's decided per group.
+    """
+    first = True
+    for group in _group_typed_lines(_stream_arena_lines(lines)):
+        regular = {line for line, type_ in group if type_ is LineType.PLAYSET}
+        inverted = {line for line, type_ in group if type_ is LineType.INVERTED_PLAYSET}
+        discarded = regular if len(inverted) > len(regular) else inverted
+        arena_lines = [line for line, _ in group if line not in discarded]
+        # trim empty "Commander"
+        if first and len(arena_lines) >= 2 and arena_lines[:2] == ["Commander", "Deck"]:
+            arena_lines = arena_lines[1:]
+        first = False
+        yield arena_lines
+
+
+def stream_decks(
+        lines: Iterable[str], metadata: Json | None = None) -> Generator[Deck, None, None]:
+    """Parse decks from ``lines`` yielding each as soon as its decklist is read (see
+    stream_arena_groups()).
+    """
+    for group in stream_arena_groups(lines):
+        if len(group) > 2:
+            if deck := ArenaParser(group, dict(metadata or {})).parse():
+                yield deck
+
+
+@lru_cache(maxsize=16_384)
+def _resolve_playset_line(line: str, version: str) -> tuple[int, str, Card | None]:
+    # ``version`` is only there to invalidate entries resolved against outdated card data
+    playset_line = PlaysetLine(line)
+    try:
+        card = playset_line.to_card()
+    except CardNotFound:
+        if playset_line.is_queried_online:
+            # a miss of the foreign online lookup may be transient, so it's re-raised (exceptions
+            # don't get memoized) instead of being cached as None
+            raise
+        card = None
+    return playset_line.quantity, playset_line.name, card
+
+
+def resolve_playset_line(line: str, version: str | None = None) -> list[Card]:
+    """Resolve Arena playset line into a playset of cards.
+
+    Lines are normalized and memoized (alongside the version of card data they were resolved
+    against) in a bounded LRU cache, so recurring lines (e.g. '4 Lightning Bolt') cost only a
+    lookup. Lines with card names that couldn't be found online are not memoized.
+
+    Args:
+        line: Arena playset line
+        version: version of Scryfall bulk data (as returned by bulk_data_version())
+    """
+    version = bulk_data_version() if version is None else version
+    quantity, name, card = _resolve_playset_line(" ".join(line.split()), version)
+    if card is None:
+        raise CardNotFound(f"Unable to find card {name!r}")
+    return ArenaParser.get_playset(card, quantity)
+
+
+def playset_cache_stats() -> Json:
+    """Return statistics of the cache of resolved Arena playset lines.
+    """
+    info = _resolve_playset_line.cache_info()
+    total = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": info.hits / total if total else 0.0,
+    }
+
+
 class ArenaParser(DeckParser):
     """Parser of lines of text that denote a deck in Arena format.
     """
     MAX_CARD_QUANTITY = 50
 
-    def __init__(self, lines: list[str], metadata: Json | None = None) -> None:
+    def __init__(
+            self, lines: list[str], metadata: Json | None = None,
+            cards: dict[tuple[str, str, str], Card | None] | None = None) -> None:
+        """Initialize.
+
+        Args:
+            lines: lines of text to parse
+            metadata: optionally, the deck's metadata
+            cards: optionally, cards already resolved for playset lines (as returned by resolve_cards())
+        """
         super().__init__(metadata)
         self._lines = lines
+        self._cards = cards
+        self._version = bulk_data_version()
 
     def _handle_missing_commander_line(self):
-        if not any(_is_commander_line(l) for l in self._lines):
-            idx = None
-            for i, line in enumerate(self._lines):
-                if _is_maindeck_line(line):
-                    idx = i
-                    break
-            if idx in (1, 2) and all(_is_playset_line(l) for l in self._lines[:idx]):
+        types = [classify_line(l) for l in self._lines]
+        if LineType.COMMANDER not in types:
+            idx = types.index(LineType.MAINDECK) if LineType.MAINDECK in types else None
+            if idx in (1, 2) and all(t.is_playset for t in types[:idx]):
                 self._lines.insert(0, "Commander")
 
     def _pre_parse(self) -> None:  # override
@@ -344,23 +531,35 @@ class ArenaParser(DeckParser):
             return True
         return False
 
+    def _to_playset(self, line: str) -> list[Card]:
+        if self._cards is None:
+            return resolve_playset_line(line, self._version)
+        playset_line = PlaysetLine(line)
+        if playset_line.card_key not in self._cards:
+            return resolve_playset_line(line, self._version)
+        card = self._cards[playset_line.card_key]
+        if card is None:
+            raise CardNotFound(f"Unable to find card {playset_line.name!r}")
+        return self.get_playset(card, playset_line.quantity)
+
     def _parse_deck(self) -> None:  # override
         for line in self._lines:
-            if _is_maindeck_line(line):
+            type_ = classify_line(line)
+            if type_ is LineType.MAINDECK:
                 self._shift_to_maindeck()
-            elif _is_sideboard_line(line):
+            elif type_ is LineType.SIDEBOARD:
                 self._shift_to_sideboard()
-            elif _is_commander_line(line):
+            elif type_ is LineType.COMMANDER:
                 self._shift_to_commander()
-            elif _is_companion_line(line):
+            elif type_ is LineType.COMPANION:
                 self._shift_to_companion()
-            elif _is_name_line(line):
+            elif type_ is LineType.NAME:
                 self._metadata["name"] = line.removeprefix("Name ")
-            elif _is_playset_line(line):
+            elif type_.is_playset:
                 if self._state is ParsingState.IDLE:
                     self._shift_to_maindeck()
 
-                playset = PlaysetLine(line).to_playset()
+                playset = self._to_playset(line)
                 if self._quantity_exceeded(playset):
                     continue
 
@@ -372,3 +571,207 @@ class ArenaParser(DeckParser):
                     self._companion = playset[0]
                 elif self._state is ParsingState.MAINDECK:
                     self._maindeck.extend(playset)
+
+
+def resolve_cards(*lines: str) -> dict[tuple[str, str, str], Card | None]:
+    """Resolve cards designated by all unique playset lines in ``lines`` in one pass.
+
+    Returns:
+        a mapping of playset lines' card keys to cards (or `None` for cards that couldn't be found)
+    """
+    cards, version = {}, bulk_data_version()
+    for line in dict.fromkeys(lines):  # unique lines with order preserved
+        if not classify_line(line).is_playset:
+            continue
+        playset_line = PlaysetLine(line)
+        if playset_line.card_key in cards:
+            continue
+        try:
+            _, _, card = _resolve_playset_line(" ".join(line.split()), version)
+        except CardNotFound:
+            # not memoized (see _resolve_playset_line()) and failing only the decks that need it
+            card = None
+        cards[playset_line.card_key] = card
+    return cards
+
+
+def parse_arena_decklists(*decklists: tuple[list[str], Json | None]) -> list[Deck | None]:
+    """Parse Arena decklists (as pairs of lines and metadata) into decks resolving cards for the
+    whole batch at once.
+
+    Returns:
+        a list of decks (or `None` for decklists that failed to parse) in order of the decklists
+    """
+    cards = resolve_cards(*itertools.chain(*(lines for lines, _ in decklists)))
+    decks = []
+    for lines, metadata in decklists:
+        try:
+            decks.append(ArenaParser([*lines], dict(metadata or {}), cards).parse())
+        except ValueError as err:
+            _log.warning(f"Parsing failed with: {err}")
+            decks.append(None)
+    return decks
+
+
+def parse_arena_groups(*groups: list[str], metadata: Json | None = None) -> list[Deck | None]:
+    """Parse groups of Arena lines (as yielded by group_arena_lines()) into decks resolving
+    cards for the whole batch at once.
+
+    Returns:
+        a list of decks (or `None` for groups that failed to parse) in order of the groups
+    """
+    return parse_arena_decklists(*[(group, metadata) for group in groups])
+
+
+def _parse_texts(texts: Sequence[str], metadata: Json | None = None) -> list[list[Deck]]:
+    text_groups = []
+    for text in texts:
+        lines = [line.strip() for line in text.splitlines()]
+        text_groups.append(
+            [g for g in group_arena_lines(*get_arena_lines(*lines)) if len(g) > 2])
+    decks = iter(parse_arena_groups(*itertools.chain(*text_groups), metadata=metadata))
+    return [[d for d in [next(decks) for _ in groups] if d] for groups in text_groups]
+
+
+def _parse_packed_groups(
+        groups: list[list[str]], metadata: Json | None = None) -> list[PackedDeck | None]:
+    return [pack_deck(deck) for deck in parse_arena_groups(*groups, metadata=metadata)]
+
+
+def _parse_packed_decklists(
+        decklists: list[tuple[list[str], Json | None]]) -> list[PackedDeck | None]:
+    return [pack_deck(deck) for deck in parse_arena_decklists(*decklists)]
+
+
+def _parse_packed_texts(
+        texts: Sequence[str], metadata: Json | None = None) -> list[list[PackedDeck]]:
+    return [[pack_deck(deck) for deck in decks] for decks in _parse_texts(texts, metadata)]
+
+
+def _map_future(future: Future, func: Callable) -> Future:
+    mapped = Future()
+
+    def on_done(f: Future) -> None:
+        try:
+            mapped.set_result(func(f.result()))
+        except BaseException as err:
+            mapped.set_exception(err)
+
+    future.add_done_callback(on_done)
+    return mapped
+
+
+class ParsingPool:
+    """Context manager providing a pool of worker processes for CPU-bound parsing (card resolution
+    and deck building) of already fetched decklist texts.
+
+    If forking is available and safe (i.e. this process runs no other threads yet), card data and
+    its lookup maps are loaded before all the workers are forked upfront on entering, so that they
+    share it read-only (copy-on-write) instead of each loading Scryfall bulk data on its own.
+    Otherwise, the workers are started fresh and load card data on their own.
+
+    Parsed decks are passed back as Scryfall IDs of their cards and rebuilt in this process, as
+    pickling cards together with their full JSON could easily cost more than parsing itself.
+    While the context is active, the pool is available through ParsingPool.active().
+    """
+    _ACTIVE: Optional["ParsingPool"] = None
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def __init__(self, workers: int | None = None) -> None:
+        """Initialize.
+
+        Args:
+            workers: number of worker processes (defaults to the number of CPUs)
+        """
+        self._workers = workers or multiprocessing.cpu_count()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "ParsingPool":
+        preload_card_data()  # needed here to rebuild decks anyway
+        methods = multiprocessing.get_all_start_methods()
+        if "fork" in methods and threading.active_count() == 1:
+            context, initializer = multiprocessing.get_context("fork"), None
+        else:
+            # forking while another thread holds a lock (e.g. of a logging handler) could
+            # deadlock the child
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn")
+            initializer = preload_card_data
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=context, initializer=initializer)
+        # with forking, all workers are forked on the first submission, so that's forced now
+        # (before this process gets to start any threads of its own)
+        self._executor.submit(int).result()
+        ParsingPool._ACTIVE = self
+        _log.info(
+            f"Parsing pool of {self.workers} worker(s) started "
+            f"({context.get_start_method()!r} start method)")
+        return self
+
+    def __exit__(
+            self, exc_type: Type[BaseException] | None, exc_val: BaseException | None,
+            exc_tb: TracebackType | None) -> None:
+        ParsingPool._ACTIVE = None
+        self._executor.shutdown()
+        self._executor = None
+
+    @classmethod
+    def active(cls) -> Optional["ParsingPool"]:
+        return cls._ACTIVE
+
+    def submit_groups(
+            self, groups: list[list[str]], metadata: Json | None = None) -> Future[list[Deck | None]]:
+        """Submit groups of Arena lines to be parsed as in parse_arena_groups().
+        """
+        return _map_future(
+            self._executor.submit(_parse_packed_groups, groups, metadata),
+            lambda decks: [unpack_deck(d) for d in decks])
+
+    def submit_decklists(
+            self, decklists: list[tuple[list[str], Json | None]]) -> Future[list[Deck | None]]:
+        """Submit Arena decklists (as pairs of lines and metadata) to be parsed as in
+        parse_arena_decklists().
+        """
+        return _map_future(
+            self._executor.submit(_parse_packed_decklists, decklists),
+            lambda decks: [unpack_deck(d) for d in decks])
+
+    def submit_texts(
+            self, texts: Sequence[str], metadata: Json | None = None) -> Future[list[list[Deck]]]:
+        """Submit raw texts to be parsed as in parse_decklists().
+        """
+        return _map_future(
+            self._executor.submit(_parse_packed_texts, texts, metadata),
+            lambda decks: [[unpack_deck(d) for d in text_decks] for text_decks in decks])
+
+
+@timed("bulk parsing of decklists")
+def parse_decklists(
+        *texts: str, metadata: Json | None = None, workers=0,
+        chunk_size=500) -> list[list[Deck]]:
+    """Parse many raw ``texts`` (e.g. video descriptions, comments, pastebin bodies or stored
+    decklists) for Arena decklists.
+
+    All texts are tokenized first and all unique card names across the batch are resolved in one
+    pass before any deck is assembled. With ``workers`` specified, the texts are split into
+    chunks parsed across a pool of processes (see ParsingPool).
+
+    Args:
+        texts: raw texts to parse
+        metadata: optionally, metadata common for all the parsed decks
+        workers: number of worker processes (if lesser than 2, everything is parsed in this process)
+        chunk_size: number of texts parsed by a worker process in one go
+
+    Returns:
+        a list of decks parsed from each text (in order of the texts)
+    """
+    if workers < 2 or len(texts) <= chunk_size:
+        return _parse_texts(texts, metadata)
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    _log.info(f"Parsing {len(texts):,} text(s) in {len(chunks)} chunk(s) with {workers} workers...")
+    with ParsingPool(workers) as pool:
+        futures = [pool.submit_texts(chunk, metadata) for chunk in chunks]
+        return [decks for f in futures for decks in f.result()]
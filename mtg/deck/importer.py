@@ -0,0 +1,166 @@
+"""
+
+    mtg.deck.importer.py
+    ~~~~~~~~~~~~~~~~~~~~
+    Import folders of exported deck files in bulk.
+
+    @author: z33k
+
+"""
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from mtg import Json, PathLike
+from mtg.deck import Deck, Exporter, PackedDeck, is_storable, pack_deck, unpack_deck
+from mtg.deck.arena import ParsingPool, parse_arena_decklists
+from mtg.utils import deserialize_dates, digest, serialize_dates, timed
+from mtg.utils.files import getdir
+
+_log = logging.getLogger(__name__)
+
+
+IMPORT_CACHE_FILENAME = ".deck_import_cache.json"
+_FORGE_SECTIONS = {"[Commander]": "Commander", "[Main]": "Deck", "[Sideboard]": "Sideboard"}
+
+
+def _forge_to_arena_lines(text: str) -> list[str]:
+    sections, current = {}, None
+    for line in text.splitlines():
+        if line in _FORGE_SECTIONS:
+            current = sections.setdefault(_FORGE_SECTIONS[line], [])
+        elif current is not None and line and not line.startswith("["):
+            quantity, rest = line.split(maxsplit=1)
+            current.append(f"{quantity} {rest.split('|')[0]}")
+        elif line.startswith("["):
+            current = None
+    lines = []
+    for section, section_lines in sections.items():
+        if section_lines:
+            lines += [section, *section_lines, ""]
+    return lines
+
+
+class _ImportCache:
+    """Cache of imported decks keyed by their files' names.
+
+    Entries are validated with modification times of both a deck file and its metadata sidecar
+    (the deck file's content is hashed only if its modification time has changed). They hold
+    decks packed into Scryfall IDs of their cards (see pack_deck()), so a cached deck is rebuilt
+    without any parsing or card name resolution.
+    """
+    def __init__(self, srcdir: Path) -> None:
+        self._path = srcdir / IMPORT_CACHE_FILENAME
+        self._entries: dict[str, Json] = {}
+        if self._path.is_file():
+            self._entries = json.loads(
+                self._path.read_text(encoding="utf-8"), object_hook=deserialize_dates)
+
+    @staticmethod
+    def _sidecar_mtime(file: Path) -> int | None:
+        sidecar = Exporter.sidecar_path(file)
+        return sidecar.stat().st_mtime_ns if sidecar.is_file() else None
+
+    def get(self, file: Path) -> PackedDeck | None:
+        entry = self._entries.get(file.name)
+        if entry is None or "deck" not in entry:  # missing or in an outdated format
+            return None
+        if entry["sidecar_mtime"] != self._sidecar_mtime(file):
+            return None
+        mtime = file.stat().st_mtime_ns
+        if entry["mtime"] != mtime:
+            if entry["digest"] != digest(file.read_text(encoding="utf-8")):
+                return None
+            entry["mtime"] = mtime
+        return entry["deck"]
+
+    def put(self, file: Path, text: str, deck: Deck) -> None:
+        packed = pack_deck(deck)
+        if not is_storable(packed):  # it holds cards from outside the local card data
+            return
+        self._entries[file.name] = {
+            "mtime": file.stat().st_mtime_ns,
+            "sidecar_mtime": self._sidecar_mtime(file),
+            "digest": digest(text),
+            "deck": packed,
+        }
+
+    def dump(self, files: list[Path]) -> None:
+        names = {f.name for f in files}
+        entries = {k: v for k, v in self._entries.items() if k in names}
+        self._path.write_text(
+            json.dumps(entries, ensure_ascii=False, separators=(",", ":"), default=serialize_dates),
+            encoding="utf-8")
+
+
+def _read_deck_file(
+        file: Path, cache: _ImportCache | None) -> Deck | tuple[list[str], Json, str]:
+    if cache and (packed := cache.get(file)):
+        try:
+            return unpack_deck(packed)
+        except ValueError as err:  # e.g. validation rules have changed since
+            _log.warning(f"Cached deck of '{file}' is no longer valid ({err}). Re-parsing...")
+    text = file.read_text(encoding="utf-8")
+    lines = _forge_to_arena_lines(text) if file.suffix.lower() == ".dck" else text.splitlines()
+    return lines, Exporter.read_metadata(file), text
+
+
+def _parse_decklists(
+        decklists: list[tuple[list[str], Json]], workers: int,
+        chunk_size: int) -> list[Deck | None]:
+    pool = ParsingPool.active()
+    if pool is None and (workers < 2 or len(decklists) <= chunk_size):
+        return parse_arena_decklists(*decklists)
+    chunks = [decklists[i:i + chunk_size] for i in range(0, len(decklists), chunk_size)]
+    if pool:
+        return [deck for f in [pool.submit_decklists(c) for c in chunks] for deck in f.result()]
+    with ParsingPool(workers) as pool:
+        return [deck for f in [pool.submit_decklists(c) for c in chunks] for deck in f.result()]
+
+
+@timed("importing deck files")
+def import_decks(srcdir: PathLike, workers=8, use_cache=True, chunk_size=200) -> dict[Path, Deck]:
+    """Import all Forge (.dck) and Arena (.txt) deck files in ``srcdir``.
+
+    Files are read in parallel by threads. Uncached ones are then parsed in chunks across a pool
+    of worker processes (or in this process, if there are few of them), each chunk resolving its
+    card names in one batch. Metadata is read from sidecar files (as written by Exporter) and,
+    only if those are missing, recovered from the decks' names. Imported decks are cached in the
+    directory and rebuilt from the cache for files whose content and sidecar haven't changed.
+
+    Args:
+        srcdir: directory with deck files
+        workers: number of threads reading files and of processes parsing them
+        use_cache: if False, ignore and don't update the import cache
+        chunk_size: number of deck files parsed by a worker process in one go
+
+    Returns:
+        a mapping of deck files to successfully imported decks
+    """
+    srcdir = getdir(srcdir, create_missing=False)
+    files = sorted(
+        f for f in srcdir.iterdir()
+        if f.is_file() and f.suffix.lower() in (".dck", ".txt"))
+    cache = _ImportCache(srcdir) if use_cache else None
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        read = list(executor.map(lambda f: _read_deck_file(f, cache), files))
+
+    decks = {file: result for file, result in zip(files, read) if isinstance(result, Deck)}
+    uncached = [(file, result) for file, result in zip(files, read)
+                if not isinstance(result, Deck)]
+    parsed = _parse_decklists(
+        [(lines, dict(metadata)) for _, (lines, metadata, _) in uncached], workers, chunk_size)
+    for (file, (_, _, text)), deck in zip(uncached, parsed):
+        if deck:
+            decks[file] = deck
+            if cache:
+                cache.put(file, text, deck)
+        else:
+            _log.warning(f"Unable to import '{file}'")
+    if cache:
+        cache.dump(files)
+    _log.info(
+        f"Imported {len(decks):,} deck(s) from {len(files):,} file(s) in '{srcdir}' "
+        f"({len(files) - len(uncached):,} from cache)")
+    return {file: decks[file] for file in files if file in decks}
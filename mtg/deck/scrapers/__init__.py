@@ -7,21 +7,29 @@
     @author: z33k
 
 """
+import asyncio
+import atexit
 import json
 import logging
+import threading
+import time
 from abc import abstractmethod
-from typing import Callable, Optional, Type
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Optional, Type
 
 import backoff
-from bs4 import BeautifulSoup
-from requests import ConnectionError
+from bs4 import BeautifulSoup, SoupStrainer
+from requests import ConnectionError, HTTPError, ReadTimeout
 
-from mtg import Json
-from mtg.deck import Deck, DeckParser, InvalidDeck
-from mtg.utils.scrape import Throttling, extract_source, throttle
+from mtg import Json, PathLike
+from mtg.deck import Deck, DeckParser, InvalidDeck, ParsingState
+from mtg.utils.ratelimit import get_limiter
+from mtg.utils.scrape import DEFAULT_BROWSER_PROFILE, Throttling, extract_source, get_cache
 from mtg.scryfall import all_formats
 from mtg.utils import ParsingError
-from mtg.utils.scrape import ScrapingError
+from mtg.utils.scrape import ScrapingError, timed_request
 
 _log = logging.getLogger(__name__)
 
@@ -68,7 +76,14 @@ SANITIZED_FORMATS = {
 
 
 class DeckScraper(DeckParser):
-    THROTTLING = Throttling(0.6, 0.15)
+    THROTTLING = Throttling(0.6, 0.15)  # seeds the rate limiter for hosts not seen before
+    CACHE_TTL = 24 * 60 * 60  # seconds a cached response from the scraped site is fresh for
+    BROWSER_PROFILE = DEFAULT_BROWSER_PROFILE  # used by scrapers relying on Selenium
+    # restricts parsing of fetched pages to the parts the scraper needs (see ``tag_strainer()``)
+    SOUP_STRAINER: SoupStrainer | None = None
+    API_HEADERS: dict[str, str] | None = None
+    # metadata keys mapped to paths of keys (or indices) into the JSON returned by the API
+    API_METADATA_PATHS: dict[str, tuple[str | int, ...]] = {}
     _REGISTRY = set()
 
     @property
@@ -82,6 +97,9 @@ class DeckScraper(DeckParser):
         self._soup: BeautifulSoup | None = None
         self._metadata["url"] = self.url
         self._metadata["source"] = extract_source(self.url)
+        get_limiter().seed(self.url, 1 / self.THROTTLING.delay)
+        if cache := get_cache():
+            cache.set_ttl(self.url, self.CACHE_TTL)
 
     @classmethod
     def _validate_url(cls, url):
@@ -122,6 +140,59 @@ class DeckScraper(DeckParser):
             second = end_processor(second)
         return json.loads(second)
 
+    def _get_api_url(self) -> str | None:  # override to enable API-first scraping
+        """Return URL of a JSON API endpoint serving this scraper's deck (if there's one).
+
+        Scrapers that return one (and override ``_parse_api_data()``) get their data from the API,
+        falling back to the regular (usually Selenium-driven) scraping only on failure.
+        """
+        return None
+
+    def _parse_api_data(self, data: Json) -> None:
+        """Parse the deck (and any metadata not covered by ``API_METADATA_PATHS``) from the API
+        JSON.
+        """
+        raise NotImplementedError
+
+    def _map_api_metadata(self, data: Json) -> None:
+        for key, path in self.API_METADATA_PATHS.items():
+            value = data
+            try:
+                for k in path:
+                    value = value[k]
+            except (KeyError, IndexError, TypeError):
+                continue
+            if value is None or value == "":
+                continue
+            if key == "format":
+                self._update_fmt(value)
+            else:
+                self._metadata[key] = value
+
+    def _reset(self, metadata: Json) -> None:
+        self._metadata = metadata
+        self._state = ParsingState.IDLE
+        self._maindeck, self._sideboard = [], []
+        self._commander, self._partner_commander, self._companion = None, None, None
+
+    def _scrape_api(self) -> bool:
+        url = self._get_api_url()
+        if not url:
+            return False
+        metadata = dict(self._metadata)
+        try:
+            data = timed_request(url, return_json=True, headers=self.API_HEADERS)
+            if not data:
+                raise ScrapingError("API data not available")
+            self._map_api_metadata(data)
+            self._parse_api_data(data)
+        except (ConnectionError, ReadTimeout, HTTPError, ParsingError, KeyError, IndexError,
+                TypeError, ValueError) as e:
+            _log.warning(f"API scraping failed with: {e!r}. Falling back to regular scraping...")
+            self._reset(metadata)
+            return False
+        return True
+
     @abstractmethod
     def _pre_parse(self) -> None:
         raise NotImplementedError
@@ -147,14 +218,13 @@ class DeckScraper(DeckParser):
             self._companion, self._metadata)
 
     def scrape(
-            self, throttled=False, suppress_parsing_errors=True, suppress_scraping_errors=True,
+            self, suppress_parsing_errors=True, suppress_scraping_errors=True,
             suppress_invalid_deck=True) -> Deck | None:
-        if throttled:
-            throttle(*self.THROTTLING)
         try:
-            self._pre_parse()
-            self._parse_metadata()
-            self._parse_deck()
+            if not self._scrape_api():
+                self._pre_parse()
+                self._parse_metadata()
+                self._parse_deck()
         except ScrapingError as se:
             if not suppress_scraping_errors:
                 _log.error(f"Scraping failed with: {se}")
@@ -176,16 +246,59 @@ class DeckScraper(DeckParser):
             _log.warning(f"Scraping failed with: {err}")
             return None
 
+    async def scrape_async(
+            self, suppress_parsing_errors=True, suppress_scraping_errors=True,
+            suppress_invalid_deck=True) -> Deck | None:
+        """Scrape within the (shared) scraping engine's event loop honoring its per-host limits.
+        """
+        return await get_engine().scrape_async(
+            self, suppress_parsing_errors=suppress_parsing_errors,
+            suppress_scraping_errors=suppress_scraping_errors,
+            suppress_invalid_deck=suppress_invalid_deck)
+
+    def scrape_with_retry(self, **kwargs: Any) -> Deck | None:
+        """Scrape re-trying with backoff on connection failures.
+        """
+        try:
+            return self.scrape(**kwargs)
+        except (ConnectionError, ReadTimeout) as e:
+            _log.warning(f"Scraping failed with: {e}. Re-trying with backoff...")
+            return self.scrape_with_backoff(**kwargs)
+
     @backoff.on_exception(  # TODO: see if more errors should be such handled
         backoff.expo, (ConnectionError,), max_time=60)
     def scrape_with_backoff(
-            self, throttled=False, suppress_parsing_errors=True, suppress_scraping_errors=True,
+            self, suppress_parsing_errors=True, suppress_scraping_errors=True,
             suppress_invalid_deck=True) -> Deck | None:
         return self.scrape(
-            throttled=throttled, suppress_parsing_errors=suppress_parsing_errors,
+            suppress_parsing_errors=suppress_parsing_errors,
             suppress_scraping_errors=suppress_scraping_errors,
             suppress_invalid_deck=suppress_invalid_deck)
 
+    @classmethod
+    def benchmark_parsing(cls, *pages: PathLike, repeat=5) -> dict[str, float]:
+        """Benchmark parsing of saved pages into a full soup against parsing them with this
+        scraper's ``SOUP_STRAINER``.
+
+        Args:
+            pages: paths to saved HTML pages (fixtures)
+            repeat: number of times each page is parsed
+
+        Returns:
+            average parsing times (in seconds) per page and average numbers of tags parsed, keyed
+            'full_time', 'full_tags', 'strained_time' and 'strained_tags'
+        """
+        texts = [Path(p).read_text(encoding="utf-8") for p in pages]
+        results = {}
+        for label, strainer in ("full", None), ("strained", cls.SOUP_STRAINER):
+            tags, start = 0, time.perf_counter()
+            for _ in range(repeat):
+                for text in texts:
+                    tags += len(BeautifulSoup(text, "lxml", parse_only=strainer).find_all(True))
+            results[f"{label}_time"] = (time.perf_counter() - start) / (repeat * len(texts))
+            results[f"{label}_tags"] = tags / (repeat * len(texts))
+        return results
+
     @classmethod
     def registered(cls, scraper_type: Type["DeckScraper"]) -> Type["DeckScraper"]:
         """Class decorator for registering subclasses of DeckScraper.
@@ -202,3 +315,105 @@ class DeckScraper(DeckParser):
             if scraper_type.is_deck_url(url):
                 return scraper_type(url, metadata)
         return None
+
+
+class ScrapingEngine:
+    """Asyncio-based engine for fetching (and parsing) decks concurrently.
+
+    The engine runs its event loop in a background thread, so it can be used both from
+    coroutines and from synchronous code (through ``submit()`` and ``scrape()``). Requests to
+    different hosts run concurrently (up to a global cap), while requests to the same host are
+    limited by a per-host semaphore and paced by the process-wide rate limiter. Waiting for the
+    limiter's tokens is awaited before taking a global slot, so that hosts being slowed down
+    don't hold up the others. As the scrapers themselves (and their fetching in
+    ``_pre_parse()``) are synchronous, each one is run in a worker thread.
+
+    Tasks that themselves submit requests to the engine and wait for them (e.g. scraping of a
+    whole video) are run by ``submit_task()`` in threads of their own, outside the limits, so
+    they can't starve the requests they're waiting for.
+
+    Can be used as a context manager, in which case its loop is stopped on exit.
+    """
+    def __init__(self, concurrency=8, per_host=1, tasks=4) -> None:
+        """Initialize.
+
+        Args:
+            concurrency: maximum number of concurrently running requests (or scrapers) overall
+            per_host: maximum number of concurrently running requests (or scrapers) per host
+            tasks: maximum number of concurrently running tasks (see ``submit_task()``)
+        """
+        self._per_host = per_host
+        self._tasks = ThreadPoolExecutor(max_workers=tasks, thread_name_prefix="scraping-task")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="scraping-engine", daemon=True)
+        self._thread.start()
+        self._global = asyncio.Semaphore(concurrency)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    def __enter__(self) -> "ScrapingEngine":
+        return self
+
+    def __exit__(
+            self, exc_type: Type[BaseException] | None, exc_val: BaseException | None,
+            exc_tb: TracebackType | None) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # tasks still running may be waiting for requests, so the loop has to outlive them
+        self._tasks.shutdown(cancel_futures=True)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def run_async(self, url: str, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run synchronous ``func`` (that requests ``url``) in a worker thread honoring the
+        limits of ``url``'s host.
+        """
+        host = extract_source(url)
+        host_semaphore = self._hosts.setdefault(host, asyncio.Semaphore(self._per_host))
+        async with host_semaphore:
+            if delay := get_limiter().delay(url):
+                await asyncio.sleep(delay)
+            async with self._global:
+                return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def scrape_async(self, scraper: DeckScraper, **kwargs: Any) -> Deck | None:
+        return await self.run_async(scraper.url, scraper.scrape_with_retry, **kwargs)
+
+    def submit(self, url: str, func: Callable, *args: Any, **kwargs: Any) -> Future:
+        """Submit synchronous ``func`` (that requests ``url``) to be run by this engine from
+        synchronous code.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.run_async(url, func, *args, **kwargs), self._loop)
+
+    def submit_task(self, func: Callable, *args: Any, **kwargs: Any) -> Future:
+        """Submit synchronous ``func`` that submits its requests to this engine (and waits for
+        them) to be run concurrently with other such tasks.
+        """
+        return self._tasks.submit(func, *args, **kwargs)
+
+    def submit_scraper(self, scraper: DeckScraper, **kwargs: Any) -> Future:
+        return asyncio.run_coroutine_threadsafe(
+            self.scrape_async(scraper, **kwargs), self._loop)
+
+    def scrape(self, *scrapers: DeckScraper, **kwargs: Any) -> list[Deck | None]:
+        """Scrape ``scrapers`` concurrently and return their results in order.
+        """
+        futures = [self.submit_scraper(scraper, **kwargs) for scraper in scrapers]
+        return [f.result() for f in futures]
+
+
+_engine: ScrapingEngine | None = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> ScrapingEngine:
+    """Return the process-wide scraping engine (starting it on the first call).
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ScrapingEngine()
+            atexit.register(_engine.close)
+        return _engine
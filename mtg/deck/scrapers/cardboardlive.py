@@ -37,7 +37,8 @@ class CardBoardLiveDeckScraper(DeckScraper):
     def _pre_parse(self) -> None:  # override
         try:
             self._soup, _, self._clipboard = get_dynamic_soup_by_xpath(
-                self.url, CLIPBOARD_XPATH, clipboard_xpath=CLIPBOARD_XPATH)
+                self.url, CLIPBOARD_XPATH, clipboard_xpath=CLIPBOARD_XPATH,
+                profile=self.BROWSER_PROFILE)
         except TimeoutException:
             raise ScrapingError(f"Scraping failed due to Selenium timing out")
 
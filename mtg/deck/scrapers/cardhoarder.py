@@ -47,7 +47,8 @@ class CardhoarderScraper(DeckScraper):
     def _pre_parse(self) -> None:  # override
         try:
             self._soup, _, _ = get_dynamic_soup_by_xpath(
-                self.url, self._XPATH, consent_xpath=self._CONSENT_XPATH)
+                self.url, self._XPATH, consent_xpath=self._CONSENT_XPATH,
+                profile=self.BROWSER_PROFILE)
             self._deck_data = self._get_deck_data()
         except TimeoutException:
             raise ScrapingError(f"Scraping failed due to Selenium timing out")
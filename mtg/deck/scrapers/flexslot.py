@@ -42,7 +42,7 @@ class FlexslotScraper(DeckScraper):
         try:
             self._soup, _, self._clipboard = get_dynamic_soup_by_xpath(
                 self.url, self._XPATH, consent_xpath=self._CONSENT_XPATH,
-                clipboard_xpath=self._CLIPBOARD_XPATH)
+                clipboard_xpath=self._CLIPBOARD_XPATH, profile=self.BROWSER_PROFILE)
         except TimeoutException:
             raise ScrapingError(f"Scraping failed due to Selenium timing out")
 
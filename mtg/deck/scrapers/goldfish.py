@@ -12,10 +12,11 @@ from datetime import datetime
 
 from mtg import Json
 from mtg.deck import Deck, Mode, ParsingState
-from mtg.deck.scrapers import DeckScraper
+from mtg.deck.scrapers import DeckScraper, get_engine
 from mtg.scryfall import all_formats
 from mtg.utils import extract_int, timed
-from mtg.utils.scrape import ScrapingError, getsoup, http_requests_counted, throttled_soup
+from mtg.utils.scrape import ScrapingError, getsoup, http_requests_counted, tag_strainer, \
+    throttled_soup
 
 _log = logging.getLogger(__name__)
 
@@ -43,6 +44,8 @@ class GoldfishScraper(DeckScraper):
         "pauper commander": "paupercommander",
         "standard brawl": "standardbrawl",
     }
+    SOUP_STRAINER = tag_strainer(
+        "h1.title", "p.deck-container-information", "table.deck-view-deck-table")
 
     def __init__(
             self, url: str, metadata: Json | None = None) -> None:
@@ -65,7 +68,7 @@ class GoldfishScraper(DeckScraper):
         return url
 
     def _pre_parse(self) -> None:  # override
-        self._soup = getsoup(self.url, headers=self.HEADERS)
+        self._soup = getsoup(self.url, headers=self.HEADERS, parse_only=self.SOUP_STRAINER)
         if not self._soup:
             raise ScrapingError("Page not available")
 
@@ -137,16 +140,14 @@ def scrape_meta(fmt="standard") -> list[Deck]:
     tiles = soup.find_all("div", class_="archetype-tile")
     if not tiles:
         raise ScrapingError("No deck tiles tags found")
-    decks, metas = [], []
+    scrapers, metas = [], []
     for i, tile in enumerate(tiles, start=1):
         link = tile.find("a").attrs["href"]
-        deck = GoldfishScraper(
-            f"https://www.mtggoldfish.com{link}", {"format": fmt}).scrape(
-            throttled=True, suppress_invalid_deck=False)
+        scrapers.append(GoldfishScraper(f"https://www.mtggoldfish.com{link}", {"format": fmt}))
         count = tile.find("span", class_="archetype-tile-statistic-value-extra-data").text.strip()
         count = extract_int(count)
         metas.append({"place": i, "count": count})
-        decks.append(deck)
+    decks = get_engine().scrape(*scrapers, suppress_invalid_deck=False)
     total = sum(m["count"] for m in metas)
     for deck, meta in zip(decks, metas):
         meta["share"] = meta["count"] * 100 / total
@@ -16,7 +16,7 @@ from mtg import Json
 from mtg.deck import ParsingState
 from mtg.deck.scrapers import DeckScraper
 from mtg.deck.scrapers.goldfish import GoldfishScraper
-from mtg.utils.scrape import ScrapingError, getsoup, timed_request
+from mtg.utils.scrape import ScrapingError, getsoup, tag_strainer, timed_request
 
 _log = logging.getLogger(__name__)
 
@@ -25,6 +25,9 @@ _log = logging.getLogger(__name__)
 class InternationalHareruyaScraper(DeckScraper):
     """Scraper of international Hareruya decklist page.
     """
+    SOUP_STRAINER = tag_strainer(
+        "div.deckSearch-deckList__information__flex", "div.deckSearch-deckList__deckList__wrapper")
+
     def __init__(self, url: str, metadata: Json | None = None) -> None:
         super().__init__(url, metadata)
 
@@ -38,7 +41,8 @@ class InternationalHareruyaScraper(DeckScraper):
         return url.replace("/ja/","/en/")
 
     def _pre_parse(self) -> None:  # override
-        self._soup = getsoup(self.url, headers=GoldfishScraper.HEADERS)
+        self._soup = getsoup(
+            self.url, headers=GoldfishScraper.HEADERS, parse_only=self.SOUP_STRAINER)
         if not self._soup:
             raise ScrapingError("Page not available")
 
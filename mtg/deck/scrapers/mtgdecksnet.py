@@ -51,7 +51,8 @@ class MtgDecksNetScraper(DeckScraper):
 
     def _pre_parse(self) -> None:  # override
         try:
-            self._soup, _, _ = get_dynamic_soup_by_xpath(self.url, self._XPATH)
+            self._soup, _, _ = get_dynamic_soup_by_xpath(
+                self.url, self._XPATH, profile=self.BROWSER_PROFILE)
         except TimeoutException:
             raise ScrapingError(f"Scraping failed due to Selenium timing out")
 
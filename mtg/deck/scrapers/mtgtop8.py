@@ -45,7 +45,8 @@ class MtgTop8Scraper(DeckScraper):
 
     def _pre_parse(self) -> None:  # override
         try:
-            self._soup, _, _ = get_dynamic_soup_by_xpath(self.url, self._XPATH)
+            self._soup, _, _ = get_dynamic_soup_by_xpath(
+                self.url, self._XPATH, profile=self.BROWSER_PROFILE)
         except TimeoutException:
             raise ScrapingError(f"Scraping failed due to Selenium timing out")
 
@@ -93,7 +94,7 @@ class MtgTop8Scraper(DeckScraper):
                         commander_on = False
                 if "deck_line" in sub_tag.attrs["class"]:
                     quantity, name = sub_tag.text.split(maxsplit=1)
-                    card = self.find_card(self.sanitize_card_name(name.strip()))
+                    card = self.find_card(name.strip())
                     if commander_on:
                         self._set_commander(card)
                     else:
@@ -76,15 +76,21 @@ class OldPageTcgPlayerScraper(DeckScraper):
                 self._maindeck = self._process_deck_tag(deck_tag)
 
 
-# TODO: there's actually a request to API for JSON I forgot to check:
-#  https://infinite-api.tcgplayer.com/deck/magic/{DECK_ID}
-#  /?source=infinite-content&subDecks=true&cards=true&stats=true - so this could probably be scraped
-#  bypassing the soup (and Selenium)
+# the deck is first requested from the API and the page is rendered with Selenium only if that
+# fails
 @DeckScraper.registered
 class NewPageTcgPlayerScraper(DeckScraper):
     """Scraper of TCG Player new-style decklist page.
     """
     _XPATH = "//span[contains(@class, 'list__item--wrapper')]"
+    API_URL_TEMPLATE = ("https://infinite-api.tcgplayer.com/deck/magic/{}/?source=infinite-content"
+                        "&subDecks=true&cards=true&stats=true")
+    API_METADATA_PATHS = {
+        "name": ("result", "deck", "name"),
+        "format": ("result", "deck", "format"),
+        "author": ("result", "deck", "playerName"),
+        "event": ("result", "deck", "eventName"),
+    }
 
     def __init__(self, url: str, metadata: Json | None = None) -> None:
         super().__init__(url, metadata)
@@ -93,9 +99,35 @@ class NewPageTcgPlayerScraper(DeckScraper):
     def is_deck_url(url: str) -> bool:  # override
         return "infinite.tcgplayer.com/magic-the-gathering/deck/" in url
 
+    def _get_api_url(self) -> str | None:  # override
+        *_, deck_id = self.url.split("/")
+        return self.API_URL_TEMPLATE.format(deck_id) if deck_id.isdigit() else None
+
+    def _parse_api_data(self, data: Json) -> None:  # override
+        result = data["result"]
+        deck, cards = result["deck"], result["cards"]
+        if date := deck.get("eventDate") or deck.get("created"):
+            self._metadata["date"] = dateutil.parser.parse(date).date()
+        sub_decks = deck["subDecks"]
+        for section in "maindeck", "sideboard", "commandzone":
+            for item in sub_decks.get(section) or []:
+                card_data = cards[str(item["cardID"])]
+                playset = self.get_playset(
+                    self.find_card(card_data["name"], tcgplayer_id=card_data.get("tcgPlayerID")),
+                    item["quantity"])
+                if section == "maindeck":
+                    self._maindeck += playset
+                elif section == "sideboard":
+                    self._sideboard += playset
+                else:
+                    self._set_commander(playset[0])
+        if not self._maindeck:
+            raise ScrapingError("No maindeck in API data")
+
     def _pre_parse(self) -> None:  # override
         try:
-            self._soup, _, _ = get_dynamic_soup_by_xpath(self.url, self._XPATH)
+            self._soup, _, _ = get_dynamic_soup_by_xpath(
+                self.url, self._XPATH, profile=self.BROWSER_PROFILE)
         except TimeoutException:
             raise ScrapingError(f"Scraping failed due to Selenium timing out")
 
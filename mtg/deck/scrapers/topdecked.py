@@ -21,7 +21,8 @@ from mtg import Json
 from mtg.deck import Deck
 from mtg.deck.arena import ArenaParser, PlaysetLine
 from mtg.deck.scrapers import DeckScraper
-from mtg.utils.scrape import SELENIUM_TIMEOUT, click_for_clipboard
+from mtg.utils.scrape import SELENIUM_TIMEOUT, click_for_clipboard, get_driver_pool, \
+    load_page
 from mtg.utils import get_date_from_ago_text, extract_float
 from mtg.scryfall import COMMANDER_FORMATS
 from mtg.utils.scrape import ScrapingError
@@ -74,17 +75,20 @@ class TopDeckedScraper(DeckScraper):
             pass
 
     def _get_data(self) -> list[str]:
-        with webdriver.Chrome() as driver:
-            _log.info(f"Webdriving using Chrome to: '{self.url}'...")
-            driver.get(self.url)
-
-            # consent
-            consent = WebDriverWait(driver, self._CONSENT_TIMEOUT).until(
-                EC.element_to_be_clickable((By.XPATH, self._CONSENT_XPATH)))
-            consent.click()
-            WebDriverWait(driver, SELENIUM_TIMEOUT / 2).until_not(
-                EC.presence_of_element_located((By.XPATH, self._CONSENT_XPATH)))
-            _log.info("Consent pop-up closed")
+        # the OS clipboard is involved, so no headless mode
+        with get_driver_pool().checkout(self.BROWSER_PROFILE._replace(headless=False)) as driver:
+            load_page(driver, self.url)
+
+            # consent (a pooled driver may have accepted it already)
+            try:
+                consent = WebDriverWait(driver, self._CONSENT_TIMEOUT).until(
+                    EC.element_to_be_clickable((By.XPATH, self._CONSENT_XPATH)))
+                consent.click()
+                WebDriverWait(driver, SELENIUM_TIMEOUT / 2).until_not(
+                    EC.presence_of_element_located((By.XPATH, self._CONSENT_XPATH)))
+                _log.info("Consent pop-up closed")
+            except TimeoutException:
+                _log.info("No need for accepting. Consent window not found")
 
             # metadata
             self._process_metadata_with_selenium(driver)
@@ -46,7 +46,7 @@ class UntappedProfileDeckScraper(DeckScraper):
             self._soup, _, self._clipboard = get_dynamic_soup_by_xpath(
                 self.url, CLIPBOARD_XPATH, self._NO_GAMES_XPATH, self._PRIVATE_XPATH,
                 consent_xpath=CONSENT_XPATH,
-                clipboard_xpath=CLIPBOARD_XPATH)
+                clipboard_xpath=CLIPBOARD_XPATH, profile=self.BROWSER_PROFILE)
         except NoSuchElementException:
             raise ScrapingError("Scraping failed due to absence of the looked for element")
         except TimeoutException:
@@ -90,7 +90,7 @@ class UntappedRegularDeckScraper(DeckScraper):
         try:
             self._soup, _, self._clipboard = get_dynamic_soup_by_xpath(
                 self.url, CLIPBOARD_XPATH, consent_xpath=CONSENT_XPATH,
-                clipboard_xpath=CLIPBOARD_XPATH)
+                clipboard_xpath=CLIPBOARD_XPATH, profile=self.BROWSER_PROFILE)
         except TimeoutException:
             raise ScrapingError(f"Scraping failed due to Selenium timing out")
 
@@ -125,7 +125,7 @@ class UntappedMetaDeckScraper(DeckScraper):
         try:
             self._soup, _, self._clipboard = get_dynamic_soup_by_xpath(
                 self.url, CLIPBOARD_XPATH, consent_xpath=CONSENT_XPATH,
-                clipboard_xpath=CLIPBOARD_XPATH)
+                clipboard_xpath=CLIPBOARD_XPATH, profile=self.BROWSER_PROFILE)
         except TimeoutException:
             raise ScrapingError(f"Scraping failed due to Selenium timing out")
 
@@ -0,0 +1,202 @@
+"""
+
+    mtg.repository.py
+    ~~~~~~~~~~~~~~~~~
+    Compact storage of decklists in global repositories.
+
+    @author: z33k
+
+"""
+import base64
+import gzip
+import json
+import logging
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterator
+
+from mtg import PathLike
+from mtg.utils import timed
+from mtg.utils.files import getdir
+
+_log = logging.getLogger(__name__)
+
+
+_QUANTITY_BITS = 10  # lines with quantities above 1023 are kept verbatim
+_MAX_LINES = 1 << (32 - _QUANTITY_BITS)  # codes are stored as unsigned 32-bit integers
+
+
+def _to_base64(arr: array) -> str:
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return base64.b64encode(arr.tobytes()).decode("ascii")
+
+
+def _from_base64(text: str) -> array:
+    arr = array("I", base64.b64decode(text))
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+class DecklistRepository:
+    """Repository of decklists (in Arena format) keyed by their IDs.
+
+    Each decklist is kept encoded as a sequence of integers, one per line, against a dictionary
+    of line bodies shared by the whole repository. A playset line is encoded as its body's
+    (e.g. 'Lightning Bolt (2XM) 129') dictionary code and its quantity. Any other line (section
+    headers, empty lines) is encoded as a code of the whole line with zero quantity. Decklist
+    text is reconstructed only on demand.
+
+    On disk, it's stored as compact JSON, gzip-compressed (at the cost of a slower dump) if the
+    path ends with '.gz'. Encoded decklists are concatenated into a single array dumped as
+    base64-encoded little-endian bytes (with offsets stored the same way), so loading doesn't
+    involve parsing any numbers. A repository not found at its path is loaded from
+    ``legacy_path`` (a plain JSON mapping of IDs to decklists), if that exists.
+
+    The dictionary can hold up to 4,194,304 (2^22) distinct lines. Lines no longer referred to
+    (after removing or replacing decklists) are dropped from it on dump.
+    """
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __init__(self, path: PathLike, legacy_path: PathLike | None = None) -> None:
+        self._path = Path(path)
+        self._legacy_path = Path(legacy_path) if legacy_path else None
+        self._lines: list[str] = []
+        self._codes: dict[str, int] = {}
+        self._decklists: dict[str, array] = {}
+        self._has_orphans = False  # whether the dictionary may hold lines no decklist refers to
+
+    def __len__(self) -> int:
+        return len(self._decklists)
+
+    def __contains__(self, id_: str) -> bool:
+        return id_ in self._decklists
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._decklists)
+
+    def __getitem__(self, id_: str) -> str:
+        return self._decode(self._decklists[id_])
+
+    def __setitem__(self, id_: str, decklist: str) -> None:
+        if self._has_orphans and len(self._lines) + decklist.count("\n") >= _MAX_LINES:
+            self._compact()
+        if id_ in self._decklists:
+            self._has_orphans = True
+        self._decklists[id_] = self._encode(decklist)
+
+    def get(self, id_: str, default: str | None = None) -> str | None:
+        encoded = self._decklists.get(id_)
+        return default if encoded is None else self._decode(encoded)
+
+    def pop(self, id_: str, default: str | None = None) -> str | None:
+        encoded = self._decklists.pop(id_, None)
+        if encoded is None:
+            return default
+        self._has_orphans = True
+        return self._decode(encoded)
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        for id_, encoded in self._decklists.items():
+            yield id_, self._decode(encoded)
+
+    def _code(self, line: str) -> int:
+        code = self._codes.get(line)
+        if code is None:
+            if len(self._lines) >= _MAX_LINES:
+                self._has_orphans = True  # lines of the decklist being encoded
+                raise ValueError(
+                    f"Decklist repository's line dictionary is full ({_MAX_LINES:,} distinct "
+                    f"lines). Split the repository: '{self.path}'")
+            code = self._codes[line] = len(self._lines)
+            self._lines.append(line)
+        return code
+
+    def _encode(self, decklist: str) -> array:
+        encoded = array("I")
+        for line in decklist.split("\n"):
+            quantity, _, body = line.partition(" ")
+            if (body and quantity.isascii() and quantity.isdigit() and quantity[0] != "0"
+                    and int(quantity) < 1 << _QUANTITY_BITS):
+                encoded.append(self._code(body) << _QUANTITY_BITS | int(quantity))
+            else:
+                encoded.append(self._code(line) << _QUANTITY_BITS)
+        return encoded
+
+    def _compact(self) -> None:
+        """Drop lines no decklist refers to from the dictionary (re-coding all decklists).
+        """
+        mask, recoded, lines = (1 << _QUANTITY_BITS) - 1, {}, []
+        for encoded in self._decklists.values():
+            for i, value in enumerate(encoded):
+                code = recoded.get(value >> _QUANTITY_BITS)
+                if code is None:
+                    code = recoded[value >> _QUANTITY_BITS] = len(lines)
+                    lines.append(self._lines[value >> _QUANTITY_BITS])
+                encoded[i] = code << _QUANTITY_BITS | value & mask
+        _log.info(f"Dropped {len(self._lines) - len(lines):,} orphaned line(s) from the dictionary")
+        self._lines, self._codes = lines, {line: i for i, line in enumerate(lines)}
+        self._has_orphans = False
+
+    def _decode(self, encoded: array) -> str:
+        lines, mask = [], (1 << _QUANTITY_BITS) - 1
+        for value in encoded:
+            line, quantity = self._lines[value >> _QUANTITY_BITS], value & mask
+            lines.append(f"{quantity} {line}" if quantity else line)
+        return "\n".join(lines)
+
+    @timed("loading decklist repository")
+    def load(self) -> None:
+        """Load this repository from its file (or its legacy file, if only that exists).
+        """
+        if self.path.is_file():
+            opener = gzip.open if self.path.suffix == ".gz" else open
+            with opener(self.path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            self._lines = data["lines"]
+            self._codes = {line: i for i, line in enumerate(self._lines)}
+            offsets, codes = _from_base64(data["offsets"]), _from_base64(data["codes"])
+            self._decklists = {
+                id_: codes[offsets[i]:offsets[i + 1]] for i, id_ in enumerate(data["ids"])}
+            self._has_orphans = False
+        elif self._legacy_path and self._legacy_path.is_file():
+            _log.info(f"Migrating legacy decklist repository: '{self._legacy_path}'...")
+            legacy = json.loads(self._legacy_path.read_text(encoding="utf-8"))
+            self._decklists = {id_: self._encode(decklist) for id_, decklist in legacy.items()}
+
+    @timed("dumping decklist repository")
+    def dump(self) -> None:
+        """Dump this repository to its file (compacting its dictionary first, if needed).
+        """
+        getdir(self.path.parent)
+        if self._has_orphans:
+            self._compact()
+        offsets, codes = array("I", [0]), array("I")
+        for encoded in self._decklists.values():
+            codes.extend(encoded)
+            offsets.append(len(codes))
+        data = {
+            "lines": self._lines,
+            "ids": [*self._decklists],
+            "offsets": _to_base64(offsets),
+            "codes": _to_base64(codes),
+        }
+        if self.path.suffix == ".gz":  # favour speed over ratio (most of the gain is in encoding)
+            f = gzip.open(self.path, "wt", encoding="utf-8", compresslevel=3)
+        else:
+            f = self.path.open("w", encoding="utf-8")
+        with f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_decklists(path: PathLike, legacy_path: PathLike | None = None) -> DecklistRepository:
+    """Load a decklist repository at ``path`` (or migrate it from ``legacy_path``).
+    """
+    repo = DecklistRepository(path, legacy_path)
+    repo.load()
+    return repo
@@ -27,13 +27,16 @@ from unidecode import unidecode
 
 from mtg import DATA_DIR, Json
 from mtg.mtgwiki import CLASSES, RACES
-from mtg.utils import from_iterable, getfloat, getint, getrepr, timed
+from mtg.utils import digest, from_iterable, getfloat, getint, getrepr, timed
 from mtg.utils.files import download_file, getdir
-from mtg.utils.scrape import throttle
+from mtg.utils.ratelimit import get_limiter
 
 _log = logging.getLogger(__name__)
 CARDS_FILENAME = "scryfall_cards.json"
+CARDS_SNAPSHOT_FILENAME = "scryfall_cards_snapshot.json"
 SETS_FILENAME = "scryfall_sets.json"
+API_URL = "https://api.scryfall.com"
+API_RATE = 6.5  # requests per second, seeds the rate limiter (Scryfall asks for 50-100 ms delays)
 
 
 class ScryfallError(ValueError):
@@ -50,6 +53,75 @@ def download_scryfall_bulk_data() -> None:
     download_file(url, file_name=CARDS_FILENAME, dst_dir=DATA_DIR)
 
 
+def bulk_data_version() -> str:
+    """Return a designation of the version of Scryfall bulk data file currently on disk (its
+    modification timestamp) or an empty string if there's no such file.
+    """
+    source = DATA_DIR / CARDS_FILENAME
+    return str(source.stat().st_mtime_ns) if source.exists() else ""
+
+
+# card data that bears on parsing and validation of decks
+_SNAPSHOT_KEYS = (
+    "name", "mana_cost", "type_line", "oracle_text", "colors", "color_identity", "keywords",
+    "legalities")
+
+
+@dataclass(frozen=True)
+class BulkDataDiff:
+    """Difference between two snapshots of Scryfall bulk data.
+    """
+    oracle_ids: frozenset[str]  # of added, removed or changed cards
+    names: frozenset[str]  # both former and current names of those cards
+
+    def __bool__(self) -> bool:
+        return bool(self.oracle_ids)
+
+
+def snapshot_bulk_data() -> dict[str, list[str]]:
+    """Return a snapshot of the current Scryfall bulk data.
+
+    Returns:
+        a mapping of Oracle IDs to pairs of card names and digests of deck-relevant card data
+    """
+    snapshot = {}
+    for card in bulk_data():
+        relevant = json.dumps({k: card.json.get(k) for k in _SNAPSHOT_KEYS}, sort_keys=True)
+        snapshot[card.oracle_id] = [card.name, digest(relevant)]
+    return snapshot
+
+
+def load_bulk_data_snapshot() -> dict[str, list[str]] | None:
+    """Load the last dumped snapshot of Scryfall bulk data (if there's any).
+    """
+    source = DATA_DIR / CARDS_SNAPSHOT_FILENAME
+    if not source.is_file():
+        return None
+    return json.loads(source.read_text(encoding="utf-8"))
+
+
+def dump_bulk_data_snapshot(snapshot: dict[str, list[str]] | None = None) -> None:
+    """Dump ``snapshot`` of Scryfall bulk data (or a snapshot of the current data).
+    """
+    snapshot = snapshot or snapshot_bulk_data()
+    dst = getdir(DATA_DIR) / CARDS_SNAPSHOT_FILENAME
+    _log.info(f"Dumping Scryfall bulk data snapshot to: '{dst}'...")
+    dst.write_text(json.dumps(snapshot, separators=(",", ":")), encoding="utf-8")
+
+
+def diff_bulk_data(old: dict[str, list[str]], new: dict[str, list[str]]) -> BulkDataDiff:
+    """Diff two snapshots of Scryfall bulk data (as returned by snapshot_bulk_data()).
+    """
+    oracle_ids, names = set(), set()
+    for oracle_id in old.keys() | new.keys():
+        old_entry, new_entry = old.get(oracle_id), new.get(oracle_id)
+        if old_entry == new_entry:
+            continue
+        oracle_ids.add(oracle_id)
+        names.update(entry[0] for entry in (old_entry, new_entry) if entry)
+    return BulkDataDiff(frozenset(oracle_ids), frozenset(names))
+
+
 @lru_cache  # pulling Scryfall data takes a few seconds
 def api_set(set_code: str) -> scrython.sets.Code | None:
     try:
@@ -1060,11 +1132,56 @@ def find_set(
     return from_iterable(data, predicate)
 
 
+# set code based lookups
+_SET_MAP: dict[str, SetData] = {}
+_RELEASE_ORDINAL_MAP: dict[str, int] = {}  # set code ==> position in release order
+_EXPANSION_CODES: set[str] = set()
+
+
+@timed("building set lookup maps")
+def _build_set_maps() -> None:
+    global _SET_MAP, _RELEASE_ORDINAL_MAP, _EXPANSION_CODES
+    _log.info("Mapping the sets for fast lookups...")
+    for ordinal, set_data in enumerate(sorted(sets(), key=lambda s: (s.released_at, s.code))):
+        _SET_MAP[set_data.code] = set_data
+        _RELEASE_ORDINAL_MAP[set_data.code] = ordinal
+        if set_data.is_expansion:
+            _EXPANSION_CODES.add(set_data.code)
+
+
 def find_set_by_code(*set_codes: str, data: Iterable[SetData] | None = None) -> SetData | None:
     """Return a MtG set designated by provided code or `None`.
     """
-    data = data or sets()
-    return find_set(lambda s: s.set_code in {sc.lower() for sc in set_codes}, data)
+    codes = [sc.lower() for sc in set_codes]
+    if data:
+        return find_set(lambda s: s.code in set(codes), data)
+    global _SET_MAP
+    if not _SET_MAP:
+        _build_set_maps()
+    return from_iterable((_SET_MAP.get(code) for code in codes), lambda s: s is not None)
+
+
+def release_ordinal(set_code: str) -> int | None:
+    """Return position of a MtG set designated by provided code in the order of release or
+    `None` if it cannot be found.
+    """
+    global _RELEASE_ORDINAL_MAP
+    if not _RELEASE_ORDINAL_MAP:
+        _build_set_maps()
+    return _RELEASE_ORDINAL_MAP.get(set_code.lower())
+
+
+def find_latest_expansion(*set_codes: str) -> str | None:
+    """Return code of the most recently released expansion among provided ``set_codes`` or
+    `None` if there's no expansion among them.
+    """
+    global _RELEASE_ORDINAL_MAP
+    if not _RELEASE_ORDINAL_MAP:
+        _build_set_maps()
+    codes = {sc.lower() for sc in set_codes} & _EXPANSION_CODES
+    if not codes:
+        return None
+    return max(codes, key=_RELEASE_ORDINAL_MAP.__getitem__)
 
 
 # MtG sets with all cards not being legal anywhere
@@ -1253,6 +1370,35 @@ def find_card(
     return from_iterable(data, predicate)
 
 
+_NAME_TRANSLATION_TABLE = str.maketrans({"’": "'", "‑": "-", "꞉": ":"})
+# "Wear/Tear" ==> "Wear // Tear"
+# "Wear//Tear" ==> "Wear // Tear"
+# "Wear///Tear" ==> "Wear // Tear"
+_UNSPACED_MULTIFACE_PATTERN = re.compile(r'(?<=[a-zA-Z])/{1,3}(?=[a-zA-Z])')
+
+
+def normalize_card_name(card_name: str) -> str:
+    """Return ``card_name`` with typographic punctuation replaced with its ASCII counterpart and
+    multiface separators unified to Scryfall's spaced '//' (Arena uses '///').
+    """
+    card_name = card_name.translate(_NAME_TRANSLATION_TABLE)
+    if "/" in card_name:
+        card_name = card_name.replace(" / ", f" {MULTIFACE_SEPARATOR} ").replace(
+            " /// ", f" {MULTIFACE_SEPARATOR} ")
+        card_name = _UNSPACED_MULTIFACE_PATTERN.sub(f" {MULTIFACE_SEPARATOR} ", card_name)
+    return card_name
+
+
+@lru_cache(maxsize=65_536)
+def card_name_key(card_name: str) -> str:
+    """Return a key ``card_name`` is looked up with in the name index.
+
+    This is the one place card names get normalized for lookups: the name is normalized (see
+    normalize_card_name()), transliterated to ASCII and casefolded.
+    """
+    return unidecode(normalize_card_name(card_name)).casefold()
+
+
 # hashmap based lookups
 _NAME_MAP, _SCRYFALL_ID_MAP, _COLLECTOR_NUMBER_MAP = {}, {}, {}
 _ORACLE_ID_MAP, _TCGPLAYER_ID_MAP, _CARDMARKET_ID_MAP, _MTGO_ID_MAP = {}, {}, {}, {}
@@ -1263,10 +1409,10 @@ def _build_maps() -> None:
     global _NAME_MAP, _SCRYFALL_ID_MAP, _COLLECTOR_NUMBER_MAP
     _log.info("Mapping the cards for fast lookups...")
     for card in bulk_data():
-        _NAME_MAP[unidecode(card.name).casefold()] = card
+        _NAME_MAP[card_name_key(card.name)] = card
         if card.is_multiface:
-            _NAME_MAP[unidecode(card.first_face_name).casefold()] = card
-            _NAME_MAP[unidecode(card.second_face_name).casefold()] = card
+            _NAME_MAP[card_name_key(card.first_face_name)] = card
+            _NAME_MAP[card_name_key(card.second_face_name)] = card
         _SCRYFALL_ID_MAP[card.id] = card
         _ORACLE_ID_MAP[card.id] = card
         if card.tcgplayer_id is not None:
@@ -1278,24 +1424,38 @@ def _build_maps() -> None:
         _COLLECTOR_NUMBER_MAP[(card.set, card.collector_number)] = card
 
 
+def preload_card_data() -> None:
+    """Load Scryfall bulk data and build all card and set lookup maps upfront.
+
+    Meant to be called before forking worker processes, so that they share the loaded data
+    (copy-on-write) instead of loading it each on their own.
+    """
+    if not _NAME_MAP:
+        _build_maps()
+    if not _SET_MAP:
+        _build_set_maps()
+
+
 def query_api_for_card(card_name: str, foreign=False) -> Card | None:
     """Query Scryfall API for a card designated by provided name.
     """
     _log.info(f"Querying Scryfall for {card_name!r}...")
     card_name = unidecode(card_name)
+    limiter = get_limiter()
+    limiter.seed(API_URL, API_RATE)
     try:
-        throttle(0.15)
+        limiter.acquire(API_URL)
         result = scrython.cards.Search(q=f"!{card_name}", include_multilingual=foreign).data()
     except scrython.foundation.ScryfallError:
         result = None
     if not result:
-        throttle(0.15)
+        limiter.acquire(API_URL)
         try:
             result = scrython.cards.Search(q=card_name, include_multilingual=foreign).data()
         except scrython.foundation.ScryfallError:
             result = None
         if not result :
-            throttle(0.15)
+            limiter.acquire(API_URL)
             try:
                 result = scrython.cards.Named(fuzzy=card_name)
                 return Card(result.scryfallJson)
@@ -1314,7 +1474,7 @@ def find_by_name(card_name: str) -> Card | None:
     global _NAME_MAP
     if not _NAME_MAP:
         _build_maps()
-    if card := _NAME_MAP.get(unidecode(card_name).casefold()):
+    if card := _NAME_MAP.get(card_name_key(card_name)):
         return card
     return query_api_for_card(card_name)
 
@@ -13,14 +13,14 @@ import logging
 import re
 from collections import Counter as PyCounter
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import Any, Callable, Iterable, Optional, Protocol, Sequence, Type
 from datetime import date, timedelta
 
 import dateutil.parser
 from dateutil.relativedelta import relativedelta
 from contexttimer import Timer
-from lingua import Language, LanguageDetectorBuilder
+from lingua import Language, LanguageDetector, LanguageDetectorBuilder
 
 from mtg import FILENAME_TIMESTAMP_FORMAT, READABLE_TIMESTAMP_FORMAT, T
 from mtg.utils.check_type import type_checker, uniform_type_checker
@@ -348,6 +348,17 @@ MTG_LANGS = {
 }
 
 
+@lru_cache
+def _lang_detector() -> LanguageDetector:
+    # building a detector loads language models which is expensive, so it's done only once
+    return LanguageDetectorBuilder.from_languages(*MTG_LANGS).build()
+
+
+@lru_cache(maxsize=8192)
+def _detect_lang(text: str) -> Language | None:
+    return _lang_detector().detect_language_of(text)
+
+
 def detect_lang(text: str) -> Language:
     """Detect language of ``text`` checking against those that Magic: The Gathering cards have
     been printed in.
@@ -361,22 +372,33 @@ def detect_lang(text: str) -> Language:
     Returns:
         lingua.Language object
     """
-    detector = LanguageDetectorBuilder.from_languages(*MTG_LANGS).build()
-    detected_lang = detector.detect_language_of(text)
+    detected_lang = _detect_lang(text)
     if detected_lang in MTG_LANGS:
         return detected_lang
     raise ValueError(
-        f"Detected language {detected_lang.name} is not a Magic: The Gathering card language")
+        f"Detected language {detected_lang.name if detected_lang else None} is not a Magic: The "
+        f"Gathering card language")
+
+
+# anything beyond Latin Extended-B (Greek, Cyrillic, CJK, Hangul, etc.)
+_NON_LATIN_LETTER = re.compile(r"[^\W\d_\u0000-\u024F]")
 
 
 def is_foreign(text: str) -> bool:
+    """Determine whether ``text`` (e.g. a card name) is in a language other than English.
+
+    Cheap script checks go first so that the language detection model is only consulted for Latin
+    script texts.
+    """
+    if not any(ch.isalpha() for ch in text):
+        return False
+    if _NON_LATIN_LETTER.search(text):
+        return True
     try:
         lang = detect_lang(text)
     except ValueError:
         return False
-    if lang.iso_code_639_1.name.lower() == "en":
-        return True
-    return False
+    return lang.iso_code_639_1.name.lower() != "en"
 
 
 class Counter(PyCounter):
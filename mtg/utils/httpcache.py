@@ -0,0 +1,230 @@
+"""
+
+    mtg.utils.httpcache.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+    On-disk cache of HTTP responses.
+
+    @author: z33k
+
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from mtg import PathLike, VAR_DIR
+from mtg.utils.files import getdir
+
+_log = logging.getLogger(__name__)
+
+
+HTTP_CACHE_DIR = VAR_DIR / "http_cache"
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024  # bytes
+_TRACKING_PARAMS = {"fbclid", "gclid", "si"}  # plus all the 'utm_' ones
+_STORED_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+
+def normalize_url(url: str) -> str:
+    """Normalize ``url`` for use as a cache key.
+
+    Scheme and host are lowercased, fragment is dropped, query parameters are sorted and the
+    tracking ones (e.g. 'utm_source') are removed.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.startswith("utm_") and k not in _TRACKING_PARAMS)
+    return urlunsplit((
+        parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+
+
+def get_host(url: str) -> str:
+    """Return the lowercased host of ``url`` with no port and no leading 'www.' (e.g.
+    'moxfield.com' for 'https://www.moxfield.com/decks/...').
+    """
+    host = urlsplit(url).netloc or url.split("/")[0]
+    return host.split(":")[0].lower().removeprefix("www.")
+
+
+def _iter_hosts(host: str) -> Iterator[str]:
+    # 'api2.moxfield.com' ==> 'api2.moxfield.com', 'moxfield.com', 'com'
+    while host:
+        yield host
+        _, _, host = host.partition(".")
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status: int
+    headers: dict[str, str]
+    encoding: str | None
+    stored: float  # UNIX timestamp of storing (or of the last successful revalidation)
+    content: bytes
+    reason: str = ""  # entries stored before reasons were kept have none
+
+    @property
+    def status_reason(self) -> str:
+        """Return the stored reason phrase or, if there's none, the standard one for the status.
+        """
+        if self.reason:
+            return self.reason
+        try:
+            return HTTPStatus(self.status).phrase
+        except ValueError:
+            return ""
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.stored < ttl
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Return headers for a conditional request revalidating this response.
+        """
+        headers = {}
+        if etag := self.headers.get("ETag"):
+            headers["If-None-Match"] = etag
+        if last_modified := self.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+
+class ResponseCache:
+    """Size-bounded on-disk cache of HTTP responses keyed by normalized URLs.
+
+    Each response is stored gzip-compressed in its own file (a JSON header line followed by the
+    raw body). Files' modification times are bumped on each hit, so that, when the cache grows
+    above ``max_size``, the least recently used entries are evicted first.
+
+    Only responses from hosts with a registered TTL (scrapers register theirs) are meant to be
+    cached, unless ``default_ttl`` is set. A TTL registered for a host covers its subdomains too
+    (e.g. one registered for 'moxfield.com' covers 'api2.moxfield.com', while one registered for
+    'mtgdecks.co.uk' covers nothing else under 'co.uk').
+    Stale entries are meant to be revalidated with a conditional request.
+
+    In replay mode, the cache is supposed to be the only source of responses (so that parsing can
+    be reproduced offline).
+    """
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def replay(self) -> bool:
+        return self._replay
+
+    def __init__(
+            self, path: PathLike = HTTP_CACHE_DIR, max_size=DEFAULT_MAX_SIZE,
+            default_ttl: float | None = None, replay=False) -> None:
+        """Initialize.
+
+        Args:
+            path: directory to store the cached responses in
+            max_size: maximum size (in bytes) of all stored files
+            default_ttl: time (in seconds) a response from a host without its own TTL is
+                considered fresh for (if None, such responses aren't cached at all)
+            replay: if True, serve responses only from the cache
+        """
+        self._path = getdir(path)
+        self._max_size, self._default_ttl, self._replay = max_size, default_ttl, replay
+        self._ttls: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._sizes = {f.name: f.stat().st_size for f in self._path.glob("*.gz")}
+        self._size = sum(self._sizes.values())
+
+    def set_ttl(self, url: str, ttl: float) -> None:
+        """Set TTL (in seconds) of responses from ``url``'s host (and its subdomains).
+        """
+        self._ttls[get_host(url)] = ttl
+
+    def ttl(self, url: str) -> float | None:
+        """Return TTL (in seconds) of responses from ``url`` or None if they're not to be cached.
+        """
+        for host in _iter_hosts(get_host(url)):
+            if (ttl := self._ttls.get(host)) is not None:
+                return ttl
+        return self._default_ttl
+
+    def _file(self, url: str) -> Path:
+        key = hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()
+        return self._path / f"{key}.gz"
+
+    def get(self, url: str) -> CachedResponse | None:
+        file = self._file(url)
+        try:
+            with gzip.open(file, "rb") as f:
+                header = json.loads(f.readline())
+                content = f.read()
+        except (OSError, EOFError, ValueError):
+            return None
+        with self._lock:  # so that a hit doesn't interleave with eviction
+            try:
+                os.utime(file)
+            except OSError:  # evicted in the meantime
+                pass
+        return CachedResponse(content=content, **header)
+
+    def put(self, response: CachedResponse) -> None:
+        header = {
+            "url": response.url,
+            "status": response.status,
+            "reason": response.reason,
+            "headers": response.headers,
+            "encoding": response.encoding,
+            "stored": response.stored,
+        }
+        file = self._file(response.url)
+        tmp = file.with_name(f"{file.name}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp, "wb", compresslevel=6) as f:
+            f.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+            f.write(response.content)
+        os.replace(tmp, file)
+        with self._lock:
+            self._size += file.stat().st_size - self._sizes.get(file.name, 0)
+            self._sizes[file.name] = file.stat().st_size
+            if self._size > self._max_size:
+                self._evict()
+
+    def touch(self, response: CachedResponse) -> None:
+        """Mark ``response`` as successfully revalidated.
+        """
+        response.stored = time.time()
+        self.put(response)
+
+    @staticmethod
+    def _atime(file: Path) -> float:  # hits bump modification time
+        try:
+            return file.stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def _evict(self) -> None:
+        files = sorted((self._path / name for name in self._sizes), key=self._atime)
+        target = self._max_size * 0.9
+        for file in files:
+            if self._size <= target:
+                break
+            self._size -= self._sizes.pop(file.name)
+            file.unlink(missing_ok=True)
+        _log.info(f"HTTP cache evicted down to {self._size:,} bytes")
+
+    def clear(self) -> None:
+        with self._lock:
+            for name in self._sizes:
+                (self._path / name).unlink(missing_ok=True)
+            self._sizes, self._size = {}, 0
+
+
+def make_cached_response(
+        url: str, status: int, reason: str, headers: dict[str, str], encoding: str | None,
+        content: bytes) -> CachedResponse:
+    headers = {k: headers[k] for k in _STORED_HEADERS if k in headers}
+    return CachedResponse(url, status, headers, encoding, time.time(), content, reason)
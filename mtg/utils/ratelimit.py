@@ -0,0 +1,209 @@
+"""
+
+    mtg.utils.ratelimit.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+    Adaptive per-host rate limiting.
+
+    @author: z33k
+
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from mtg import DATA_DIR, PathLike
+from mtg.utils.files import getdir
+
+_log = logging.getLogger(__name__)
+
+
+RATE_LIMITS_FILENAME = "rate_limits.json"
+DEFAULT_RATE = 1.0  # requests per second
+MIN_RATE = 0.02  # one request per 50 seconds
+MAX_RATE = 10.0
+THROTTLING_STATUSES = (429, 503)
+SLOW_LATENCY = 8.0  # seconds
+
+
+def get_host(url: str) -> str:
+    """Return host of ``url`` (or ``url`` itself if it's a bare host already).
+    """
+    return urlsplit(url).netloc or url.split("/")[0]
+
+
+@dataclass
+class _Bucket:
+    rate: float  # tokens per second
+    tokens: float
+    updated: float
+    learned: bool = False  # whether the rate has been adapted (as opposed to being just seeded)
+    last_decrease: float = 0.0
+
+    def refill(self, now: float, capacity: float) -> None:
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class RateLimiter:
+    """Token-bucket rate limiter keyed by host that adapts its rates to hosts' responses.
+
+    Each host gets a bucket that refills at the host's current rate. Acquiring a token when the
+    bucket is empty means waiting for it (tokens can go negative, so concurrent acquirers queue up
+    instead of racing). Rates adapt with AIMD: every healthy response increases the host's rate
+    additively, while a throttling response (429/503) or a response slower than ``slow_latency``
+    cuts it multiplicatively (at most once per ``1 / rate`` seconds, so that a burst of failures
+    of requests already in flight counts as one). ``Retry-After`` is honored by draining the
+    bucket accordingly.
+
+    Learned rates can be dumped to and loaded from a JSON file, so they survive between runs.
+    """
+    def __init__(
+            self, path: PathLike | None = None, default_rate=DEFAULT_RATE, min_rate=MIN_RATE,
+            max_rate=MAX_RATE, capacity=1.0, increase=0.05, decrease=0.5,
+            slow_latency=SLOW_LATENCY) -> None:
+        """Initialize.
+
+        Args:
+            path: path to a JSON file with learned rates (if None, the rates aren't persisted)
+            default_rate: initial rate (in requests per second) for hosts not seen before
+            min_rate: minimum rate the adaptation can go down to
+            max_rate: maximum rate the adaptation can go up to
+            capacity: bucket capacity (i.e. the number of requests allowed in a burst)
+            increase: additive rate increase on a healthy response
+            decrease: multiplicative rate decrease on a throttling (or too slow) response
+            slow_latency: latency (in seconds) above which a response is considered throttling
+        """
+        self._path = Path(path) if path else None
+        self._default_rate, self._min_rate, self._max_rate = default_rate, min_rate, max_rate
+        self._capacity, self._increase, self._decrease = capacity, increase, decrease
+        self._slow_latency = slow_latency
+        self._buckets: dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(
+                self._default_rate, self._capacity, time.monotonic())
+        return bucket
+
+    def rate(self, url: str) -> float:
+        """Return the current rate of ``url``'s host (in requests per second).
+        """
+        with self._lock:
+            return self._bucket(get_host(url)).rate
+
+    def seed(self, url: str, rate: float) -> None:
+        """Set the initial rate of ``url``'s host, unless it has been learned already.
+        """
+        with self._lock:
+            bucket = self._bucket(get_host(url))
+            if not bucket.learned:
+                bucket.rate = min(max(rate, self._min_rate), self._max_rate)
+
+    def reserve(self, url: str) -> float:
+        """Take a token from the bucket of ``url``'s host and return the time (in seconds) to
+        wait before it can be used.
+        """
+        with self._lock:
+            bucket = self._bucket(get_host(url))
+            bucket.refill(time.monotonic(), self._capacity)
+            bucket.tokens -= 1
+            return 0.0 if bucket.tokens >= 0 else -bucket.tokens / bucket.rate
+
+    def delay(self, url: str) -> float:
+        """Return the time (in seconds) until a token for ``url``'s host is available (without
+        taking it).
+        """
+        with self._lock:
+            bucket = self._bucket(get_host(url))
+            bucket.refill(time.monotonic(), self._capacity)
+            return 0.0 if bucket.tokens >= 1 else (1 - bucket.tokens) / bucket.rate
+
+    def acquire(self, url: str) -> None:
+        """Block until a request to ``url``'s host is allowed.
+        """
+        if delay := self.reserve(url):
+            _log.info(f"Rate limiting {get_host(url)!r} for {delay:.3f} seconds...")
+            time.sleep(delay)
+
+    async def acquire_async(self, url: str) -> None:
+        """Wait (without blocking the event loop) until a request to ``url``'s host is allowed.
+        """
+        if delay := self.reserve(url):
+            _log.info(f"Rate limiting {get_host(url)!r} for {delay:.3f} seconds...")
+            await asyncio.sleep(delay)
+
+    def feedback(
+            self, url: str, status: int | None = None, latency: float | None = None,
+            retry_after: float | None = None, failed=False) -> None:
+        """Adapt the rate of ``url``'s host to an observed response.
+
+        Args:
+            url: requested URL
+            status: HTTP status of the response (if known)
+            latency: time (in seconds) the response took (if known)
+            retry_after: value of the response's 'Retry-After' header in seconds (if present)
+            failed: whether the request failed altogether (e.g. timed out or got disconnected)
+        """
+        throttling = failed or status in THROTTLING_STATUSES
+        if latency is not None and latency > self._slow_latency:
+            throttling = True
+        host = get_host(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+            bucket.learned = True
+            if not throttling:
+                bucket.rate = min(self._max_rate, bucket.rate + self._increase)
+                return
+            if now - bucket.last_decrease >= 1 / bucket.rate:
+                bucket.rate = max(self._min_rate, bucket.rate * self._decrease)
+                bucket.last_decrease = now
+                _log.warning(f"Rate of {host!r} decreased to {bucket.rate:.3f} request(s)/s")
+            if retry_after:
+                bucket.refill(now, self._capacity)
+                bucket.tokens = min(bucket.tokens, -retry_after * bucket.rate)
+
+    def load(self) -> None:
+        """Load learned rates from this limiter's file (if it exists).
+        """
+        if not self._path or not self._path.is_file():
+            return
+        rates = json.loads(self._path.read_text(encoding="utf-8"))
+        with self._lock:
+            for host, rate in rates.items():
+                bucket = self._bucket(host)
+                bucket.rate = min(max(rate, self._min_rate), self._max_rate)
+                bucket.learned = True
+
+    def dump(self) -> None:
+        """Dump learned rates to this limiter's file.
+        """
+        if not self._path:
+            return
+        with self._lock:
+            rates = {host: round(b.rate, 4) for host, b in sorted(self._buckets.items())
+                     if b.learned}
+        getdir(self._path.parent)
+        self._path.write_text(json.dumps(rates, indent=2), encoding="utf-8")
+
+
+_limiter: RateLimiter | None = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter (loading its learned rates on the first call).
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(DATA_DIR / RATE_LIMITS_FILENAME)
+            _limiter.load()
+        return _limiter
@@ -7,23 +7,29 @@
     @author: z33k
 
 """
+import atexit
 import json
 import logging
-import random
+import os
 import re
+import threading
 import time
-from collections import namedtuple
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import wraps
-from typing import Callable, Dict, Optional
+from pathlib import Path
+from typing import Callable, Dict, Generator, Iterator, Optional
 
-import brotli
 import pyperclip
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
+from requests.structures import CaseInsensitiveDict
 from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, \
+    WebDriverException
 from selenium.webdriver import ActionChains, Keys
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
@@ -32,14 +38,22 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from urllib3 import Retry
 
-from mtg import Json
+from mtg import DATA_DIR, Json, PathLike
 from mtg.utils import ParsingError, timed
 from mtg.utils.check_type import type_checker
+from mtg.utils.files import getdir
+from mtg.utils.httpcache import CachedResponse, DEFAULT_MAX_SIZE, HTTP_CACHE_DIR, \
+    ResponseCache, make_cached_response
+from mtg.utils.ratelimit import get_limiter
 
 _log = logging.getLogger(__name__)
 REQUESTS_TIMEOUT = 15.0  # seconds
+CHUNK_SIZE = 64 * 1024  # bytes
 SELENIUM_TIMEOUT = 10.0  # seconds
 DEFAULT_THROTTLING = 1.0  # seconds
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/91.0.4472.124 Safari/537.36")
 
 
 class ScrapingError(ParsingError):
@@ -47,21 +61,246 @@ class ScrapingError(ParsingError):
     """
 
 
+class ResponseTooLarge(ScrapingError):
+    """Raised when a response body exceeds the size allowed for it.
+    """
+
+
 http_requests_count = 0
 
 
+# retries are done on the transport level only for failed connections and reads, responses with
+# error statuses (including 429 and 5xx) are returned as they are for the callers' backoff to handle
+RetryPolicy = namedtuple("RetryPolicy", "total backoff_factor", defaults=(3, 0.3))
+_session: requests.Session | None = None
+_session_pid: int | None = None
+_session_lock = threading.Lock()
+
+
+def _parse_retry_after(response: requests.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value else None
+    except ValueError:  # HTTP-date form is not worth the trouble
+        return None
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """HTTP adapter that acquires the per-host rate limiter before each request and feeds it
+    with the response.
+    """
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        limiter = get_limiter()
+        limiter.acquire(request.url)
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            limiter.feedback(request.url, failed=True)
+            raise
+        limiter.feedback(
+            request.url, response.status_code, time.perf_counter() - start,
+            _parse_retry_after(response))
+        return response
+
+
+def configure_session(
+        retry_policy=RetryPolicy(), pool_connections=32, pool_maxsize=16) -> requests.Session:
+    """Configure the process-wide HTTP session used by all scraping requests.
+
+    The session keeps connections alive in per-host pools, so consecutive requests to the same
+    host skip TCP and TLS handshakes. Each request is paced by the process-wide adaptive rate
+    limiter.
+
+    Args:
+        retry_policy: policy of retrying failed connections and reads
+        pool_connections: number of hosts to keep connection pools for
+        pool_maxsize: maximum number of connections kept alive per host
+
+    Returns:
+        the configured session
+    """
+    global _session, _session_pid
+    retries = Retry(
+        total=retry_policy.total, backoff_factor=retry_policy.backoff_factor,
+        respect_retry_after_header=False)
+    adapter = _RateLimitedAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retries)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session, _session_pid = session, os.getpid()
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide HTTP session (configuring it with defaults on the first call).
+    """
+    # connection pools must not be shared with forked processes
+    if _session is None or _session_pid != os.getpid():
+        return configure_session()
+    return _session
+
+
+_cache: ResponseCache | None = None
+_cache_configured = False
+_cache_lock = threading.Lock()
+
+
+def configure_cache(
+        path: PathLike = HTTP_CACHE_DIR, max_size=DEFAULT_MAX_SIZE,
+        default_ttl: float | None = None, replay=False, enabled=True) -> ResponseCache | None:
+    """Configure the process-wide HTTP response cache used by ``timed_request()`` and
+    ``getsoup()``.
+
+    Args:
+        path: directory to store the cached responses in
+        max_size: maximum size (in bytes) of the cache (least recently used entries are evicted
+            above it)
+        default_ttl: time (in seconds) a response from a host without its own TTL (as
+            registered by scrapers) is considered fresh for, if None (the default), only
+            responses from hosts with their own TTLs are cached; stale responses are revalidated
+        replay: if True, serve responses only from the cache (for reproducible offline parsing)
+        enabled: if False, disable caching altogether
+
+    Returns:
+        the configured cache (or None if disabled)
+    """
+    global _cache, _cache_configured
+    with _cache_lock:
+        _cache = ResponseCache(path, max_size, default_ttl, replay) if enabled else None
+        _cache_configured = True
+    return _cache
+
+
+def get_cache() -> ResponseCache | None:
+    """Return the process-wide HTTP response cache (configuring it with defaults on the first
+    call).
+    """
+    if not _cache_configured:
+        return configure_cache()
+    return _cache
+
+
+def _to_response(cached: CachedResponse) -> requests.Response:
+    response = requests.Response()
+    response.status_code, response.reason = cached.status, cached.status_reason
+    response.headers = CaseInsensitiveDict(cached.headers)
+    response.encoding, response.url = cached.encoding, cached.url
+    response._content = cached.content
+    return response
+
+
+def _iter_body(
+        response: requests.Response, max_bytes: int | None = None,
+        chunk_size=CHUNK_SIZE) -> Iterator[bytes]:
+    # chunks come already decompressed (gzip, deflate, brotli and, if 'zstandard' is installed,
+    # zstd are all decoded incrementally by urllib3), so the cap is on the decoded size, while
+    # Content-Length declares the encoded one (and is comparable only if there's no encoding)
+    encoding = response.headers.get("Content-Encoding", "identity").strip().lower()
+    if max_bytes is not None and encoding == "identity":
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > max_bytes:
+            raise ResponseTooLarge(f"Response from {response.url!r} is {length} bytes long")
+    size = 0
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        size += len(chunk)
+        if max_bytes is not None and size > max_bytes:
+            raise ResponseTooLarge(
+                f"Response from {response.url!r} exceeded {max_bytes:,} bytes")
+        yield chunk
+
+
+def _read_body(response: requests.Response, max_bytes: int) -> None:
+    try:
+        # setting the content lets the response be used as usual (.text, .json() etc.)
+        response._content = b"".join(_iter_body(response, max_bytes))
+    finally:
+        response.close()
+
+
+def cached_get(url: str, max_bytes: int | None = None, **requests_kwargs) -> requests.Response:
+    """Send a GET request to ``url`` through the process-wide HTTP response cache.
+
+    Only responses from hosts the cache has a TTL for are cached (see ResponseCache). Fresh
+    cached responses are served without any request. Stale ones are revalidated with a
+    conditional request (using their ETag/Last-Modified validators). In replay mode, a response
+    missing from the cache is substituted with a '404 Not Cached' one.
+
+    If ``max_bytes`` is specified, the body is streamed and the download is aborted (with
+    ResponseTooLarge raised) as soon as it turns out to be larger.
+    """
+    if max_bytes is not None:
+        requests_kwargs["stream"] = True
+    cache = get_cache()
+    if params := requests_kwargs.pop("params", None):
+        url = requests.Request("GET", url, params=params).prepare().url
+    ttl = cache.ttl(url) if cache else None
+    if cache is None or (ttl is None and not cache.replay):
+        response = get_session().get(url, **requests_kwargs)
+        if max_bytes is not None:
+            _read_body(response, max_bytes)
+        return response
+
+    cached = cache.get(url)
+    if cache.replay:
+        if cached:
+            return _to_response(cached)
+        response = requests.Response()
+        response.status_code, response.reason, response.url = 404, "Not Cached", url
+        response._content = b""
+        return response
+    if cached and cached.is_fresh(ttl):
+        _log.info(f"Serving {url!r} from HTTP cache")
+        return _to_response(cached)
+
+    if cached:
+        requests_kwargs["headers"] = {**(requests_kwargs.get("headers") or {}), **cached.validators}
+    response = get_session().get(url, **requests_kwargs)
+    if max_bytes is not None:
+        _read_body(response, max_bytes)
+    if cached and response.status_code == 304:
+        _log.info(f"Cached response for {url!r} revalidated")
+        cache.touch(cached)
+        return _to_response(cached)
+    if response.status_code == 200:
+        cache.put(make_cached_response(
+            url, response.status_code, response.reason, response.headers, response.encoding,
+            response.content))
+    return response
+
+
 @timed("request")
 @type_checker(str)
 def timed_request(
-        url: str, postdata: Optional[Json] = None, return_json=False,
+        url: str, postdata: Optional[Json] = None, return_json=False, max_bytes: int | None = None,
         **requests_kwargs) -> list[Json] | Json | str | None:
+    """Request data from ``url``.
+
+    Response bodies are decompressed by the transport (including brotli). If ``max_bytes`` is
+    specified, the body is streamed and the download is abandoned as soon as it exceeds that
+    size (in which case None is returned).
+    """
     _log.info(f"Retrieving data from: '{url}'...")
     global http_requests_count
-    if postdata:
-        response = requests.post(url, json=postdata, **requests_kwargs)
-    else:
-        response = requests.get(url, timeout=REQUESTS_TIMEOUT, **requests_kwargs)
-    http_requests_count += 1
+    requests_kwargs.setdefault("timeout", REQUESTS_TIMEOUT)
+    try:
+        if postdata:
+            if max_bytes is not None:
+                requests_kwargs["stream"] = True
+            response = get_session().post(url, json=postdata, **requests_kwargs)
+            if max_bytes is not None:
+                _read_body(response, max_bytes)
+        else:
+            response = cached_get(url, max_bytes=max_bytes, **requests_kwargs)
+    except ResponseTooLarge as e:
+        _log.warning(f"Request aborted: {e}")
+        return None
+    finally:
+        http_requests_count += 1
     if str(response.status_code)[0] in ("4", "5"):
         msg = f"Request failed with: '{response.status_code} {response.reason}'"
         if response.status_code in (502, 503, 504):
@@ -69,36 +308,43 @@ def timed_request(
         _log.warning(msg)
         return None
 
-    # handle brotli compression
-    if response.headers.get("Content-Encoding") == "br":
-        try:
-            decompressed = brotli.decompress(response.content)
-            if return_json:
-                return json.loads(decompressed)
-            return decompressed
-        except brotli.error:
-            pass
-
     if return_json:
         return response.json() if response.text else {}
     return response.text
 
 
-@timed("request")
-@type_checker(str)
-def getsoup(url: str, headers: Dict[str, str] | None = None) -> BeautifulSoup | None:
-    """Return BeautifulSoup object based on ``url``.
+def _parse_selector(selector: str) -> tuple[str, str, str]:
+    name, _, id_ = selector.partition("#")
+    name, _, class_ = name.partition(".")
+    return name, class_, id_
 
-    Args:
-        url: URL string
-        headers: a dictionary of headers to add to the request
 
-    Returns:
-        a BeautifulSoup object or None on client-side errors
+def tag_strainer(*selectors: str) -> SoupStrainer:
+    """Return a strainer that restricts parsing to tags specified by ``selectors`` (and all their
+    contents).
+
+    Only simple selectors are supported: a tag name, optionally followed by a single class (e.g.
+    'table.deck-view-deck-table') or by an ID (e.g. 'div#deck'). Either part may be omitted.
     """
+    specs = [_parse_selector(s) for s in selectors]
+
+    def match(name: str, attrs: dict[str, str | list[str]]) -> bool:
+        classes = attrs.get("class") or ()
+        if isinstance(classes, str):  # that's how attributes come from the tree builder
+            classes = classes.split()
+        for tag_name, class_, id_ in specs:
+            if ((not tag_name or name == tag_name) and (not class_ or class_ in classes)
+                    and (not id_ or attrs.get("id") == id_)):
+                return True
+        return False
+
+    return SoupStrainer(match)
+
+
+def _get_page(url: str, headers: Dict[str, str] | None = None) -> requests.Response | None:
     _log.info(f"Requesting: {url!r}...")
     global http_requests_count
-    response = requests.get(url, timeout=REQUESTS_TIMEOUT, headers=headers)
+    response = cached_get(url, timeout=REQUESTS_TIMEOUT, headers=headers)
     http_requests_count += 1
     if str(response.status_code)[0] in ("4", "5"):
         msg = f"Request failed with: '{response.status_code} {response.reason}'"
@@ -106,47 +352,34 @@ def getsoup(url: str, headers: Dict[str, str] | None = None) -> BeautifulSoup |
             raise HTTPError(msg)
         _log.warning(msg)
         return None
-    return BeautifulSoup(response.text, "lxml")
+    return response
 
 
-Throttling = namedtuple("Throttling", "delay offset")
-
-
-def throttle(delay: float, offset=0.0) -> None:
-    if offset:
-        delay = round(random.uniform(delay - offset / 2, delay + offset / 2), 3)
-    _log.info(f"Throttling for {delay} seconds...")
-    time.sleep(delay)
-
-
-def throttle_with_countdown(delay_seconds: int) -> None:
-    for i in range(delay_seconds, 0, -1):
-        print(f"Waiting {i} seconds before next batch...", end="\r")
-        time.sleep(1)
-    print("Ready for next batch!")
-
-
-def throttled(delay: float, offset=0.0) -> Callable:
-    """Add throttling delay after the decorated operation.
+@timed("request")
+@type_checker(str)
+def getsoup(
+        url: str, headers: Dict[str, str] | None = None,
+        parse_only: SoupStrainer | None = None) -> BeautifulSoup | None:
+    """Return BeautifulSoup object based on ``url``.
 
     Args:
-        delay: throttling delay in fraction of seconds
-        offset: randomization offset of the delay in fraction of seconds
+        url: URL string
+        headers: a dictionary of headers to add to the request
+        parse_only: a strainer to restrict parsing to only the needed parts of the page
 
     Returns:
-        the decorated function
+        a BeautifulSoup object or None on client-side errors
     """
-    def decorate(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            result = func(*args, **kwargs)
-            throttle(delay, offset)
-            return result
-        return wrapper
-    return decorate
+    response = _get_page(url, headers)
+    if response is None:
+        return None
+    return BeautifulSoup(response.text, "lxml", parse_only=parse_only)
 
 
-@throttled(DEFAULT_THROTTLING)
+Throttling = namedtuple("Throttling", "delay offset")
+
+
+# kept for backwards compatibility, all requests are rate-limited now
 def throttled_soup(url: str, headers: Dict[str, str] | None = None) -> BeautifulSoup | None:
     return getsoup(url, headers=headers)
 
@@ -175,51 +408,121 @@ def http_requests_counted(operation="") -> Callable:
     return decorate
 
 
-@timed("unshortening")
-def unshorten(url: str) -> str | None:
-    """Unshorten URL shortened by services like bit.ly, tinyurl.com etc.
+_JS_REDIRECT_PATTERN = re.compile(r'window\.location\.href\s*=\s*"([^"]+)"')
+UNSHORTENED_URLS_FILENAME = "unshortened_urls.json"
 
-    courtesy of Phind AI
-    """
-    # set up retry mechanism
-    retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[429, 500, 502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retries)
-    session = requests.Session()
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
 
-    try:
-        # set a reasonable timeout
-        timeout = 10
-
-        # add a User-Agent header to mimic a real browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+class Unshortener:
+    """Resolver of URLs shortened by services like bit.ly, tinyurl.com etc.
 
-        # perform GET request instead of HEAD
-        resp = session.get(url, allow_redirects=True, timeout=timeout, headers=headers)
+    Resolved targets are cached (and can be persisted between runs), as the same shortlinks
+    recur across many videos of a channel. Resolution tries a HEAD request first and falls back
+    to a streamed GET whose body is read (and only its beginning) just when no redirect happened,
+    to look for a JavaScript redirect. Multiple URLs are resolved concurrently.
+    """
+    def __init__(self, path: PathLike | None = None, workers=8, timeout=10.0) -> None:
+        """Initialize.
+
+        Args:
+            path: path to a JSON file with resolved URLs (if None, they aren't persisted)
+            workers: number of threads resolving URLs concurrently
+            timeout: timeout of each request (in seconds)
+        """
+        self._path = Path(path) if path else None
+        self._workers, self._timeout = workers, timeout
+        self._resolved: dict[str, str] = {}
+        self._lock = threading.Lock()
+        if self._path and self._path.is_file():
+            self._resolved = json.loads(self._path.read_text(encoding="utf-8"))
+
+    def _head(self, url: str) -> str | None:
+        resp = get_session().head(
+            url, allow_redirects=True, timeout=self._timeout, headers={"User-Agent": USER_AGENT})
+        return resp.url if resp.history and resp.url != url else None
+
+    def _get(self, url: str, max_bytes=65_536) -> str | None:
+        with get_session().get(
+                url, allow_redirects=True, timeout=self._timeout, stream=True,
+                headers={"User-Agent": USER_AGENT}) as resp:
+            if resp.url != url:
+                return resp.url
+            # no redirect occurred, so look for a JavaScript one at the beginning of the page
+            head = b""
+            for chunk in resp.iter_content(chunk_size=8192):
+                head += chunk
+                if len(head) >= max_bytes:
+                    break
+        encoding = resp.encoding or "utf-8"
+        if match := _JS_REDIRECT_PATTERN.search(head.decode(encoding, errors="replace")):
+            return match.group(1)
+        return None
 
-        # check if the final URL is different from the original
-        if resp.url != url:
-            return resp.url
-        else:
-            # if no redirect occurred, try to parse the HTML for potential JavaScript redirects
-            match = re.search(r'window\.location\.href\s*=\s*"([^"]+)"', resp.text)
-            if match:
-                return match.group(1)
+    @timed("unshortening")
+    def resolve(self, url: str) -> str | None:
+        """Return the target of shortened ``url`` (or None if it cannot be resolved).
+        """
+        if target := self._resolved.get(url):
+            return target
+        try:
+            try:
+                target = self._head(url)
+            except requests.exceptions.RequestException as e:
+                _log.info(f"HEAD request for {url!r} failed with: {e!r}, trying GET...")
+                target = None
+            target = target or self._get(url)
+        except requests.exceptions.SSLError:
+            _log.warning(f"Unshortening of {url!r} failed with SSL error")
+            return None
+        except requests.exceptions.TooManyRedirects:
+            _log.warning(f"Unshortening of {url!r} failed due too many redirections")
+            return None
+        except requests.exceptions.RequestException as e:
+            _log.warning(f"Unshortening of {url!r} failed with : {str(e)}")
+            return None
+        if target:
+            with self._lock:
+                self._resolved[url] = target
+        return target
+
+    def resolve_many(self, *urls: str) -> list[str | None]:
+        """Resolve ``urls`` concurrently and return their targets in order.
+        """
+        unique = [*dict.fromkeys(urls)]
+        if len(unique) < 2:
+            return [self.resolve(url) for url in urls]
+        with ThreadPoolExecutor(max_workers=min(self._workers, len(unique))) as executor:
+            targets = dict(zip(unique, executor.map(self.resolve, unique)))
+        return [targets[url] for url in urls]
+
+    def dump(self) -> None:
+        """Dump resolved URLs to this unshortener's file.
+        """
+        if not self._path:
+            return
+        with self._lock:
+            data = json.dumps(self._resolved, indent=2, ensure_ascii=False)
+        getdir(self._path.parent)
+        self._path.write_text(data, encoding="utf-8")
+
+
+_unshortener: Unshortener | None = None
+_unshortener_lock = threading.Lock()
+
+
+def get_unshortener() -> Unshortener:
+    """Return the process-wide unshortener (loading its resolved URLs on the first call).
+    """
+    global _unshortener
+    with _unshortener_lock:
+        if _unshortener is None:
+            _unshortener = Unshortener(DATA_DIR / UNSHORTENED_URLS_FILENAME)
+        return _unshortener
 
-        return None
 
-    except requests.exceptions.SSLError:
-        _log.warning(f"Unshortening of {url!r} failed with SSL error")
-        return None
-    except requests.exceptions.TooManyRedirects:
-        _log.warning(f"Unshortening of {url!r} failed due too many redirections")
-        return None
-    except requests.exceptions.RequestException as e:
-        _log.warning(f"Unshortening of {url!r} failed with : {str(e)}")
-        return None
+def unshorten(url: str) -> str | None:
+    """Unshorten URL shortened by services like bit.ly, tinyurl.com etc.
+    """
+    return get_unshortener().resolve(url)
 
 
 def extract_url(text: str, https=True) -> str | None:
@@ -249,11 +552,291 @@ def extract_source(url: str) -> str:
 # SELENIUM
 
 
+# blocked by default in dynamic scraping, none of them is ever needed to get a decklist
+_IMAGE_PATTERNS = ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico")
+_MEDIA_PATTERNS = ("*.mp4", "*.webm", "*.mp3", "*.ogg", "*.m3u8")
+_FONT_PATTERNS = ("*.woff", "*.woff2", "*.ttf", "*.otf")
+_TRACKER_PATTERNS = (
+    "*google-analytics.com*", "*googletagmanager.com*", "*googlesyndication.com*",
+    "*doubleclick.net*", "*adservice.google.com*", "*amazon-adsystem.com*", "*facebook.net*",
+    "*hotjar.com*", "*scorecardresearch.com*", "*quantserve.com*", "*criteo.com*",
+    "*taboola.com*", "*outbrain.com*", "*pubmatic.com*", "*adnxs.com*", "*rubiconproject.com*")
+
+
+# browser configuration for dynamic scraping, 'page_load_strategy' is one of: 'normal' (wait
+# for all resources), 'eager' (wait for DOM only) or 'none', 'blocked' holds extra URL patterns
+# to block (with '*' wildcards), headless mode is on by default (and forced off whenever the OS
+# clipboard is involved)
+BrowserProfile = namedtuple(
+    "BrowserProfile",
+    "headless page_load_strategy block_images block_media block_fonts block_trackers blocked",
+    defaults=(True, "eager", True, True, True, True, ()))
+DEFAULT_BROWSER_PROFILE = BrowserProfile()
+
+
+def _blocked_urls(profile: BrowserProfile) -> tuple[str, ...]:
+    patterns = []
+    if profile.block_images:
+        patterns += _IMAGE_PATTERNS
+    if profile.block_media:
+        patterns += _MEDIA_PATTERNS
+    if profile.block_fonts:
+        patterns += _FONT_PATTERNS
+    if profile.block_trackers:
+        patterns += _TRACKER_PATTERNS
+    return (*patterns, *profile.blocked)
+
+
+class DriverPool:
+    """Pool of long-lived Chrome webdrivers.
+
+    Starting a browser dominates the time of a dynamic scrape, so drivers are kept alive and
+    reused. A driver is checked for health on checkout and recycled after ``max_pages`` pages
+    (or whenever it breaks). Drivers are pooled separately per launch configuration (headless
+    mode and page load strategy) of the requested browser profile, while the profile's request
+    blocking is applied on checkout (through Chrome DevTools Protocol). Up to ``size`` drivers of
+    each configuration can be checked out concurrently.
+
+    Consent cookies are remembered per domain (after consent is accepted by any of the pool's
+    drivers) and injected into the other drivers, so that consent pop-ups need to be dealt with
+    only once per domain.
+
+    Closing the pool quits all its drivers, including the checked-out ones.
+    """
+    def __init__(self, size=2, max_pages=50) -> None:
+        """Initialize.
+
+        Args:
+            size: maximum number of drivers of each launch configuration
+            max_pages: number of pages after which a driver is recycled
+        """
+        self._size, self._max_pages = size, max_pages
+        self._idle: defaultdict[tuple[bool, str], list[WebDriver]] = defaultdict(list)
+        self._count: defaultdict[tuple[bool, str], int] = defaultdict(int)
+        self._pages: dict[int, int] = {}
+        self._blocked: dict[int, tuple[str, ...]] = {}
+        self._cookied: dict[int, set[str]] = {}
+        self._consent_cookies: dict[str, list[Json]] = {}
+        self._drivers: dict[int, WebDriver] = {}  # all live drivers, idle or checked out
+        self._closed = False
+        self._condition = threading.Condition()
+        self._pid = os.getpid()
+
+    @staticmethod
+    def _new_driver(headless: bool, page_load_strategy: str) -> WebDriver:
+        options = webdriver.ChromeOptions()
+        options.page_load_strategy = page_load_strategy
+        if headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--disable-gpu")
+            options.add_argument("--mute-audio")
+        _log.info(
+            f"Starting {'headless ' if headless else ''}Chrome webdriver (page load strategy: "
+            f"{page_load_strategy!r})...")
+        return webdriver.Chrome(options=options)
+
+    @staticmethod
+    def _is_healthy(driver: WebDriver) -> bool:
+        try:
+            _ = driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _discard(self, driver: WebDriver, key: tuple[bool, str]) -> None:
+        with self._condition:
+            if self._drivers.pop(id(driver), None) is None:  # already discarded (on close)
+                return
+            for registry in self._pages, self._blocked, self._cookied:
+                registry.pop(id(driver), None)
+            self._count[key] -= 1
+            self._condition.notify_all()
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def _acquire(self, key: tuple[bool, str]) -> WebDriver:
+        while True:
+            with self._condition:
+                while not self._idle[key] and self._count[key] >= self._size:
+                    self._condition.wait()
+                if self._closed:
+                    raise RuntimeError("Webdriver pool is closed")
+                if self._idle[key]:
+                    driver = self._idle[key].pop()
+                else:
+                    self._count[key] += 1
+                    driver = None
+            if driver is None:
+                try:
+                    driver = self._new_driver(*key)
+                except Exception:
+                    with self._condition:
+                        self._count[key] -= 1
+                        self._condition.notify_all()
+                    raise
+                with self._condition:
+                    self._drivers[id(driver)] = driver
+                    self._pages[id(driver)], self._cookied[id(driver)] = 0, set()
+                    closed = self._closed
+                if closed:  # closed while the driver was starting
+                    self._discard(driver, key)
+                    raise RuntimeError("Webdriver pool is closed")
+                return driver
+            if self._is_healthy(driver):
+                return driver
+            _log.warning("Discarding an unresponsive webdriver...")
+            self._discard(driver, key)
+
+    def _release(self, driver: WebDriver, key: tuple[bool, str]) -> None:
+        with self._condition:
+            if id(driver) not in self._drivers:  # quit on close while checked out
+                return
+            self._pages[id(driver)] += 1
+            recycled = self._closed or self._pages[id(driver)] >= self._max_pages
+        if recycled:
+            self._discard(driver, key)
+            return
+        try:
+            driver.get("about:blank")  # stop whatever the last page is running
+        except WebDriverException:
+            self._discard(driver, key)
+            return
+        with self._condition:
+            if self._closed:
+                discard = True
+            else:
+                discard = False
+                self._idle[key].append(driver)
+                self._condition.notify_all()
+        if discard:
+            self._discard(driver, key)
+
+    def _apply_blocking(self, driver: WebDriver, profile: BrowserProfile) -> None:
+        blocked = _blocked_urls(profile)
+        with self._condition:
+            if self._blocked.get(id(driver)) == blocked:
+                return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(blocked)})
+        with self._condition:
+            self._blocked[id(driver)] = blocked
+
+    @contextmanager
+    def checkout(
+            self, profile: BrowserProfile = DEFAULT_BROWSER_PROFILE
+    ) -> Generator[WebDriver, None, None]:
+        """Check out a driver configured according to ``profile`` for the duration of the
+        context.
+
+        The driver is recycled if the context raises anything other than a timeout or a missing
+        element (i.e. anything hinting that the browser itself may be broken).
+        """
+        key = profile.headless, profile.page_load_strategy
+        driver = self._acquire(key)
+        try:
+            self._apply_blocking(driver, profile)
+            yield driver
+        except (TimeoutException, NoSuchElementException):
+            self._release(driver, key)
+            raise
+        except BaseException:
+            self._discard(driver, key)
+            raise
+        else:
+            self._release(driver, key)
+
+    def has_consent(self, url: str) -> bool:
+        with self._condition:
+            return extract_source(url) in self._consent_cookies
+
+    def remember_consent(self, driver: WebDriver, url: str) -> None:
+        """Remember cookies set by accepting consent on ``url``'s domain with ``driver``.
+        """
+        domain, cookies = extract_source(url), driver.get_cookies()
+        with self._condition:
+            self._consent_cookies[domain] = cookies
+            self._cookied.setdefault(id(driver), set()).add(domain)
+
+    def inject_consent(self, driver: WebDriver, url: str) -> None:
+        """Set cookies remembered for ``url``'s domain in ``driver`` (if it doesn't have them
+        already).
+        """
+        domain = extract_source(url)
+        with self._condition:
+            cookies = self._consent_cookies.get(domain)
+            cookied = domain in self._cookied.get(id(driver), set())
+        if not cookies or cookied:
+            return
+        params = []
+        for cookie in cookies:
+            param = {k: v for k, v in cookie.items() if k != "expiry"}
+            if "expiry" in cookie:
+                param["expires"] = cookie["expiry"]
+            params.append(param)
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+        with self._condition:
+            self._cookied.setdefault(id(driver), set()).add(domain)
+
+    def close(self) -> None:
+        """Quit all drivers, including those still checked out (their contexts fail on the next
+        use of the driver). Drivers checked out afterwards are refused.
+        """
+        if os.getpid() != self._pid:  # forked processes don't own the browsers
+            return
+        with self._condition:
+            self._closed = True
+            drivers = [*self._drivers.values()]
+            self._drivers.clear()
+            self._idle.clear()
+            self._count.clear()
+            for registry in self._pages, self._blocked, self._cookied:
+                registry.clear()
+            self._condition.notify_all()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+
+
+_driver_pool: DriverPool | None = None
+_driver_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """Return the process-wide webdriver pool (creating it on the first call).
+    """
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = DriverPool()
+            atexit.register(_driver_pool.close)
+        return _driver_pool
+
+
+def load_page(driver: WebDriver, url: str) -> None:
+    """Load ``url`` with the passed webdriver, paced by the process-wide rate limiter.
+    """
+    limiter = get_limiter()
+    limiter.acquire(url)
+    _log.info(f"Webdriving using Chrome to: '{url}'...")
+    start = time.perf_counter()
+    try:
+        driver.get(url)
+    except TimeoutException:
+        limiter.feedback(url, failed=True)
+        raise
+    limiter.feedback(url, latency=time.perf_counter() - start)
+
+
 @timed("getting dynamic soup")
 def get_dynamic_soup_by_xpath(
         url: str, xpath: str, *halt_xpaths, click=False, consent_xpath="", clipboard_xpath="",
-        wait_for_consent_disappearance=True,
-        timeout=SELENIUM_TIMEOUT) -> tuple[BeautifulSoup, BeautifulSoup | None, str | None]:
+        wait_for_consent_disappearance=True, timeout=SELENIUM_TIMEOUT,
+        profile: BrowserProfile = DEFAULT_BROWSER_PROFILE
+) -> tuple[BeautifulSoup, BeautifulSoup | None, str | None]:
     """Return BeautifulSoup object(s) from dynamically rendered page source at ``url`` using
     Selenium WebDriver that waits for presence of an element specified by ``xpath``.
 
@@ -273,22 +856,32 @@ def get_dynamic_soup_by_xpath(
         clipboard_xpath: Xpath to locate a copy-to-clipboard button (if present)
         wait_for_consent_disappearance: if True, wait for the consent window to disappear
         timeout: timeout used in attempted actions (consent timeout is halved)
+        profile: browser profile to use (headless mode is always off if clipboard is involved)
 
     Returns:
         tuple of: BeautifulSoup object from dynamically loaded page source, second such object (if
         the located element was clicked), clipboard content (if copy-to-clipboard element was
         clicked)
     """
-    with webdriver.Chrome() as driver:
+    pool = get_driver_pool()
+    if clipboard_xpath:  # the OS clipboard is not available to headless browsers
+        profile = profile._replace(headless=False)
+    with pool.checkout(profile) as driver:
         try:
-            _log.info(f"Webdriving using Chrome to: '{url}'...")
-            driver.get(url)
-
             if consent_xpath:
+                pool.inject_consent(driver, url)
+            load_page(driver, url)
+
+            if consent_xpath and pool.has_consent(url):
+                # consent cookies should have done their job, but check (without waiting)
+                if consent_buttons := driver.find_elements(By.XPATH, consent_xpath):
+                    consent_buttons[0].click()
+            elif consent_xpath:
                 if wait_for_consent_disappearance:
                     _accept_consent(driver, consent_xpath)
                 else:
                     _accept_consent_without_wait(driver, consent_xpath)
+                pool.remember_consent(driver, url)
 
             element = _wait_for_elements(driver, xpath, *halt_xpaths, timeout=timeout)
             if not element:
@@ -311,7 +904,7 @@ def get_dynamic_soup_by_xpath(
             raise
 
 
-@throttled(DEFAULT_THROTTLING)
+# kept for backwards compatibility, all page loads are rate-limited now
 def throttled_dynamic_soup_by_xpath(
         url: str, xpath: str, click=False, consent_xpath="", clipboard_xpath="",
         timeout=SELENIUM_TIMEOUT) -> tuple[BeautifulSoup, BeautifulSoup | None, str | None]:
@@ -347,7 +940,6 @@ def _accept_consent(driver: WebDriver, xpath: str, timeout=SELENIUM_TIMEOUT) ->
             EC.presence_of_element_located((By.XPATH, xpath)))
         _log.info("Consent pop-up closed")
     except TimeoutException:
-        driver.quit()
         _log.error("Timed out waiting for consent pop-up to disappear")
         raise
 
@@ -377,6 +969,9 @@ def _accept_consent_without_wait(
         return None
 
 
+_clipboard_lock = threading.Lock()
+
+
 def click_for_clipboard(
         driver: WebDriver, xpath: str, delay=0.5, timeout=SELENIUM_TIMEOUT / 2) -> str:
     """Click element located by ``xpath`` with the passed Chrome webdriver and return clipboard
@@ -402,13 +997,14 @@ def click_for_clipboard(
     try:
         copy_element = WebDriverWait(driver, timeout).until(
             EC.element_to_be_clickable((By.XPATH, xpath)))
-        copy_element.click()
-        _log.info(f"Copy-to-clipboard element clicked")
-        time.sleep(delay)
-        return pyperclip.paste()
+        # the OS clipboard is shared by all the (concurrently used) drivers
+        with _clipboard_lock:
+            copy_element.click()
+            _log.info(f"Copy-to-clipboard element clicked")
+            time.sleep(delay)
+            return pyperclip.paste()
 
     except TimeoutException:
-        driver.quit()
         _log.error(f"Timed out waiting for element specified by {xpath!r} to be present")
         raise
 
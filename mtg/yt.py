@@ -11,7 +11,9 @@ import itertools
 import json
 import logging
 import re
+import time
 from collections import defaultdict
+from concurrent.futures import Future
 from dataclasses import asdict, dataclass
 from datetime import date, datetime
 from decimal import Decimal
@@ -27,33 +29,43 @@ import pytubefix
 import scrapetube
 import httpx
 import httpcore
-from requests import ConnectionError, HTTPError, Timeout, ReadTimeout
+from requests import HTTPError, Timeout, ReadTimeout
 from selenium.common.exceptions import TimeoutException
 from youtube_comment_downloader import SORT_BY_POPULAR, YoutubeCommentDownloader
 from youtubesearchpython import Channel as YtspChannel
 
 from mtg import FILENAME_TIMESTAMP_FORMAT, Json, OUTPUT_DIR, PathLike, README
-from mtg.deck import Deck
-from mtg.deck.arena import ArenaParser, get_arena_lines, group_arena_lines
-from mtg.deck.scrapers import DeckScraper, SANITIZED_FORMATS
-from mtg.deck.scrapers.melee import ALT_DOMAIN as MELEE_ALT_DOMAIN
-from mtg.scryfall import all_formats
+from mtg.corpus import CORPUS_FILE, CardIndex, DeckCorpus
+from mtg.deck import ARENA_MULTIFACE_SEPARATOR, Deck
+from mtg.deck.arena import ArenaParser, ParsingPool, get_arena_lines, group_arena_lines, \
+    parse_arena_groups, playset_cache_stats
+from mtg.deck.scrapers import DeckScraper, SANITIZED_FORMATS, get_engine
+from mtg.repository import DecklistRepository, load_decklists
+from mtg.scryfall import BulkDataDiff, MULTIFACE_SEPARATOR as SCRYFALL_MULTIFACE_SEPARATOR, \
+    all_formats, diff_bulk_data, dump_bulk_data_snapshot, load_bulk_data_snapshot, \
+    snapshot_bulk_data
 from mtg.utils import Counter, breadcrumbs, deserialize_dates, extract_float, find_longest_seqs, \
     from_iterable, \
     getrepr, multiply_by_symbol, sanitize_filename, serialize_dates, timed
 from mtg.utils.files import getdir
 from mtg.utils.gsheets import extend_gsheet_rows_with_cols, retrieve_from_gsheets_cols
+from mtg.utils.ratelimit import get_limiter
 from mtg.utils.scrape import ScrapingError, extract_source, extract_url, \
-    get_dynamic_soup_by_xpath, http_requests_counted, throttle_with_countdown, throttled, \
-    timed_request, unshorten
+    get_dynamic_soup_by_xpath, get_unshortener, http_requests_counted, timed_request
 
 _log = logging.getLogger(__name__)
 
 
 GOOGLE_API_KEY = Path("scraping_api_key.txt").read_text(encoding="utf-8")  # not used anywhere
 CHANNELS_DIR = OUTPUT_DIR / "channels"
-REGULAR_DECKLISTS_FILE = CHANNELS_DIR / "regular_decklists.json"
-EXTENDED_DECKLISTS_FILE = CHANNELS_DIR / "extended_decklists.json"
+# gzip halves the size of decklist repositories on disk, but makes dumping them ~5x slower
+COMPRESS_DECKLISTS = False
+_DECKLISTS_SUFFIX = ".repo.json.gz" if COMPRESS_DECKLISTS else ".repo.json"
+REGULAR_DECKLISTS_FILE = CHANNELS_DIR / f"regular_decklists{_DECKLISTS_SUFFIX}"
+EXTENDED_DECKLISTS_FILE = CHANNELS_DIR / f"extended_decklists{_DECKLISTS_SUFFIX}"
+# plain JSON mappings of IDs to decklists (migrated on first load)
+LEGACY_REGULAR_DECKLISTS_FILE = CHANNELS_DIR / "regular_decklists.json"
+LEGACY_EXTENDED_DECKLISTS_FILE = CHANNELS_DIR / "extended_decklists.json"
 DORMANT_THRESHOLD = 30 * 3  # days
 ABANDONED_THRESHOLD = 30 * 12  # days
 DECK_STALE_THRESHOLD = 50  # videos
@@ -274,17 +286,18 @@ class ScrapingSession:
     """Context manager to ensure proper updates of global decklist repositories during scraping.
     """
     def __init__(self) -> None:
-        self._regular_decklists, self._extended_decklists = {}, {}
+        self._regular_decklists = DecklistRepository(
+            REGULAR_DECKLISTS_FILE, LEGACY_REGULAR_DECKLISTS_FILE)
+        self._extended_decklists = DecklistRepository(
+            EXTENDED_DECKLISTS_FILE, LEGACY_EXTENDED_DECKLISTS_FILE)
         self._regular_count, self._extended_count = 0, 0
 
     def __enter__(self) -> "ScrapingSession":
-        self._regular_decklists = json.loads(REGULAR_DECKLISTS_FILE.read_text(
-            encoding="utf-8")) if REGULAR_DECKLISTS_FILE.is_file() else {}
+        self._regular_decklists.load()
         _log.info(
             f"Loaded {len(self._regular_decklists):,} regular decklist(s) from the global "
             f"repository")
-        self._extended_decklists = json.loads(EXTENDED_DECKLISTS_FILE.read_text(
-            encoding="utf-8")) if EXTENDED_DECKLISTS_FILE.is_file() else {}
+        self._extended_decklists.load()
         _log.info(
             f"Loaded {len(self._extended_decklists):,} extended decklist(s) from the global "
             f"repository")
@@ -294,11 +307,11 @@ class ScrapingSession:
             self, exc_type: Type[BaseException] | None, exc_val: BaseException | None,
             exc_tb: TracebackType | None) -> None:
         _log.info(f"Dumping '{REGULAR_DECKLISTS_FILE}'...")
-        REGULAR_DECKLISTS_FILE.write_text(
-            json.dumps(self._regular_decklists, indent=4, ensure_ascii=False), encoding="utf-8")
+        self._regular_decklists.dump()
         _log.info(f"Dumping '{EXTENDED_DECKLISTS_FILE}'...")
-        EXTENDED_DECKLISTS_FILE.write_text(
-            json.dumps(self._extended_decklists, indent=4, ensure_ascii=False),encoding="utf-8")
+        self._extended_decklists.dump()
+        get_limiter().dump()  # persist learned per-host rates for the next run
+        get_unshortener().dump()
         _log.info(
             f"Total of {self._regular_count} unique regular decklist(s) added to the global "
             f"repository")
@@ -306,6 +319,14 @@ class ScrapingSession:
             f"Total of {self._extended_count} unique extended decklist(s) added to the global "
             f"repository")
 
+    @property
+    def regular_decklists(self) -> DecklistRepository:
+        return self._regular_decklists
+
+    @property
+    def extended_decklists(self) -> DecklistRepository:
+        return self._extended_decklists
+
     def update_regular(self, id_: str, decklist: str) -> None:
         if id_ not in self._regular_decklists:
             self._regular_decklists[id_] = decklist
@@ -318,11 +339,11 @@ class ScrapingSession:
 
 
 def retrieve_decklist(id_: str) -> str | None:
-    decklists = json.loads(REGULAR_DECKLISTS_FILE.read_text(
-            encoding="utf-8")) if REGULAR_DECKLISTS_FILE.is_file() else {}
-    decklists.update(json.loads(EXTENDED_DECKLISTS_FILE.read_text(
-            encoding="utf-8")) if EXTENDED_DECKLISTS_FILE.is_file() else {})
-    return decklists.get(id_)
+    decklist = load_decklists(REGULAR_DECKLISTS_FILE, LEGACY_REGULAR_DECKLISTS_FILE).get(id_)
+    if decklist is None:
+        decklist = load_decklists(
+            EXTENDED_DECKLISTS_FILE, LEGACY_EXTENDED_DECKLISTS_FILE).get(id_)
+    return decklist
 
 
 def check_decklists() -> None:
@@ -335,10 +356,8 @@ def check_decklists() -> None:
                 regular_ids[deck["decklist_id"]] = path_regular
                 extended_ids[deck["decklist_extended_id"]] = path_extended
 
-    regular_decklists = json.loads(REGULAR_DECKLISTS_FILE.read_text(
-            encoding="utf-8")) if REGULAR_DECKLISTS_FILE.is_file() else {}
-    extended_decklists = json.loads(EXTENDED_DECKLISTS_FILE.read_text(
-            encoding="utf-8")) if EXTENDED_DECKLISTS_FILE.is_file() else {}
+    regular_decklists = load_decklists(REGULAR_DECKLISTS_FILE, LEGACY_REGULAR_DECKLISTS_FILE)
+    extended_decklists = load_decklists(EXTENDED_DECKLISTS_FILE, LEGACY_EXTENDED_DECKLISTS_FILE)
 
     orphaned_regulars = {r for r in regular_ids if r not in regular_decklists}
     orphaned_extendeds = {e for e in extended_ids if e not in extended_decklists}
@@ -368,8 +387,11 @@ def scrape_channels(
         videos: number of videos to scrape per channel
         only_earlier_than_last_scraped: if True, only scrape videos earlier than the last one scraped
     """
-    with ScrapingSession() as session:
-        current_videos, total_videos = 0, 0
+    if not CORPUS_FILE.is_file():  # otherwise, only the newly scraped decks would end up in it
+        build_corpus()
+    # the parsing pool goes first, so that its workers are forked before anything else is loaded
+    with ParsingPool(), ScrapingSession() as session, DeckCorpus() as corpus:
+        total_videos = 0
         total_channels, total_decks = 0, 0
         for i, url in enumerate(urls, start=1):
             try:
@@ -379,23 +401,27 @@ def scrape_channels(
                 if ch.data:
                     dst = getdir(CHANNELS_DIR / ch.handle)
                     ch.dump(dst)
-                    current_videos += len(ch.videos)
                     total_videos += len(ch.videos)
                     total_channels += 1
                     total_decks += len(ch.decks)
-                    for deck in ch.decks:
-                        session.update_regular(deck.decklist_id, deck.decklist)
-                        session.update_extended(deck.decklist_extended_id, deck.decklist_extended)
+                    for video in ch.videos:
+                        for deck in video.decks:
+                            session.update_regular(deck.decklist_id, deck.decklist)
+                            session.update_extended(
+                                deck.decklist_extended_id, deck.decklist_extended)
+                            corpus.add(
+                                ch.handle, video.id, deck.metadata, deck.decklist,
+                                deck.decklist_id)
             except Exception as err:
                 _log.exception(f"Scraping of channel {url!r} failed with: '{err}'. Skipping...")
-            if current_videos > 500:
-                current_videos = 0
-                _log.info(f"Throttling for 5 minutes before the next batch...")
-                throttle_with_countdown(5 * 60)
 
         _log.info(
             f"Scraped {total_decks} deck(s) from {total_videos} video(s) from {total_channels} "
             f"channel(s)")
+        stats = playset_cache_stats()
+        _log.info(
+            f"Playset lines cache: {stats['hits']:,} hit(s), {stats['misses']:,} miss(es) "
+            f"(hit rate: {stats['hit_rate']:.1%})")
 
 
 def scrape_active(
@@ -483,32 +509,153 @@ def scrape_deck_stale(videos=25, only_earlier_than_last_scraped=True, only_activ
         *urls, videos=videos, only_earlier_than_last_scraped=only_earlier_than_last_scraped)
 
 
+@timed("building deck corpus", precision=1)
+def build_corpus() -> DeckCorpus:
+    """Build the deck corpus anew from all channels' data and the global decklist repository.
+
+    Decks with decklists missing from the repository are still counted (so that aggregate
+    format and source stats cover all scraped decks), only without card counts.
+    """
+    decklists = load_decklists(REGULAR_DECKLISTS_FILE, LEGACY_REGULAR_DECKLISTS_FILE)
+    corpus = DeckCorpus()
+    for ch in load_channels():
+        for v in ch.videos:
+            for deck in v["decks"]:
+                decklist = decklists.get(deck["decklist_id"])
+                if decklist is None:
+                    _log.warning(
+                        f"Orphaned decklist: "
+                        f"{breadcrumbs(ch.handle, v['id'], deck['decklist_id'])}. Adding the "
+                        f"deck without card counts...")
+                corpus.add(ch.handle, v["id"], deck["metadata"], decklist, deck["decklist_id"])
+    corpus.dump()
+    return corpus
+
+
+def _index_decklists(decklists: DecklistRepository) -> defaultdict[str, set[str]]:
+    # card name ==> IDs of decklists containing that card
+    index = defaultdict(set)
+    for id_, decklist in decklists.items():
+        for line in decklist.splitlines():
+            if not line or not line[0].isdigit():
+                continue
+            _, name = line.split(maxsplit=1)
+            name = name.split(" (", maxsplit=1)[0].replace(
+                ARENA_MULTIFACE_SEPARATOR, SCRYFALL_MULTIFACE_SEPARATOR)
+            index[name].add(id_)
+    return index
+
+
+def _iter_channel_files() -> Generator[Path, None, None]:
+    for channel_dir in (d for d in CHANNELS_DIR.iterdir() if d.is_dir()):
+        yield from (f for f in channel_dir.iterdir()
+                    if f.is_file() and f.suffix.lower() == ".json")
+
+
+@timed("re-parsing decklists affected by card data update")
+def reparse_decklists(diff: BulkDataDiff | None = None) -> int:
+    """Re-parse and re-validate only those decklists in the global repositories that contain
+    cards changed by the latest Scryfall bulk data update. Update their IDs in the repositories,
+    the channel files and the deck corpus in place.
+
+    Args:
+        diff: optionally, a bulk data diff (if not provided, the current bulk data is diffed
+        against its last dumped snapshot)
+
+    Returns:
+        number of re-parsed decks
+    """
+    snapshot = snapshot_bulk_data()
+    if diff is None:
+        old_snapshot = load_bulk_data_snapshot()
+        if old_snapshot is None:
+            _log.info("No earlier bulk data snapshot to diff against. Dumping the current one...")
+            dump_bulk_data_snapshot(snapshot)
+            return 0
+        diff = diff_bulk_data(old_snapshot, snapshot)
+    if not diff:
+        _log.info("No deck-relevant card data changes found")
+        dump_bulk_data_snapshot(snapshot)
+        return 0
+    _log.info(f"Card data changed for {len(diff.oracle_ids):,} card(s)")
+
+    with ScrapingSession() as session:
+        regular, extended = session.regular_decklists, session.extended_decklists
+        regular_index, extended_index = _index_decklists(regular), _index_decklists(extended)
+        affected_regular = {id_ for name in diff.names for id_ in regular_index.get(name, ())}
+        affected_extended = {id_ for name in diff.names for id_ in extended_index.get(name, ())}
+        if not affected_regular and not affected_extended:
+            _log.info("No stored decklists affected")
+            dump_bulk_data_snapshot(snapshot)
+            return 0
+
+        # re-parse every affected (regular ID, extended ID) pair once
+        remap: dict[tuple[str, str], tuple[str, str]] = {}
+        for file in _iter_channel_files():
+            data = json.loads(file.read_text(encoding="utf-8"), object_hook=deserialize_dates)
+            touched = False
+            for video in data["videos"]:
+                for deck_data in video["decks"]:
+                    key = deck_data["decklist_id"], deck_data["decklist_extended_id"]
+                    if key[0] not in affected_regular and key[1] not in affected_extended:
+                        continue
+                    if key not in remap:
+                        remap[key] = key
+                        decklist = extended.get(key[1]) or regular.get(key[0])
+                        if decklist is None:
+                            continue
+                        deck = ArenaParser(decklist.splitlines(), deck_data["metadata"]).parse()
+                        if not deck:
+                            _log.warning(
+                                f"Decklist {breadcrumbs(file.parent.name, video['id'], key[0])} "
+                                f"is no longer valid")
+                            continue
+                        remap[key] = deck.decklist_id, deck.decklist_extended_id
+                        session.update_regular(deck.decklist_id, deck.decklist)
+                        session.update_extended(deck.decklist_extended_id, deck.decklist_extended)
+                    if remap[key] != key:
+                        deck_data["decklist_id"], deck_data["decklist_extended_id"] = remap[key]
+                        touched = True
+            if touched:
+                _log.info(f"Updating decklist IDs in: '{file}'...")
+                file.write_text(
+                    json.dumps(data, indent=4, ensure_ascii=False, default=serialize_dates),
+                    encoding="utf-8")
+
+        changed = {old: new for old, new in remap.items() if old != new}
+        new_regular = {new[0] for new in changed.values()}
+        new_extended = {new[1] for new in changed.values()}
+        for old_regular, old_extended in changed:
+            if old_regular not in new_regular:
+                regular.pop(old_regular, None)
+            if old_extended not in new_extended:
+                extended.pop(old_extended, None)
+
+    corpus = DeckCorpus()
+    corpus.load()
+    if corpus.replace_decklists(
+            {old[0]: (new[0], regular[new[0]]) for old, new in changed.items()
+             if old[0] != new[0]}):
+        corpus.dump()
+        index = CardIndex(corpus)
+        index.load()
+        index.update()  # in-place changes change corpus generation, so this re-indexes
+        index.dump()
+
+    dump_bulk_data_snapshot(snapshot)
+    _log.info(f"Re-parsed {len(remap):,} affected deck(s) ({len(changed):,} changed)")
+    return len(remap)
+
+
 def get_aggregate_deck_data() -> tuple[Counter, Counter]:
     """Get aggregated deck data across all channels.
     """
-    decks = [d for ch in load_channels() for d in ch.decks]
-    fmts = []
-    for d in decks:
-        if fmt := d["metadata"].get("format"):
-            fmts.append(fmt)
-        elif d["metadata"].get("irregular_format"):
-            fmts.append("irregular")
-    delta = len(decks) - len(fmts)
-    if delta > 0:
-        fmts += ["undefined"] * delta
-    format_counter = Counter(fmts)
-    sources = []
-    for d in decks:
-        src = d["metadata"]["source"]
-        src = src.removeprefix("www.") if src.startswith("www.") else src
-        if "tcgplayer" in src:
-            _, *parts = src.split(".")
-            src = ".".join(parts)
-        elif MELEE_ALT_DOMAIN in src:
-            src = "melee.gg"
-        sources.append(src)
-    source_counter = Counter(sources)
-    return format_counter, source_counter
+    if not CORPUS_FILE.is_file():
+        corpus = build_corpus()
+    else:
+        corpus = DeckCorpus()
+        corpus.load()
+    return corpus.format_counter(), corpus.source_counter()
 
 
 def update_readme_with_deck_data() -> None:
@@ -543,6 +690,8 @@ class Video:
     """YouTube video showcasing a MtG deck with its most important metadata.
     """
     URL_TEMPLATE = "https://www.youtube.com/watch?v={}"
+    RATE = 0.8  # requests per second, seeds the rate limiter for YouTube
+    PASTEBIN_MAX_BYTES = 256 * 1024  # anything bigger is not a decklist
 
     SHORTENER_HOOKS = {
         "73.nu/",
@@ -659,8 +808,6 @@ class Video:
         "www.paste4btc.com/",
         "www.pastebin.pt/",
     }
-    _THROTTLED = (
-        "aetherhub.com", "mtggoldfish.com", "moxfield.com", "tappedout.net", "hareruyamtg.com")
 
     @property
     def id(self) -> str:
@@ -747,7 +894,6 @@ class Video:
         """
         self._process(video_id)
 
-    @throttled(1.25, 0.25)
     def _process(self, video_id):
         self._id = video_id
         try:
@@ -787,9 +933,20 @@ class Video:
         )
 
     def _get_pytube(self) -> pytubefix.YouTube:
-        data = pytubefix.YouTube(self.url, use_oauth=True, allow_oauth_cache=True)
-        if not data.publish_date:
+        limiter = get_limiter()
+        limiter.seed(self.url, self.RATE)
+        limiter.acquire(self.url)
+        start = time.perf_counter()
+        try:
+            data = pytubefix.YouTube(self.url, use_oauth=True, allow_oauth_cache=True)
+            publish_date = data.publish_date
+        except (Timeout, HTTPError, RemoteDisconnected):
+            limiter.feedback(self.url, failed=True)
+            raise
+        if not publish_date:
+            limiter.feedback(self.url, failed=True)
             raise ScrapingError("pytube data missing publish date")
+        limiter.feedback(self.url, latency=time.perf_counter() - start)
         return data
 
     @backoff.on_exception(
@@ -895,24 +1052,18 @@ class Video:
                 other_lines.append(line)
         return links, get_arena_lines(*other_lines)
 
-    def _process_deck(self, link: str) -> Deck | None:
+    def _parse_pastebin(self, link: str) -> Deck | None:
+        data = timed_request(link, max_bytes=self.PASTEBIN_MAX_BYTES)
+        if data:
+            return ArenaParser(data.splitlines(), self.metadata).parse()
+        return None
+
+    def _submit_deck(self, link: str) -> Future | None:
+        engine = get_engine()
         if scraper := DeckScraper.from_url(link, self.metadata):
-            if any(site in link for site in self._THROTTLED):
-                try:
-                    return scraper.scrape(throttled=True)
-                except (ConnectionError, ReadTimeout) as e:
-                    _log.warning(f"Scraping failed with: {e}. Re-trying with backoff...")
-                    return scraper.scrape_with_backoff(throttled=True)
-            else:
-                try:
-                    return scraper.scrape()
-                except (ConnectionError, ReadTimeout) as e:
-                    _log.warning(f"Scraping failed with: {e}. Re-trying with backoff...")
-                    return scraper.scrape_with_backoff()
+            return engine.submit_scraper(scraper)
         elif any(h in link for h in self.PASTEBIN_LIKE_HOOKS):
-            data = timed_request(link)
-            if data:
-                return ArenaParser(data.splitlines(), self.metadata).parse()
+            return engine.submit(link, self._parse_pastebin, link)
         return None
 
     @timed("comments lookup")
@@ -928,10 +1079,15 @@ class Video:
         return [line for c in author_comments for line in c["text"].splitlines()]
 
     def _process_urls(self, *urls: str) -> list[Deck]:
-        decks = []
+        # all URLs are fetched concurrently (subject to the engine's per-host limits), but the
+        # results are gathered in order
+        futures = []
         for url in urls:
             self._sources.add(extract_source(url))
-            if deck := self._process_deck(url):
+            futures.append(self._submit_deck(url))
+        decks = []
+        for future in futures:
+            if future and (deck := future.result()):
                 start = f"{deck.name!r} deck" if deck.name else "Deck"
                 _log.info(f"{start} scraped successfully")
                 decks.append(deck)
@@ -940,6 +1096,12 @@ class Video:
     def _collect(self, links: list[str], arena_lines: list[str]) -> list[Deck]:
         decks = set()
 
+        # Arena lines need no fetching, so if there's a parsing pool active, they get parsed there
+        # while the URLs are being scraped
+        groups = [g for g in group_arena_lines(*arena_lines) if len(g) > 2] if arena_lines else []
+        pool = ParsingPool.active()
+        future = pool.submit_groups(groups, self.metadata) if pool and groups else None
+
         # 1st stage: regular URLs
         decks.update(self._process_urls(*links))
 
@@ -948,19 +1110,20 @@ class Video:
             shortened_urls = [link for link in links
                               if any(hook in link for hook in self.SHORTENER_HOOKS)]
             if shortened_urls:
-                unshortened_urls = [unshorten(url) for url in shortened_urls]
+                unshortened_urls = get_unshortener().resolve_many(*shortened_urls)
                 self._unshortened_links = [url for url in unshortened_urls if url]
                 decks.update(self._process_urls(*self._unshortened_links))
 
         # 3rd stage: Arena lines
         if arena_lines:
             self._sources.add("arena.decklist")
-            for decklist in group_arena_lines(*arena_lines):
-                if len(decklist) > 2:
-                    if deck := ArenaParser(decklist, self.metadata).parse():
-                        start = f"{deck.name!r} deck" if deck.name else "Deck"
-                        _log.info(f"{start} scraped successfully")
-                        decks.add(deck)
+            parsed = future.result() if future else parse_arena_groups(
+                *groups, metadata=self.metadata)
+            for deck in parsed:
+                if deck:
+                    start = f"{deck.name!r} deck" if deck.name else "Deck"
+                    _log.info(f"{start} scraped successfully")
+                    decks.add(deck)
 
         return sorted(decks)
 
@@ -1089,11 +1252,14 @@ class Channel:
             return
         self._scrape_time = datetime.now()
         _log.info(f"Scraping channel: {self.url!r}, {len(video_ids)} video(s)...")
-        self._videos = []
+        # videos are scraped concurrently (each submitting its deck URLs to the engine in turn),
+        # but gathered in order
+        engine, futures = get_engine(), []
         for i, vid in enumerate(video_ids, start=1):
             _log.info(
                 f"Scraping video {i}/{len(video_ids)}: 'https://www.youtube.com/watch?v={vid}'...")
-            self._videos.append(Video(vid))
+            futures.append(engine.submit_task(Video, vid))
+        self._videos = [f.result() for f in futures]
         self._id = self.videos[0].channel_id if self else None
         try:
             self._ytsp_data = self._get_ytsp() if self._id else None
@@ -0,0 +1,69 @@
+"""
+
+    tests.test_arena.py
+    ~~~~~~~~~~~~~~~~~~~
+    Check resolution of cards of Arena playset lines (with card lookups mocked).
+
+    @author: z33k
+
+"""
+import pytest
+
+from mtg.deck import CardNotFound
+from mtg.deck import arena
+from mtg.deck.arena import ArenaParser, parse_arena_decklists, resolve_cards
+
+KNOWN_CARD = object()
+
+
+@pytest.fixture
+def queries(monkeypatch) -> list[tuple[str, bool]]:
+    queried = []
+
+    def find_card(name: str, *_args, **_kwargs):
+        if name == "Lightning Bolt":
+            return KNOWN_CARD
+        raise CardNotFound(f"Unable to find card {name!r}")
+
+    def query_api_for_card(name: str, foreign=False):
+        queried.append((name, foreign))
+        return None
+
+    monkeypatch.setattr(ArenaParser, "find_card", staticmethod(find_card))
+    monkeypatch.setattr(arena, "query_api_for_card", query_api_for_card)
+    monkeypatch.setattr(arena, "bulk_data_version", lambda: "test")
+    arena._resolve_playset_line.cache_clear()
+    yield queried
+    arena._resolve_playset_line.cache_clear()
+
+
+def test_unresolved_card_doesnt_fail_batch(queries: list[tuple[str, bool]]) -> None:
+    cards = resolve_cards("Deck", "4 Lightning Bolt", "4 Unknownish Card")
+    assert cards == {
+        ("Lightning Bolt", "", ""): KNOWN_CARD,
+        ("Unknownish Card", "", ""): None,
+    }
+
+
+def test_unresolved_card_fails_only_its_deck(queries: list[tuple[str, bool]]) -> None:
+    decks = parse_arena_decklists(
+        (["Deck", "4 Lightning Bolt", "4 Unknownish Card"], None),
+        (["Deck", "4 Lightning Bolt"], None))
+    assert len(decks) == 2
+    assert decks[0] is None
+
+
+def test_english_miss_isnt_queried_again(queries: list[tuple[str, bool]]) -> None:
+    resolve_cards("4 Unknownish Card")
+    assert queries == []
+
+
+def test_foreign_miss_is_queried_as_foreign(queries: list[tuple[str, bool]]) -> None:
+    resolve_cards("4 Молния")
+    assert queries == [("Молния", True)]
+
+
+def test_foreign_miss_isnt_memoized(queries: list[tuple[str, bool]]) -> None:
+    resolve_cards("4 Молния")
+    resolve_cards("4 Молния")
+    assert len(queries) == 2
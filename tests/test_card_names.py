@@ -0,0 +1,88 @@
+"""
+
+    tests.test_card_names.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+    Check card name normalization (and that its keys match those of the former two-step one).
+
+    @author: z33k
+
+"""
+import itertools
+import re
+
+import pytest
+from unidecode import unidecode
+
+from mtg import deck
+from mtg.deck import ARENA_MULTIFACE_SEPARATOR, CardNotFound, DeckParser
+from mtg.deck.arena import PlaysetLine
+from mtg.scryfall import MULTIFACE_SEPARATOR, card_name_key
+
+
+# the former implementation: DeckParser.sanitize_card_name() applied to a line (by PlaysetLine)
+# and then again to the name (by DeckParser.find_card()) and the index key derived from that
+def _old_sanitize_card_name(text: str) -> str:
+    text = text.replace("’", "'").replace("‑", "-").replace("꞉", ":")
+    if "/" in text:
+        text = text.replace(" / ", f" {MULTIFACE_SEPARATOR} ").replace(
+            f" {ARENA_MULTIFACE_SEPARATOR} ", f" {MULTIFACE_SEPARATOR} ")
+        text = re.sub(r'(?<=[a-zA-Z])/{1,3}(?=[a-zA-Z])', f' {MULTIFACE_SEPARATOR} ', text)
+    return text
+
+
+def _old_card_name_key(card_name: str) -> str:
+    return unidecode(_old_sanitize_card_name(card_name)).casefold()
+
+
+def _old_line_key(line: str) -> str:
+    return _old_card_name_key(PlaysetLine(_old_sanitize_card_name(line)).name)
+
+
+NAMES = [
+    "Lightning Bolt",
+    "Urza’s Saga",
+    "Jace, the Mind Sculptor",
+    "Lim-Dûl's Vault",
+    "Æther Vial",
+    "Ratonhnhaké꞉ton",
+    "Borrowing 100,000 Arrows",
+    "Commit /// Memory",
+    "Commit // Memory",
+    "Commit / Memory",
+    "Commit/Memory",
+    "Commit//Memory",
+    "Commit///Memory",
+    "Wear/Tear",
+    "Who/What/When/Where/Why",
+    "Who // What // When // Where // Why",
+    "Naru Meha, Master Wizard",
+    "Séance",
+    "Strip Mine ",
+    "",
+]
+LINE_TEMPLATES = ["4 {}", "4x {}", "{} x4", "{} 4", "1 {} (MH2) 259"]
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_name_key_matches_old(name: str) -> None:
+    assert card_name_key(name) == _old_card_name_key(name)
+
+
+@pytest.mark.parametrize("template, name", [*itertools.product(LINE_TEMPLATES, NAMES[:-2])])
+def test_line_key_matches_old(template: str, name: str) -> None:
+    line = template.format(name)
+    assert card_name_key(PlaysetLine(line).name) == _old_line_key(line)
+
+
+@pytest.mark.parametrize("name, normalized", [
+    ("Wear/Tear", "Wear // Tear"),
+    ("Fire///Ice", "Fire // Ice"),
+    ("Commit /// Memory", "Commit // Memory"),
+    ("Urza’s Saga", "Urza's Saga"),
+])
+def test_local_miss_is_queried_normalized(monkeypatch, name: str, normalized: str) -> None:
+    queried = []
+    monkeypatch.setattr(deck, "find_by_name", lambda n: queried.append(n))
+    with pytest.raises(CardNotFound):
+        DeckParser.find_card(name)
+    assert queried == [normalized]
@@ -0,0 +1,51 @@
+"""
+
+    tests.test_driver_pool.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+    Check that pooled webdrivers are launched according to the requested browser profile.
+
+    @author: z33k
+
+"""
+import pytest
+
+from mtg.utils import scrape
+from mtg.utils.scrape import DEFAULT_BROWSER_PROFILE, DriverPool
+
+
+class _FakeDriver:
+    current_url = "about:blank"
+
+    def __init__(self, options) -> None:
+        self.options = options
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> None:
+        pass
+
+    def get(self, url: str) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(scrape.webdriver, "Chrome", _FakeDriver)
+    pool = DriverPool()
+    yield pool
+    pool.close()
+
+
+def test_default_profile_is_headless() -> None:
+    assert DEFAULT_BROWSER_PROFILE.headless
+
+
+def test_pooled_driver_is_headless_when_asked(pool: DriverPool) -> None:
+    with pool.checkout(DEFAULT_BROWSER_PROFILE._replace(headless=True)) as driver:
+        assert "--headless=new" in driver.options.arguments
+
+
+def test_pooled_driver_is_headed_when_asked(pool: DriverPool) -> None:
+    with pool.checkout(DEFAULT_BROWSER_PROFILE._replace(headless=False)) as driver:
+        assert not any(arg.startswith("--headless") for arg in driver.options.arguments)